@@ -1,13 +1,32 @@
-from PySide6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QFrame,
+from PySide6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QFrame,
                                QLabel, QScrollArea, QPushButton, QHBoxLayout, QListWidget)
-from PySide6.QtCore import Qt, Slot
-from PySide6.QtGui import QPixmap, QKeyEvent
+from PySide6.QtCore import Qt, Slot, QTimer, QSize
+from PySide6.QtGui import QKeyEvent, QCloseEvent, QWheelEvent
 from src.engine.core import GameEngine
-from src.engine.ui.widgets import TypewriterLabel, ChoiceButton, SceneView
+from src.engine.profiling import profiler
+from src.engine.log import log
+from src.engine.prefetch import ASSET_BACKGROUND
+from src.engine.ui.widgets import TypewriterLabel, ChoiceList, SceneView
 from src.common.models import NodeModel
 from src.common.constants import NodeType
-from src.common.paths import get_assets_path
-import os
+from src.common.paths import get_assets_path, get_project_path
+from pathlib import Path
+import argparse
+import sys
+
+SKIP_DELAY_MS = 60  # Mode skip : délai entre deux textes déjà lus
+
+# Feuille de style unique, posée sur l'application (voir main()) : les widgets créés
+# ou recyclés à chaque nœud n'ont pas de style propre à analyser.
+PLAYER_STYLESHEET = """
+    QMainWindow { background-color: #121216; }
+    QFrame#mainContainer { background-color: rgba(18, 18, 22, 0.95); border: 1px solid #3a3a3a; border-radius: 10px; }
+    QLabel, TypewriterLabel { color: #f0f0f0; font-family: 'Segoe UI', sans-serif; }
+    QPushButton#invBtn { background-color: #444; color: white; border: 1px solid #666; padding: 5px 10px; }
+    QListWidget { background-color: #222; color: white; border: 1px solid #555; }
+    QPushButton#choiceButton { background-color: rgba(255, 255, 255, 0.05); border: 1px solid #555; color: #b1a270; padding: 12px; text-align: left; }
+    QPushButton#choiceButton:hover { background-color: rgba(255, 255, 255, 0.1); border-color: #b1a270; color: white; }
+"""
 
 
 class GameWindow(QMainWindow):
@@ -17,24 +36,24 @@ class GameWindow(QMainWindow):
         self.setWindowTitle("Velkarum Engine")
         self.resize(1280, 800)
 
-        self.setStyleSheet("""
-            QMainWindow { background-color: #121216; }
-            QFrame#mainContainer { background-color: rgba(18, 18, 22, 0.95); border: 1px solid #3a3a3a; border-radius: 10px; }
-            QLabel { color: #f0f0f0; font-family: 'Segoe UI', sans-serif; }
-            QPushButton#invBtn { background-color: #444; color: white; border: 1px solid #666; padding: 5px 10px; }
-            QListWidget { background-color: #222; color: white; border: 1px solid #555; }
-        """)
-
         self.engine.nodeChanged.connect(self.on_node_changed)
         self.engine.gameEnded.connect(self.close)
+        self.engine.session.autosave_enabled = True
+        self.skip_mode = False
         self._setup_ui()
 
+        # Fonds des nœuds suivants décodés pendant la lecture du nœud courant
+        assets = get_assets_path()
+        self.engine.session.prefetcher.warmers[ASSET_BACKGROUND] = \
+            lambda files: self.scene_view.prefetch([str(assets / f) for f in files])
+
     def _setup_ui(self):
         self.central_widget = QWidget()
         self.setCentralWidget(self.central_widget)
 
         # Fond
         self.scene_view = SceneView(self.central_widget)
+        self.scene_view.resolution = QSize(*self.engine.project.meta.resolution[:2])
         self.main_layout = QVBoxLayout(self.central_widget)
         self.main_layout.setContentsMargins(0, 0, 0, 0)
         self.main_layout.addWidget(self.scene_view)
@@ -81,9 +100,14 @@ class GameWindow(QMainWindow):
         self.scroll_layout.addWidget(self.text_label)
         self.scroll_layout.addStretch()
 
-        # Choix (Bas du texte)
-        self.choices_layout = QVBoxLayout()
-        self.scroll_layout.addLayout(self.choices_layout)
+        # Choix (Bas du texte) : boutons recyclés d'un nœud à l'autre
+        self.choice_list = ChoiceList()
+        self.choice_list.chosen.connect(self._choose)
+        self.scroll_layout.addWidget(self.choice_list)
+        self.continue_label = QLabel("▼")
+        self.continue_label.setAlignment(Qt.AlignCenter)
+        self.continue_label.hide()
+        self.scroll_layout.addWidget(self.continue_label)
 
         self.scroll_area.setWidget(self.scroll_content)
 
@@ -121,38 +145,34 @@ class GameWindow(QMainWindow):
 
     @Slot(object)
     def on_node_changed(self, node: NodeModel):
-        if node.content.background_image:
-            bg_path = get_assets_path() / node.content.background_image
-            if os.path.exists(bg_path):
-                self.scene_view.setPixmap(QPixmap(str(bg_path)))
+        with profiler.span("ui.on_node_changed", "ui", self.engine.state.current_index):
+            if node.content.background_image:
+                # Décodage en arrière-plan ; même image que l'actuelle : aucun travail
+                self.scene_view.show_image(str(get_assets_path() / node.content.background_image))
+
+            if node.type == NodeType.SCENE:
+                self.loc_label.setText(node.title.upper())
+                self.text_label.show_text(node.content.text)
+                self._build_choices(node)
 
-        if node.type == NodeType.SCENE:
-            self.loc_label.setText(node.title.upper())
-            self.text_label.show_text(node.content.text)
-            self._build_choices(node)
+                # Rafraîchir inventaire si ouvert (car des items ont pu être ajoutés)
+                if self.inv_panel.isVisible():
+                    self.refresh_inventory()
 
-            # Rafraîchir inventaire si ouvert (car des items ont pu être ajoutés)
-            if self.inv_panel.isVisible():
-                self.refresh_inventory()
+                if self.skip_mode:
+                    self._skip_if_seen(node)
+
+    def _skip_if_seen(self, node: NodeModel):
+        # Le mode skip s'arrête sur un choix ou sur un texte jamais lu
+        if node.content.choices or not node.outputs or not self.engine.state.history.revisit:
+            self.skip_mode = False
+            return
+        QTimer.singleShot(SKIP_DELAY_MS, lambda: self.skip_mode and self.engine.next_dialogue())
 
     def _build_choices(self, node: NodeModel):
-        while self.choices_layout.count():
-            item = self.choices_layout.takeAt(0)
-            if item.widget(): item.widget().deleteLater()
-
-        if node.content.choices:
-            for i, choice in enumerate(node.content.choices):
-                btn = ChoiceButton(choice.text, i)
-                btn.setStyleSheet("""
-                    QPushButton { background-color: rgba(255, 255, 255, 0.05); border: 1px solid #555; color: #b1a270; padding: 12px; text-align: left; }
-                    QPushButton:hover { background-color: rgba(255, 255, 255, 0.1); border-color: #b1a270; color: white; }
-                """)
-                btn.clicked.connect(lambda checked=False, idx=i: self.engine.select_choice(idx))
-                self.choices_layout.addWidget(btn)
-        elif node.outputs:
-            lbl = QLabel("▼")
-            lbl.setAlignment(Qt.AlignCenter)
-            self.choices_layout.addWidget(lbl)
+        with profiler.span("ui.build_choices", "ui", self.engine.state.current_index):
+            self.choice_list.set_choices([choice.text for choice in node.content.choices])
+            self.continue_label.setVisible(not node.content.choices and bool(node.outputs))
 
     def on_scene_click(self, event):
         if self.text_label.is_animating():
@@ -160,8 +180,80 @@ class GameWindow(QMainWindow):
         else:
             current = self.engine.flow.get_node(self.engine.state.current_node_id)
             if current and not current.content.choices:
-                self.engine.next_dialogue()
+                with profiler.span("ui.click", "ui", self.engine.state.current_index):
+                    self.engine.next_dialogue()
+
+    def _choose(self, index: int):
+        # Clic -> flux -> rendu : un span parent pour mesurer le tout
+        with profiler.span("ui.click", "ui", self.engine.state.current_index):
+            self.engine.select_choice(index)
 
     def keyPressEvent(self, event: QKeyEvent):
         if event.key() in (Qt.Key_Space, Qt.Key_Return):
-            self.on_scene_click(None)
\ No newline at end of file
+            self.on_scene_click(None)
+        elif event.key() == Qt.Key_S:
+            self.skip_mode = not self.skip_mode
+            current = self.engine.flow.get_node(self.engine.state.current_node_id)
+            if self.skip_mode and current:
+                self._skip_if_seen(current)
+        elif event.key() in (Qt.Key_Left, Qt.Key_PageUp):
+            self.engine.step_back()
+        elif event.key() in (Qt.Key_Right, Qt.Key_PageDown):
+            self.engine.step_forward()
+        elif event.key() == Qt.Key_F5:
+            self.engine.session.save_game("quicksave")
+        elif event.key() == Qt.Key_F9:
+            self.engine.session.load_game("quicksave")
+
+    def wheelEvent(self, event: QWheelEvent):
+        # Molette : retour arrière / avant dans le rollback
+        if event.angleDelta().y() > 0:
+            self.engine.step_back()
+        elif event.angleDelta().y() < 0:
+            self.engine.step_forward()
+
+    def closeEvent(self, event: QCloseEvent):
+        # Laisse l'autosave en cours se terminer (écriture atomique)
+        self.engine.session.close()
+        self.scene_view.pipeline.shutdown()
+        super().closeEvent(event)
+
+def main():
+    """
+    Point d'entrée du lecteur (lancé par l'éditeur : main_player.py --project story.json).
+    --profile : chronomètre le moteur et le rendu, puis écrit à la fermeture
+    profile_trace.json (chrome://tracing) et profile_nodes.json (temps par nœud).
+    """
+    parser = argparse.ArgumentParser(description="Lecteur de Visual Novel.")
+    parser.add_argument("--project", required=True, help="Chemin du story.json")
+    parser.add_argument("--profile", nargs="?", const="", default=None, metavar="DOSSIER",
+                        help="Active le profilage (export dans DOSSIER, par défaut <projet>/profile)")
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    app.setApplicationName("Velkarum Engine")
+    app.setStyleSheet(PLAYER_STYLESHEET)
+
+    if args.profile is not None:
+        profiler.enable()
+
+    engine = GameEngine()
+    engine.load_project(args.project)
+
+    window = GameWindow(engine)
+    window.show()
+    engine.start_game()
+    code = app.exec()
+
+    if args.profile is not None:
+        out_dir = Path(args.profile) if args.profile else get_project_path(args.project) / "profile"
+        profiler.export(out_dir, engine.graph)
+        log.info("Profil", "Trace et temps par nœud écrits dans %s", out_dir)
+        for entry in profiler.node_timings(engine.graph)[:10]:
+            log.info("Profil", "%8.2f ms  %s", entry["total_ms"], entry["title"] or entry["node"])
+
+    sys.exit(code)
+
+
+if __name__ == "__main__":
+    main()
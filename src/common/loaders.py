@@ -1 +1,64 @@
- 
+"""
+Lecture / écriture des fichiers de projet (communes à l'éditeur et au moteur).
+
+Deux dispositions d'un story.json :
+  - monolithique : le ProjectModel entier dans un seul fichier JSON ;
+  - découpée     : le story.json est un manifeste (meta, variables, assets, nœud de
+                   départ) qui liste les fichiers de nœuds du dossier <story>.nodes/.
+                   Les nœuds sont répartis en CHUNK_COUNT fichiers selon leur UUID :
+                   une sauvegarde ne réécrit que les fichiers dont un nœud a changé.
+
+Les fichiers de nœuds ne sont jamais modifiés sur place : chaque réécriture crée un
+nouveau nom (génération), et c'est le remplacement atomique du manifeste qui valide
+la sauvegarde. Le contenu du manifeste suffit donc à identifier le projet entier.
+"""
+import json
+import os
+import zlib
+from pathlib import Path
+from typing import Any, Dict
+
+SPLIT_FORMAT = "vne-split"
+SPLIT_VERSION = 1
+CHUNK_COUNT = 256
+
+
+def write_atomic(path: Path, data: bytes):
+    """Écrit dans un fichier temporaire puis le renomme : jamais de fichier à moitié écrit."""
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def chunk_of(node_id: str) -> str:
+    """Fichier de nœuds (sans génération) auquel appartient un nœud."""
+    return f"{zlib.crc32(node_id.encode('utf-8')) % CHUNK_COUNT:02x}"
+
+
+def chunk_dir(manifest_path: Path) -> Path:
+    """story.json -> story.nodes/ (même dossier)."""
+    manifest_path = Path(manifest_path)
+    return manifest_path.with_name(manifest_path.stem + ".nodes")
+
+
+def is_split(data: Dict[str, Any]) -> bool:
+    return data.get("format") == SPLIT_FORMAT
+
+
+def load_project_data(path: Path, raw: bytes = None) -> Dict[str, Any]:
+    """Dict compatible ProjectModel, quelle que soit la disposition du fichier."""
+    data = json.loads(raw if raw is not None else Path(path).read_bytes())
+    if not is_split(data):
+        return data
+    folder = chunk_dir(path)
+    nodes = {}
+    for name in data.pop("chunks").values():
+        nodes.update(json.loads((folder / name).read_bytes()))
+    data.pop("format")
+    data.pop("version", None)
+    data.pop("generation", None)
+    data["nodes"] = nodes
+    return data
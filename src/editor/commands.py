@@ -5,9 +5,10 @@ from src.common.models import NodeModel
 
 
 class AddNodeCommand(QUndoCommand):
-    def __init__(self, scene, node_item: NodeItem):
+    def __init__(self, scene, project, node_item: NodeItem):
         super().__init__()
         self.scene = scene
+        self.project = project
         self.node_item = node_item
 
         # CORRECTION : On accède à 'node_item.model.type' et non 'node_item.type'
@@ -17,9 +18,14 @@ class AddNodeCommand(QUndoCommand):
         self.setText(f"Ajouter Noeud {node_type_name}")
 
     def redo(self):
+        # Le modèle rejoint le projet avant que la scène ne notifie l'ajout
+        model = self.node_item.model
+        self.project.nodes[model.id] = model
         self.scene.addItem(self.node_item)
 
     def undo(self):
+        # Retiré du projet d'abord : la sauvegarde et le journal voient une suppression
+        self.project.nodes.pop(self.node_item.model.id, None)
         self.scene.removeItem(self.node_item)
 
 
@@ -7,15 +7,31 @@ class ConnectionItem(QGraphicsPathItem):
     """
     Représente le lien visuel (câble) entre deux noeuds.
     Utilise une courbe de Bézier cubique.
+    source_id / slot / target_id : choix représenté (nœud source, index du choix, nœud cible).
     """
+    _pen = None  # Partagé par tous les liens (créé au premier lien)
 
-    def __init__(self, start_pos: QPointF, end_pos: QPointF, parent=None):
+    def __init__(self, start_pos: QPointF, end_pos: QPointF, parent=None,
+                 source_id: str = None, slot: int = 0, target_id: str = None):
         super().__init__(parent)
         self.start_pos = start_pos
         self.end_pos = end_pos
+        self.source_id = source_id
+        self.slot = slot
+        self.target_id = target_id
 
+        if ConnectionItem._pen is None:
+            ConnectionItem._pen = QPen(QColor("#AAA"), 2, Qt.SolidLine)
         self.setZValue(-1)  # Toujours derrière les noeuds
-        self.setPen(QPen(QColor("#AAA"), 2, Qt.SolidLine))
+        self.setPen(ConnectionItem._pen)
+        self.update_path()
+
+    def set_start(self, start_pos: QPointF):
+        self.start_pos = start_pos
+        self.update_path()
+
+    def set_end(self, end_pos: QPointF):
+        self.end_pos = end_pos
         self.update_path()
 
     def update_positions(self, start_pos: QPointF, end_pos: QPointF):
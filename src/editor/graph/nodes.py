@@ -1,123 +1,228 @@
+from typing import Dict, List, Optional, Tuple
+
 from PySide6.QtWidgets import QGraphicsItem
 from PySide6.QtGui import QBrush, QColor, QPen, QPainter, QFont, QFontMetrics, QLinearGradient
-from PySide6.QtCore import Qt, QRectF
+from PySide6.QtCore import Qt, QRectF, QPointF
 from src.common.constants import NodeType
 from src.common.models import NodeModel
 
+NODE_WIDTH = 240  # Plus large pour la lisibilité
+NODE_HEIGHT = 160  # Plus haut pour le contenu
+HEADER_HEIGHT = 32
+MAX_CHOICES_SHOWN = 3
+
+# itemChange est appelé pour chaque changement d'état de l'item (drapeaux, scène, position...) :
+# comparaisons sur des constantes locales plutôt que des attributs d'énumération
+_POSITION_CHANGE = QGraphicsItem.ItemPositionChange
+_POSITION_HAS_CHANGED = QGraphicsItem.ItemPositionHasChanged
+
+# Couleurs inspirées du thème Dark/Twine : (en-tête, corps, bordure)
+_COLORS = {
+    NodeType.SCENE: ("#2c3e50", "#1e1e1e", "#34495e"),  # Bleu nuit, gris très sombre
+    NodeType.SET_VAR: ("#27ae60", "#1e1e1e", "#2ecc71"),  # Vert
+}
+_DEFAULT_COLORS = ("#444", "#111", "#7f8c8d")
+
+
+class _NodeStyle:
+    """Pinceaux, stylos et polices d'un type de nœud, partagés par tous ses items."""
+
+    def __init__(self, node_type: NodeType):
+        header, body, border = _COLORS.get(node_type, _DEFAULT_COLORS)
+        self.header_color = QColor(header)
+        self.body_color = QColor(body)
+        self.border_color = QColor(border)
+
+        grad = QLinearGradient(0, 0, 0, HEADER_HEIGHT)
+        grad.setColorAt(0, self.header_color.lighter(120))
+        grad.setColorAt(1, self.header_color)
+        self.header_brush = QBrush(grad)
+        self.body_brush = QBrush(self.body_color)
+        self.border_pen = QPen(self.border_color, 1)
+
+
+class _Shared:
+    """Ressources communes créées au premier dessin (QFont exige une QGuiApplication)."""
+    styles: Dict[NodeType, _NodeStyle] = {}
+    shadow_brush: Optional[QBrush] = None
+
+    @classmethod
+    def init(cls):
+        if cls.shadow_brush is not None:
+            return
+        cls.shadow_brush = QBrush(QColor(0, 0, 0, 100))
+        cls.selected_pen = QPen(QColor("#f1c40f"), 2)  # Jaune Or
+        cls.separator_pen = QPen(QColor("#333"), 1)
+        cls.title_color = QColor("#ecf0f1")  # Blanc cassé
+        cls.preview_color = QColor("#bdc3c7")  # Gris clair
+        cls.link_color = QColor("#3498db")  # Bleu lien
+        cls.more_color = QColor("#555")
+        cls.logic_color = QColor("#2ecc71")
+        cls.title_font = QFont("Segoe UI", 10, QFont.Bold)
+        cls.content_font = QFont("Consolas", 9)
+        cls.content_metrics = QFontMetrics(cls.content_font)
+
+    @classmethod
+    def style(cls, node_type: NodeType) -> _NodeStyle:
+        style = cls.styles.get(node_type)
+        if style is None:
+            style = cls.styles[node_type] = _NodeStyle(node_type)
+        return style
+
 
 class NodeItem(QGraphicsItem):
+    """
+    Nœud du graphe.
+
+    Les textes affichés (titre, aperçu, choix tronqués) sont préparés une fois et gardés
+    jusqu'à refresh() ; polices, pinceaux et dégradés sont partagés par type de nœud.
+    Le rendu détaillé est mis en cache par Qt (DeviceCoordinateCache) : un déplacement
+    de la vue recopie le cache, seul update() (modèle, sélection) le fait redessiner.
+    Sous LOD_THRESHOLD (zoom arrière), le nœud est réduit à ses blocs de couleur,
+    sans texte ni ombre, et n'a pas de cache (voir NodeScene.set_zoom).
+    """
+    LOD_THRESHOLD = 0.45
+
     def __init__(self, model: NodeModel):
         super().__init__()
         self.model = model
-        self.width = 240  # Plus large pour la lisibilité
-        self.height = 160  # Plus haut pour le contenu
-
-        self.setFlag(QGraphicsItem.ItemIsMovable)
-        self.setFlag(QGraphicsItem.ItemIsSelectable)
-        self.setFlag(QGraphicsItem.ItemSendsGeometryChanges)
+        self.width = NODE_WIDTH
+        self.height = NODE_HEIGHT
 
+        # Position initiale avant ItemSendsGeometryChanges : le modèle la connaît déjà
         self.setPos(self.model.position[0], self.model.position[1])
+        self.setFlags(QGraphicsItem.ItemIsMovable | QGraphicsItem.ItemIsSelectable
+                      | QGraphicsItem.ItemSendsGeometryChanges)
+        self.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
 
-        # Couleurs inspirées du thème Dark/Twine
-        if self.model.type == NodeType.SCENE:
-            self.header_color = QColor("#2c3e50")  # Bleu nuit
-            self.body_color = QColor("#1e1e1e")  # Gris très sombre
-            self.border_color = QColor("#34495e")
-        elif self.model.type == NodeType.SET_VAR:
-            self.header_color = QColor("#27ae60")  # Vert
-            self.body_color = QColor("#1e1e1e")
-            self.border_color = QColor("#2ecc71")
-        else:
-            self.header_color = QColor("#444")
-            self.body_color = QColor("#111")
-            self.border_color = QColor("#7f8c8d")
+        self.style = _Shared.style(self.model.type)
+        self.header_color = self.style.header_color
+        self.body_color = self.style.body_color
+        self.border_color = self.style.border_color
+
+        # (titre, aperçu, choix tronqués, texte "+N" / ligne SET_VAR) ; None = à recalculer
+        self._texts: Optional[Tuple[str, str, List[str], str]] = None
 
     def boundingRect(self):
-        return QRectF(0, 0, self.width, self.height)
+        # Ombre portée (+4) et bordure de sélection (2 px) comprises : sans rafraîchissement
+        # complet de la vue, tout ce qui est peint doit tenir dans ce rectangle
+        return QRectF(-1, -1, self.width + 6, self.height + 6)
+
+    # --- Points d'attache des liens (coordonnées de scène) ---
+    def output_anchor(self, slot: int) -> QPointF:
+        """Bord droit, à hauteur de la ligne du choix (la dernière ligne pour les choix non affichés)."""
+        row = min(slot, MAX_CHOICES_SHOWN)
+        return self.pos() + QPointF(self.width, 96 + 18 * row)
+
+    def input_anchor(self) -> QPointF:
+        """Bord gauche, au milieu de l'en-tête."""
+        return self.pos() + QPointF(0, HEADER_HEIGHT / 2)
+
+    def refresh(self):
+        """Le modèle a changé (titre, texte, choix...) : textes recalculés et cache redessiné."""
+        self._texts = None
+        self.update()
+
+    def set_detailed(self, detailed: bool):
+        """Zoom au-dessus / en dessous du seuil de LOD (appelé par la scène)."""
+        self.setCacheMode(QGraphicsItem.DeviceCoordinateCache if detailed else QGraphicsItem.NoCache)
+
+    def _layout_texts(self) -> Tuple[str, str, List[str], str]:
+        model = self.model
+        title = getattr(model, 'title', model.id[:8])
+        if model.type == NodeType.START:
+            title = f"★ {title}"
+
+        preview, choices, extra = "", [], ""
+        if model.type == NodeType.SCENE:
+            preview = model.content.text[:40].replace('\n', ' ')
+            if len(model.content.text) > 40: preview += "..."
+            metrics = _Shared.content_metrics
+            for choice in model.content.choices[:MAX_CHOICES_SHOWN]:
+                # Tronquer si trop long
+                choices.append(metrics.elidedText(f"[[ {choice.text} ]]", Qt.ElideRight, self.width - 30))
+            if len(model.content.choices) > MAX_CHOICES_SHOWN:
+                extra = f"... (+{len(model.content.choices) - MAX_CHOICES_SHOWN})"
+        elif model.type == NodeType.SET_VAR:
+            # Legacy var display
+            extra = f"{model.content.variable_name} {model.content.operation} {model.content.value}"
+        return title, preview, choices, extra
 
     def paint(self, painter, option, widget=None):
-        rect = self.boundingRect()
-
-        # 1. Ombre portée (Performance correcte)
-        painter.setBrush(QColor(0, 0, 0, 100))
+        _Shared.init()
+        style = self.style
+        rect = QRectF(0, 0, self.width, self.height)
+        header_rect = QRectF(0, 0, self.width, HEADER_HEIGHT)
+        border_pen = _Shared.selected_pen if self.isSelected() else style.border_pen
+
+        # Niveau de détail réduit : blocs de couleur uniquement
+        if option.levelOfDetailFromTransform(painter.worldTransform()) < self.LOD_THRESHOLD:
+            painter.setPen(border_pen)
+            painter.setBrush(style.body_brush)
+            painter.drawRect(rect)
+            painter.fillRect(header_rect, style.header_color)
+            return
+
+        # 1. Ombre portée
+        painter.setBrush(_Shared.shadow_brush)
         painter.setPen(Qt.NoPen)
         painter.drawRoundedRect(rect.translated(4, 4), 8, 8)
 
-        # 2. Corps du nœud
-        painter.setBrush(QBrush(self.body_color))
-
-        # Bordure de sélection (Or) ou Normale
-        if self.isSelected():
-            painter.setPen(QPen(QColor("#f1c40f"), 2))  # Jaune Or
-        else:
-            painter.setPen(QPen(self.border_color, 1))
-
+        # 2. Corps du nœud (bordure de sélection or ou normale)
+        painter.setBrush(style.body_brush)
+        painter.setPen(border_pen)
         painter.drawRoundedRect(rect, 8, 8)
 
         # 3. En-tête (Gradient)
-        header_rect = QRectF(0, 0, self.width, 32)
-        grad = QLinearGradient(0, 0, 0, 32)
-        grad.setColorAt(0, self.header_color.lighter(120))
-        grad.setColorAt(1, self.header_color)
-        painter.setBrush(QBrush(grad))
+        painter.setBrush(style.header_brush)
         painter.setPen(Qt.NoPen)
         painter.drawRoundedRect(header_rect, 8, 8)
         # Couvrir le bas de l'arrondi pour faire une barre droite
         painter.drawRect(0, 24, self.width, 8)
 
-        # 4. Titre (Nom de la Scène)
-        painter.setPen(QColor("#ecf0f1"))  # Blanc cassé
-        font_title = QFont("Segoe UI", 10, QFont.Bold)
-        painter.setFont(font_title)
-
-        display_title = getattr(self.model, 'title', self.model.id[:8])
-        if self.model.type == NodeType.START:
-            display_title = f"★ {display_title}"
+        if self._texts is None:
+            self._texts = self._layout_texts()
+        title, preview, choices, extra = self._texts
 
-        painter.drawText(header_rect, Qt.AlignCenter, display_title)
+        # 4. Titre (Nom de la Scène)
+        painter.setPen(_Shared.title_color)
+        painter.setFont(_Shared.title_font)
+        painter.drawText(header_rect, Qt.AlignCenter, title)
 
         # 5. Contenu (Aperçu Texte + Choix)
         content_rect = QRectF(12, 40, self.width - 24, self.height - 50)
-        font_content = QFont("Consolas", 9)
-        painter.setFont(font_content)
+        painter.setFont(_Shared.content_font)
 
         if self.model.type == NodeType.SCENE:
-            # Aperçu du texte narratif (Gris clair)
-            painter.setPen(QColor("#bdc3c7"))
-            preview_text = self.model.content.text[:40].replace('\n', ' ')
-            if len(self.model.content.text) > 40: preview_text += "..."
-            painter.drawText(content_rect.x(), content_rect.y() + 12, preview_text)
+            painter.setPen(_Shared.preview_color)
+            painter.drawText(QPointF(content_rect.x(), content_rect.y() + 12), preview)
 
             # Ligne de séparation
-            painter.setPen(QPen(QColor("#333"), 1))
+            painter.setPen(_Shared.separator_pen)
             painter.drawLine(10, 65, self.width - 10, 65)
 
             # Liste des Choix (Liens)
-            painter.setPen(QColor("#3498db"))  # Bleu lien
+            painter.setPen(_Shared.link_color)
             y_offset = 60
-            choices = self.model.content.choices
-
-            for i, choice in enumerate(choices[:3]):  # Max 3 affichés
-                choice_txt = f"[[ {choice.text} ]]"
-                # Tronquer si trop long
-                metrics = QFontMetrics(font_content)
-                choice_txt = metrics.elidedText(choice_txt, Qt.ElideRight, self.width - 30)
-
-                painter.drawText(content_rect.x(), content_rect.y() + y_offset, choice_txt)
+            for choice_txt in choices:
+                painter.drawText(QPointF(content_rect.x(), content_rect.y() + y_offset), choice_txt)
                 y_offset += 18
 
             # Indicateur si plus de choix
-            if len(choices) > 3:
-                painter.setPen(QColor("#555"))
-                painter.drawText(content_rect.x(), content_rect.y() + y_offset, f"... (+{len(choices) - 3})")
+            if extra:
+                painter.setPen(_Shared.more_color)
+                painter.drawText(QPointF(content_rect.x(), content_rect.y() + y_offset), extra)
 
         elif self.model.type == NodeType.SET_VAR:
-            painter.setPen(QColor("#2ecc71"))
-            # Legacy var display
-            txt = f"{self.model.content.variable_name} {self.model.content.operation} {self.model.content.value}"
-            painter.drawText(content_rect, Qt.AlignCenter, txt)
+            painter.setPen(_Shared.logic_color)
+            painter.drawText(content_rect, Qt.AlignCenter, extra)
 
     def itemChange(self, change, value):
-        if change == QGraphicsItem.ItemPositionChange:
+        if change == _POSITION_CHANGE:
             self.model.position = [value.x(), value.y()]
-        return super().itemChange(change, value)
\ No newline at end of file
+        elif change == _POSITION_HAS_CHANGED:
+            # Seuls les liens attachés à ce nœud sont recalculés
+            scene = self.scene()
+            if scene is not None:
+                scene.node_moved(self)
+        return super().itemChange(change, value)
@@ -1,14 +1,29 @@
+from typing import Dict, List, Optional, Set, Tuple
+
 from PySide6.QtWidgets import QGraphicsScene
-from PySide6.QtGui import QColor, QPen, QBrush
-from PySide6.QtCore import Qt, QLineF
-import math
+from PySide6.QtCore import Signal
+from PySide6.QtGui import QColor, QPen, QBrush, QPainter, QPixmap, QTransform
+from src.editor.graph.nodes import NodeItem
+from src.editor.graph.connections import ConnectionItem
+
+# Lignes de grille plus serrées que ce nombre de pixels : non dessinées
+MIN_LINE_SPACING = 8
+# Une grande case = GRID_MAJOR petites cases
+GRID_MAJOR = 5
+# Côté maximal (pixels) de la tuile de grille ; au-delà, le pinceau l'agrandit
+MAX_GRID_TILE = 512
 
 
 class NodeScene(QGraphicsScene):
     """
     La scène qui contient tous les noeuds.
     Gère le dessin de la grille de fond (Grid).
+    Rendu piloté par les événements : aucun rafraîchissement périodique, une modification
+    du modèle est signalée par node_changed() et seul le nœud concerné est repeint.
     """
+    nodeAdded = Signal(object)  # NodeModel du nœud ajouté à la scène
+    nodeRemoved = Signal(str)  # UUID du nœud retiré de la scène
+    nodeMoved = Signal(str)  # UUID du nœud déplacé (position du modèle mise à jour)
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -20,39 +35,169 @@ class NodeScene(QGraphicsScene):
         # Taille virtuelle immense
         self.setSceneRect(-50000, -50000, 100000, 100000)
 
+        # Grille : pinceau de la tuile courante et sa clé (taille en pixels, pas des lignes)
+        self._grid_key = None
+        self._grid_brush_cache: Optional[QBrush] = None
+
+        # Index UUID -> NodeItem (tenu à jour par addItem / removeItem)
+        self.node_items: Dict[str, NodeItem] = {}
+        self._detailed = True  # Zoom au-dessus du seuil de LOD des nœuds
+
+        # Index d'adjacence des liens (choix) : UUID -> liens sortants / entrants
+        self.outgoing: Dict[str, List[ConnectionItem]] = {}
+        self.incoming: Dict[str, List[ConnectionItem]] = {}
+        # Choix qui visent un nœud, qu'il soit dans la scène ou non : cible -> {(source, index du choix)}
+        self._wanted_by: Dict[str, Set[Tuple[str, int]]] = {}
+        # Inverse du précédent : source -> [(index du choix, cible)]
+        self._targets_of: Dict[str, List[Tuple[int, str]]] = {}
+
+    def addItem(self, item):
+        super().addItem(item)
+        if isinstance(item, NodeItem):
+            node_id = item.model.id
+            self.node_items[node_id] = item
+            if not self._detailed:
+                item.set_detailed(False)
+            # Liens sortants, puis liens entrants des nœuds déjà présents
+            self.refresh_edges(node_id)
+            for source_id, slot in self._wanted_by.get(node_id, ()):
+                if source_id != node_id and source_id in self.node_items:
+                    self._connect(source_id, slot, node_id)
+            self.nodeAdded.emit(item.model)
+
+    def removeItem(self, item):
+        if isinstance(item, NodeItem) and self.node_items.get(item.model.id) is item:
+            node_id = item.model.id
+            for edge in self.incoming.pop(node_id, []):
+                if edge.source_id != node_id:
+                    self.outgoing[edge.source_id].remove(edge)
+                    super().removeItem(edge)
+            self._disconnect_outgoing(node_id)
+            del self.node_items[node_id]
+            super().removeItem(item)
+            self.nodeRemoved.emit(node_id)
+            return
+        super().removeItem(item)
+
+    # --- Liens ---
+    def refresh_edges(self, node_id: str):
+        """Reconstruit les liens sortants du nœud (choix ajoutés, supprimés ou reciblés)."""
+        self._disconnect_outgoing(node_id)
+        item = self.node_items.get(node_id)
+        if item is None:
+            return
+        targets = self._choice_targets(item)
+        if not targets:
+            return
+        self._targets_of[node_id] = targets
+        for slot, target_id in targets:
+            self._wanted_by.setdefault(target_id, set()).add((node_id, slot))
+            if target_id in self.node_items:
+                self._connect(node_id, slot, target_id)
+
+    @staticmethod
+    def _choice_targets(item: NodeItem) -> List[Tuple[int, str]]:
+        choices = getattr(item.model.content, "choices", None)
+        if not choices:
+            return []
+        return [(slot, choice.target_node_id) for slot, choice in enumerate(choices) if choice.target_node_id]
+
+    def node_moved(self, item: NodeItem):
+        """Un nœud a bougé : seuls ses liens sont recalculés."""
+        node_id = item.model.id
+        for edge in self.outgoing.get(node_id, ()):
+            edge.set_start(item.output_anchor(edge.slot))
+        anchor = item.input_anchor()
+        for edge in self.incoming.get(node_id, ()):
+            edge.set_end(anchor)
+        self.nodeMoved.emit(node_id)
+
+    def _connect(self, source_id: str, slot: int, target_id: str):
+        source, target = self.node_items[source_id], self.node_items[target_id]
+        edge = ConnectionItem(source.output_anchor(slot), target.input_anchor(),
+                              source_id=source_id, slot=slot, target_id=target_id)
+        super().addItem(edge)
+        self.outgoing.setdefault(source_id, []).append(edge)
+        self.incoming.setdefault(target_id, []).append(edge)
+
+    def _disconnect_outgoing(self, node_id: str):
+        for edge in self.outgoing.pop(node_id, []):
+            incoming = self.incoming.get(edge.target_id)
+            if incoming is not None:
+                incoming.remove(edge)
+            super().removeItem(edge)
+        for slot, target_id in self._targets_of.pop(node_id, ()):
+            wanted = self._wanted_by.get(target_id)
+            if wanted is not None:
+                wanted.discard((node_id, slot))
+                if not wanted:
+                    del self._wanted_by[target_id]
+
+    def set_zoom(self, zoom: float):
+        """Échelle de la vue : bascule les nœuds en niveau de détail réduit sous le seuil."""
+        detailed = zoom >= NodeItem.LOD_THRESHOLD
+        if detailed != self._detailed:
+            self._detailed = detailed
+            for item in self.node_items.values():
+                item.set_detailed(detailed)
+
+    def node_changed(self, node_id: str):
+        """Le modèle du nœud a changé : repeint son item, ne reconstruit ses liens que si les cibles ont changé."""
+        item = self.node_items.get(node_id)
+        if item is None:
+            return
+        item.refresh()
+        if self._choice_targets(item) != self._targets_of.get(node_id, []):
+            self.refresh_edges(node_id)
+            return
+        # Liens inchangés (texte, titre...) : seules les ancres de départ sont recalées
+        for edge in self.outgoing.get(node_id, ()):
+            edge.set_start(item.output_anchor(edge.slot))
+
     def drawBackground(self, painter, rect):
-        """Dessine une grille infinie performante."""
+        """
+        Dessine une grille infinie à coût constant : une tuile (une grande case et ses
+        lignes fines) est rendue une fois par niveau de zoom puis répétée par un pinceau.
+        Sous MIN_LINE_SPACING pixels, les lignes fines disparaissent, puis les grandes
+        cases sont regroupées par GRID_MAJOR (100, 500, 2500... unités).
+        """
         super().drawBackground(painter, rect)
+        # Pixels physiques par unité de scène (vue sans rotation)
+        scale = painter.worldTransform().m11() * painter.device().devicePixelRatioF()
+        if scale <= 0:
+            return
+        painter.fillRect(rect, self._grid_brush(scale))
+
+    def _grid_brush(self, scale: float) -> QBrush:
+        major = self.grid_size * GRID_MAJOR
+        while major * scale < MIN_LINE_SPACING:
+            major *= GRID_MAJOR
+        minor = self.grid_size if major == self.grid_size * GRID_MAJOR and self.grid_size * scale >= MIN_LINE_SPACING else 0
+
+        # Taille entière de la tuile en pixels ; le pinceau la ramène à `major` unités de scène.
+        # Bornée : au zoom maximal (écran haute densité), la tuile est agrandie par le pinceau
+        tile_px = min(MAX_GRID_TILE, max(1, round(major * scale)))
+        key = (tile_px, major, minor)
+        if key != self._grid_key:
+            self._grid_key = key
+            self._grid_brush_cache = QBrush(self._render_tile(tile_px, major, minor))
+            self._grid_brush_cache.setTransform(QTransform.fromScale(major / tile_px, major / tile_px))
+        return self._grid_brush_cache
 
-        left = int(math.floor(rect.left()))
-        right = int(math.ceil(rect.right()))
-        top = int(math.floor(rect.top()))
-        bottom = int(math.ceil(rect.bottom()))
-
-        first_left = left - (left % self.grid_size)
-        first_top = top - (top % self.grid_size)
-
-        # Lignes fines
-        lines_light = []
-        lines_dark = []
-
-        for x in range(first_left, right, self.grid_size):
-            line = QLineF(x, top, x, bottom)
-            if x % (self.grid_size * 5) == 0:
-                lines_dark.append(line)
-            else:
-                lines_light.append(line)
-
-        for y in range(first_top, bottom, self.grid_size):
-            line = QLineF(left, y, right, y)
-            if y % (self.grid_size * 5) == 0:
-                lines_dark.append(line)
-            else:
-                lines_light.append(line)
-
-        # Dessin
-        painter.setPen(QPen(self.grid_color_light, 1))
-        painter.drawLines(lines_light)
-
-        painter.setPen(QPen(self.grid_color_dark, 2))
-        painter.drawLines(lines_dark)
\ No newline at end of file
+    def _render_tile(self, tile_px: int, major: int, minor: int) -> QPixmap:
+        tile = QPixmap(tile_px, tile_px)
+        tile.fill(self.backgroundBrush().color())
+        painter = QPainter(tile)
+        if minor:
+            step = tile_px * minor / major
+            painter.setPen(QPen(self.grid_color_light, 1))
+            for k in range(1, major // minor):
+                offset = round(k * step)
+                painter.drawLine(offset, 0, offset, tile_px)
+                painter.drawLine(0, offset, tile_px, offset)
+        # Ligne de la grande case sur les bords gauche et haut (2 px en zoom avant, 1 px en arrière)
+        width = 2 if tile_px >= 4 * MIN_LINE_SPACING else 1
+        painter.fillRect(0, 0, width, tile_px, self.grid_color_dark)
+        painter.fillRect(0, 0, tile_px, width, self.grid_color_dark)
+        painter.end()
+        return tile
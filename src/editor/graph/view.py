@@ -2,6 +2,9 @@ from PySide6.QtWidgets import QGraphicsView
 from PySide6.QtCore import Qt
 from PySide6.QtGui import QPainter, QMouseEvent
 
+# Zoom avant maximal (échelle scène -> vue) : borne aussi la tuile de grille
+MAX_ZOOM = 4.0
+
 
 class NodeGraphView(QGraphicsView):
     """
@@ -12,7 +15,8 @@ class NodeGraphView(QGraphicsView):
     def __init__(self, scene, parent=None):
         super().__init__(scene, parent)
         self.setRenderHint(QPainter.Antialiasing)
-        self.setViewportUpdateMode(QGraphicsView.FullViewportUpdate)
+        # Seules les zones invalidées (items modifiés, déplacés, sélectionnés) sont repeintes
+        self.setViewportUpdateMode(QGraphicsView.MinimalViewportUpdate)
         self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
         self.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
         self.setTransformationAnchor(QGraphicsView.AnchorUnderMouse)
@@ -28,7 +32,12 @@ class NodeGraphView(QGraphicsView):
         else:
             zoom_factor = zoom_out_factor
 
+        zoom = self.transform().m11()
+        zoom_factor = min(zoom * zoom_factor, MAX_ZOOM) / zoom
+        if zoom_factor == 1:
+            return
         self.scale(zoom_factor, zoom_factor)
+        self.scene().set_zoom(self.transform().m11())
 
     def mousePressEvent(self, event: QMouseEvent):
         """Active le Pan avec le bouton du milieu ou Alt+Clic."""
@@ -0,0 +1,276 @@
+"""
+Journal des éditions : rien n'est perdu si l'éditeur plante entre deux sauvegardes.
+
+Chaque mutation du modèle (nœud ajouté / modifié / supprimé, déplacement, métadonnées
+du projet) est ajoutée au journal par un seul os.write : le système la garde même si
+le processus meurt. Un thread de fond fait le fsync (regroupé) pour survivre aussi à
+une coupure de courant, sans bloquer l'UI.
+
+Le journal est une suite de segments (journal-<n>.log, une ligne JSON par entrée).
+Chaque segment commence par une entrée "begin" qui désigne le fichier de base : le
+projet sauvegardé auquel les entrées s'appliquent. Les entrées décrivent un état
+absolu (nœud complet, position, suppression), donc rejouer un segment sur une base
+plus récente que lui ne change rien : c'est ce qui rend le compactage sûr.
+
+Compactage (checkpoint) : les entrées suivantes partent dans un nouveau segment, le
+projet est sauvegardé par le ProjectSaver, et les segments précédents ne sont
+supprimés qu'une fois la sauvegarde écrite. Le numéro du dernier segment compacté
+est d'abord noté dans le fichier "compacted" : un segment qui n'a pas pu être
+supprimé (fichier encore ouvert sous Windows, par exemple) n'est jamais rejoué et
+sa suppression est retentée plus tard.
+"""
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from src.common.loaders import load_project_data, write_atomic
+from src.common.models import NodeModel, ProjectModel
+
+SEGMENT_PATTERN = "journal-*.log"
+COMPACTED_FILE = "compacted"  # Numéro du dernier segment compacté (couvert par une sauvegarde)
+SYNC_DELAY = 0.2  # s : les fsync sont regroupés sur cette fenêtre
+
+
+def _segment_number(path: Path) -> int:
+    return int(path.stem.split("-", 1)[1])
+
+
+class EditJournal:
+    """
+    folder : dossier des segments (un seul éditeur à la fois).
+    base / split : fichier du dernier compactage et sa disposition (None : projet vide).
+    """
+
+    def __init__(self, folder):
+        self.folder = Path(folder)
+        self.base: Optional[str] = None
+        self.split = False
+        self.project: Optional[ProjectModel] = None
+        self.entries = 0  # Entrées depuis le dernier compactage
+
+        self._segment = 0
+        self._fd: Optional[int] = None
+        self._lock = threading.Lock()
+        # (segment, descripteur) des segments terminés, à synchroniser puis fermer
+        self._retired: List[Tuple[int, int]] = []
+        # Tenu pendant un fsync / une fermeture de descripteur et pendant la suppression
+        # des segments : un segment n'est jamais supprimé avec un descripteur encore ouvert
+        self._io_lock = threading.Lock()
+        self._unlink_failed = False  # Segments compactés restés sur le disque, à supprimer
+        self._wakeup = threading.Event()
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+
+    # --- Reprise après plantage ---
+    def _files(self) -> List[Path]:
+        if not self.folder.is_dir():
+            return []
+        return sorted(self.folder.glob(SEGMENT_PATTERN), key=_segment_number)
+
+    def _compacted(self) -> int:
+        try:
+            return int((self.folder / COMPACTED_FILE).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return 0
+
+    def segments(self) -> List[Path]:
+        """Segments non compactés, du plus ancien au plus récent."""
+        compacted = self._compacted()
+        return [path for path in self._files() if _segment_number(path) > compacted]
+
+    def has_recovery(self) -> bool:
+        """Des segments non compactés existent : la session précédente ne s'est pas terminée proprement."""
+        return any(self._read(path)[1] for path in self.segments())
+
+    @staticmethod
+    def _read(path: Path) -> Tuple[Optional[dict], List[dict]]:
+        """(entrée begin, autres entrées) ; une dernière ligne tronquée par le plantage est ignorée."""
+        begin, entries = None, []
+        try:
+            lines = path.read_bytes().splitlines()
+        except OSError:
+            return None, []
+        for line in lines:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if entry.get("op") == "begin":
+                begin = begin or entry
+            else:
+                entries.append(entry)
+        return begin, entries
+
+    def replay(self) -> ProjectModel:
+        """Recharge le fichier de base du plus ancien segment et lui applique toutes les entrées."""
+        segments = [self._read(path) for path in self.segments()]
+        begin = next((b for b, _entries in segments if b is not None), None) or {}
+        self.base = begin.get("base")
+        self.split = bool(begin.get("split"))
+
+        project = ProjectModel()
+        if self.base:
+            try:
+                project = ProjectModel(**load_project_data(Path(self.base)))
+            except (OSError, ValueError) as e:
+                print(f"[Journal] Base illisible ({self.base}), reprise depuis un projet vide : {e}")
+
+        for _begin, entries in segments:
+            for entry in entries:
+                self._apply(project, entry)
+        return project
+
+    @staticmethod
+    def _apply(project: ProjectModel, entry: dict):
+        op = entry.get("op")
+        if op == "node":
+            node = NodeModel(**entry["node"])
+            project.nodes[node.id] = node
+        elif op == "move":
+            node = project.nodes.get(entry["id"])
+            if node is not None:
+                node.position = entry["pos"]
+        elif op == "del":
+            project.nodes.pop(entry["id"], None)
+        elif op == "project":
+            header = ProjectModel(**entry["project"])
+            for field in ProjectModel.model_fields:
+                if field != "nodes":
+                    setattr(project, field, getattr(header, field))
+
+    def discard(self):
+        """Supprime les segments existants (reprise refusée, fermeture normale)."""
+        files = self._files()
+        if files:
+            self._drop_segments(_segment_number(files[-1]))
+
+    # --- Écriture ---
+    def start(self, project: ProjectModel, base: Optional[str] = None, split: bool = False):
+        """Ouvre un nouveau segment après ceux qui existent déjà (conservés jusqu'au prochain compactage)."""
+        self.project = project
+        self.base = str(base) if base else None
+        self.split = split
+        self.folder.mkdir(parents=True, exist_ok=True)
+        existing = self._files()
+        # Numérotation après les segments existants et le dernier compactage
+        self._segment = max(_segment_number(existing[-1]) if existing else 0, self._compacted())
+        self._open_segment()
+        self._thread = threading.Thread(target=self._sync_loop, name="edit-journal", daemon=True)
+        self._thread.start()
+
+    def _open_segment(self):
+        self._segment += 1
+        path = self.folder / f"journal-{self._segment}.log"
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND | getattr(os, "O_BINARY", 0), 0o644)
+        os.write(fd, (json.dumps({"op": "begin", "base": self.base, "split": self.split}) + "\n").encode("utf-8"))
+        with self._lock:
+            if self._fd is not None:
+                self._retired.append((self._segment - 1, self._fd))
+            self._fd = fd
+        self._wakeup.set()
+
+    def _append(self, line: str):
+        fd = self._fd
+        if fd is None:
+            return
+        os.write(fd, line.encode("utf-8"))
+        self.entries += 1
+        self._wakeup.set()
+
+    def record_node(self, node_id: str):
+        """Nœud ajouté, modifié ou supprimé : son état complet (ou sa suppression)."""
+        node = self.project.nodes.get(node_id)
+        if node is None:
+            self._append(f'{{"op":"del","id":{json.dumps(node_id)}}}\n')
+        else:
+            self._append(f'{{"op":"node","node":{node.model_dump_json()}}}\n')
+
+    def record_move(self, node_id: str):
+        node = self.project.nodes.get(node_id)
+        if node is not None:
+            x, y = node.position
+            self._append(f'{{"op":"move","id":{json.dumps(node_id)},"pos":[{float(x)!r},{float(y)!r}]}}\n')
+
+    def record_project(self):
+        """Métadonnées, variables, assets ou nœud de départ modifiés."""
+        self._append(f'{{"op":"project","project":{self.project.model_dump_json(exclude={"nodes"})}}}\n')
+
+    # --- Compactage ---
+    def checkpoint(self, saver, path, split: bool = False):
+        """
+        Démarre un nouveau segment et sauvegarde le projet dans path (en arrière-plan) ;
+        les segments précédents sont supprimés une fois la sauvegarde écrite.
+        """
+        self.base = str(path)
+        self.split = split
+        obsolete = self._segment
+        # Nouveau segment d'abord : l'ancien est déjà retiré quand la sauvegarde se termine
+        self._open_segment()
+        self.entries = 0
+        saver.save(path, split=split, on_written=lambda: self._drop_segments(obsolete))
+
+    def _drop_segments(self, last: int):
+        """Thread de sauvegarde : segments jusqu'à last, couverts par le fichier écrit."""
+        with self._io_lock:
+            with self._lock:
+                closing = [fd for segment, fd in self._retired if segment <= last]
+                self._retired = [(segment, fd) for segment, fd in self._retired if segment > last]
+            for fd in closing:
+                os.close(fd)
+            if last > self._compacted():
+                try:
+                    write_atomic(self.folder / COMPACTED_FILE, str(last).encode("utf-8"))
+                except OSError as e:
+                    # Sans la marque, un segment non supprimé serait rejoué : on les garde tous
+                    print(f"[Journal] Compactage non enregistré : {e}")
+                    return
+            self._unlink_compacted()
+
+    def _unlink_compacted(self):
+        """Supprime les segments compactés (sous _io_lock) ; un échec est retenté au prochain passage."""
+        compacted = self._compacted()
+        failed = False
+        for path in self._files():
+            if _segment_number(path) <= compacted:
+                try:
+                    path.unlink()
+                except OSError:
+                    failed = True
+        self._unlink_failed = failed
+
+    def close(self, discard: bool = False):
+        """Arrête le journal ; discard=True supprime les segments (fermeture normale)."""
+        with self._lock:
+            self._closed = True
+            if self._fd is not None:
+                self._retired.append((self._segment, self._fd))
+                self._fd = None
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if discard:
+            self.discard()
+
+    # --- Thread de fond ---
+    def _sync_loop(self):
+        while True:
+            self._wakeup.wait()
+            time.sleep(SYNC_DELAY)
+            self._wakeup.clear()
+            with self._io_lock:
+                with self._lock:
+                    fd, retired, self._retired = self._fd, self._retired, []
+                    closed = self._closed
+                for _segment, old in retired:
+                    os.fsync(old)
+                    os.close(old)
+                if fd is not None:
+                    os.fsync(fd)
+                if self._unlink_failed:
+                    self._unlink_compacted()
+            if closed:
+                return
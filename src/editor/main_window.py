@@ -1,33 +1,61 @@
 import sys
-import json
 import subprocess
-import os
+from pathlib import Path
 from PySide6.QtWidgets import (QMainWindow, QDockWidget, QToolBar, QFileDialog,
                                QMessageBox, QApplication, QPushButton, QMenu)
 from PySide6.QtGui import QAction, QUndoStack
-from PySide6.QtCore import Qt, QTimer
+from PySide6.QtCore import Qt, QTimer, Signal
 
 from src.editor.graph.scene import NodeScene
 from src.editor.graph.view import NodeGraphView
 from src.editor.graph.nodes import NodeItem
 from src.editor.panels.properties import PropertiesPanel
 from src.editor.panels.assets import AssetBrowser
+from src.editor.panels.references import ReferencesPanel
+from src.editor.project_index import ProjectIndex
+from src.editor.project_io import ProjectSaver
+from src.editor.journal import EditJournal
 from src.editor.commands import AddNodeCommand
 from src.common.models import ProjectModel, NodeModel
 from src.common.constants import NodeType
 from src.common.paths import get_base_path
 
 
+SAVE_FILTER_JSON = "JSON (*.json)"
+SAVE_FILTER_SPLIT = "JSON découpé, sauvegarde incrémentale (*.json)"
+
+# Journal des éditions et instantané de compactage d'un projet jamais sauvegardé
+RECOVERY_DIR = "editor_recovery"
+RECOVERY_SNAPSHOT = "snapshot.json"
+COMPACT_INTERVAL_MS = 60000
+
+
 class EditorWindow(QMainWindow):
+    saveFinished = Signal(str, object)  # (chemin, erreur ou None), émis depuis le thread de sauvegarde
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Velkarum Editor")
         self.resize(1600, 900)
 
-        self.project = ProjectModel()
+        # Journal des éditions : reprise de la session précédente si elle a planté
+        self.journal = EditJournal(get_base_path() / RECOVERY_DIR)
+        self.project = self._recover_project()
+        self.index = ProjectIndex(self.project)  # Liens entrants, titres, variables, objets / PNJ
+        # Sauvegarde en arrière-plan : seuls les nœuds modifiés sont resérialisés
+        self.saver = ProjectSaver(self.project)
+        self.saver.on_saved.append(self.saveFinished.emit)
+        self.saveFinished.connect(self.on_save_finished)
+        self.project_path = None
+        self.split_format = False
+        if self.journal.base and Path(self.journal.base) != self._snapshot_path():
+            self.project_path = self.journal.base
+            self.split_format = self.journal.split
         self.undo_stack = QUndoStack(self)
 
         self.scene = NodeScene(self)
+        for node in self.project.nodes.values():
+            self.scene.addItem(NodeItem(node))
         self.view = NodeGraphView(self.scene)
         self.view.setContextMenuPolicy(Qt.CustomContextMenu)
         self.view.customContextMenuRequested.connect(self.open_context_menu)
@@ -38,10 +66,62 @@ class EditorWindow(QMainWindow):
         self._create_actions()
 
         self.scene.selectionChanged.connect(self.on_selection_changed)
+        # Éditions du panneau -> repeint du seul nœud modifié (pas de rafraîchissement périodique)
+        self.prop_panel.nodeEdited.connect(self.scene.node_changed)
+        # Nœuds ajoutés / retirés (y compris par annuler / rétablir) -> cibles des choix
+        self.scene.nodeAdded.connect(self.prop_panel.targets.node_added)
+        self.scene.nodeRemoved.connect(self.prop_panel.targets.node_removed)
+        # Index du projet tenu à jour au fil des éditions
+        self.scene.nodeAdded.connect(self.index.node_added)
+        self.scene.nodeRemoved.connect(self.index.node_removed)
+        self.prop_panel.nodeEdited.connect(self.index.node_changed)
+        self.ref_panel.nodeActivated.connect(self.show_node)
+        self.ref_panel.nodesRenamed.connect(self.on_nodes_renamed)
+        # Suivi des nœuds à resérialiser
+        self.scene.nodeAdded.connect(lambda model: self.saver.mark_dirty(model.id))
+        self.scene.nodeRemoved.connect(self.saver.mark_dirty)
+        self.scene.nodeMoved.connect(self.saver.mark_dirty)
+        self.prop_panel.nodeEdited.connect(self.saver.mark_dirty)
+
+        # Journal : chaque édition est écrite aussitôt, compactée périodiquement dans le projet
+        self.journal.start(self.project, self.journal.base, self.journal.split)
+        self.scene.nodeAdded.connect(lambda model: self.journal.record_node(model.id))
+        # nodeRemoved est émis une fois le modèle retiré de project.nodes (cf. AddNodeCommand.undo) :
+        # record_node écrit alors un "del", et le rejeu après crash ne restaure pas le nœud annulé
+        self.scene.nodeRemoved.connect(self.journal.record_node)
+        self.scene.nodeMoved.connect(self.journal.record_move)
+        self.prop_panel.nodeEdited.connect(self.journal.record_node)
+        self.compact_timer = QTimer(self)
+        self.compact_timer.timeout.connect(self.compact_journal)
+        self.compact_timer.start(COMPACT_INTERVAL_MS)
+        if self.project.nodes:
+            # Session restaurée : l'état rejoué est compacté tout de suite
+            self.compact_journal(force=True)
 
-        self.refresh_timer = QTimer(self)
-        self.refresh_timer.timeout.connect(self.scene.update)
-        self.refresh_timer.start(200)
+    def _snapshot_path(self) -> Path:
+        return get_base_path() / RECOVERY_DIR / RECOVERY_SNAPSHOT
+
+    def _recover_project(self) -> ProjectModel:
+        """Rejoue le journal laissé par une session interrompue, si l'utilisateur le souhaite."""
+        if not self.journal.has_recovery():
+            self.journal.discard()
+            return ProjectModel()
+        answer = QMessageBox.question(
+            None, "Récupération",
+            "L'éditeur ne s'est pas fermé correctement.\nRestaurer les modifications non sauvegardées ?")
+        if answer == QMessageBox.Yes:
+            return self.journal.replay()
+        self.journal.discard()
+        return ProjectModel()
+
+    def compact_journal(self, force: bool = False):
+        """Reporte le journal dans le fichier du projet (instantané de récupération s'il n'a jamais été sauvegardé)."""
+        if not force and not self.journal.entries:
+            return
+        if self.project_path:
+            self.journal.checkpoint(self.saver, self.project_path, self.split_format)
+        else:
+            self.journal.checkpoint(self.saver, self._snapshot_path())
 
     def _create_docks(self):
         self.prop_dock = QDockWidget("Propriétés", self)
@@ -55,14 +135,24 @@ class EditorWindow(QMainWindow):
         self.asset_dock.setWidget(self.asset_panel)
         self.addDockWidget(Qt.LeftDockWidgetArea, self.asset_dock)
 
+        self.ref_dock = QDockWidget("Références", self)
+        self.ref_panel = ReferencesPanel(self.index)
+        self.ref_dock.setWidget(self.ref_panel)
+        self.addDockWidget(Qt.LeftDockWidgetArea, self.ref_dock)
+
     def _create_actions(self):
         toolbar = QToolBar("Outils")
         self.addToolBar(toolbar)
 
         act_save = QAction("Sauvegarder", self)
+        act_save.setShortcut("Ctrl+S")
         act_save.triggered.connect(self.save_project)
         toolbar.addAction(act_save)
 
+        act_save_as = QAction("Sauvegarder sous...", self)
+        act_save_as.triggered.connect(lambda: self.save_project(ask_path=True))
+        toolbar.addAction(act_save_as)
+
         toolbar.addSeparator()
 
         act_undo = self.undo_stack.createUndoAction(self, "Annuler")
@@ -113,11 +203,12 @@ class EditorWindow(QMainWindow):
             model.title = f"Passage {count + 1}"
         elif type == NodeType.SET_VAR:
             model.title = f"Var {count + 1}"
-        if not self.project.nodes: self.project.start_node_id = model.id
+        if not self.project.nodes:
+            self.project.start_node_id = model.id
+            self.journal.record_project()
 
-        self.project.nodes[model.id] = model
         item = NodeItem(model)
-        cmd = AddNodeCommand(self.scene, item)
+        cmd = AddNodeCommand(self.scene, self.project, item)
         self.undo_stack.push(cmd)
         self.scene.clearSelection()
         item.setSelected(True)
@@ -129,28 +220,62 @@ class EditorWindow(QMainWindow):
         else:
             self.prop_panel.load_node(None)
 
-    def save_project(self):
-        path, _ = QFileDialog.getSaveFileName(self, "Sauvegarder", "games/demo/story.json", "JSON (*.json)")
-        if path:
-            try:
-                for item in self.scene.items():
-                    if isinstance(item, NodeItem):
-                        item.model.position = [item.x(), item.y()]
-                with open(path, 'w', encoding='utf-8') as f:
-                    f.write(self.project.model_dump_json(indent=2))
-                self.statusBar().showMessage(f"Sauvegardé: {path}", 3000)
-            except Exception as e:
-                QMessageBox.critical(self, "Erreur", str(e))
+    def show_node(self, node_id: str):
+        """Sélectionne un nœud et centre la vue dessus."""
+        item = self.scene.node_items.get(node_id)
+        if item is None:
+            return
+        self.scene.clearSelection()
+        item.setSelected(True)
+        self.view.centerOn(item)
+
+    def on_nodes_renamed(self, node_ids):
+        self.journal.record_project()  # Variables renommées
+        for node_id in node_ids:
+            self.saver.mark_dirty(node_id)
+            self.journal.record_node(node_id)
+            self.scene.node_changed(node_id)
+            self.prop_panel.targets.node_changed(node_id)
+        current = self.prop_panel.current_node
+        if current is not None and current.id in node_ids:
+            self.prop_panel.load_node(current)
+
+    def save_project(self, ask_path: bool = False):
+        """
+        Capture le projet et l'écrit en arrière-plan (fichier temporaire puis renommage).
+        Les positions des nœuds sont déjà dans le modèle (NodeItem.itemChange).
+        """
+        if ask_path or self.project_path is None:
+            path, selected = QFileDialog.getSaveFileName(
+                self, "Sauvegarder", self.project_path or "games/demo/story.json",
+                f"{SAVE_FILTER_JSON};;{SAVE_FILTER_SPLIT}",
+                SAVE_FILTER_SPLIT if self.split_format else SAVE_FILTER_JSON)
+            if not path:
+                return
+            self.project_path = path
+            self.split_format = selected == SAVE_FILTER_SPLIT
+        # Sauvegarde = compactage : le journal repart de ce fichier
+        self.journal.checkpoint(self.saver, self.project_path, self.split_format)
+        self.statusBar().showMessage(f"Sauvegarde en cours: {self.project_path}")
+
+    def on_save_finished(self, path: str, error):
+        if error:
+            QMessageBox.critical(self, "Erreur", f"Sauvegarde impossible ({path}) :\n{error}")
+        else:
+            self.statusBar().showMessage(f"Sauvegardé: {path}", 3000)
+
+    def closeEvent(self, event):
+        # Termine l'écriture en cours avant de quitter ; fermeture normale : pas de reprise
+        self.saver.close()
+        self.journal.close(discard=True)
+        super().closeEvent(event)
 
     def run_test(self):
         temp_path = get_base_path() / "temp_debug.json"
         try:
-            # Sauvegarde auto temporaire
-            for item in self.scene.items():
-                if isinstance(item, NodeItem):
-                    item.model.position = [item.x(), item.y()]
-            with open(temp_path, 'w', encoding='utf-8') as f:
-                f.write(self.project.model_dump_json(indent=2))
+            # Sauvegarde auto temporaire (attendue : le lecteur la lit au démarrage)
+            self.saver.save(temp_path)
+            self.saver.flush()
 
             main_player = get_base_path() / "main_player.py"
             cmd = [sys.executable, str(main_player), "--project", str(temp_path)]
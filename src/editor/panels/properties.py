@@ -1,16 +1,28 @@
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QLabel, QFormLayout,
                                QLineEdit, QTextEdit, QComboBox, QGroupBox,
                                QPushButton, QScrollArea, QFrame, QSpinBox, QHBoxLayout)
-from PySide6.QtCore import Qt, QTimer
+from PySide6.QtCore import Qt, QTimer, Signal
 from src.common.models import NodeModel, ChoiceModel, ProjectModel, ActionModel
 from src.common.constants import NodeType, VarOperation, ActionType
+from src.editor.panels.targets import NodeTargetModel, TargetComboBox
 
 
 class PropertiesPanel(QWidget):
+    nodeEdited = Signal(str)  # UUID du nœud dont le modèle vient d'être modifié
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.current_node: NodeModel = None
         self.project_ref: ProjectModel = None
+        # Cibles des choix : un modèle partagé par toutes les listes déroulantes
+        self.targets = NodeTargetModel(self)
+        # Blocs affichés, dans l'ordre des listes du modèle (mis à jour sur place),
+        # et blocs masqués réutilisables : une sélection ne fait que relier les widgets
+        self._action_blocks = []
+        self._choice_blocks = []
+        self._action_pool = []
+        self._choice_pool = []
+        self._loading = False  # Valeurs en cours de chargement : pas d'écriture dans le modèle
 
         # STYLE CSS PRO & SOMBRE
         # Note: On utilise [class="..."] pour cibler les propriétés dynamiques Qt
@@ -69,64 +81,87 @@ class PropertiesPanel(QWidget):
         self.header_label.setAlignment(Qt.AlignCenter)
         self.layout.addWidget(self.header_label)
 
-        # Formulaire dynamique
+        # Formulaire : construit une fois par type de nœud, puis relié au nœud sélectionné
         self.form_widget = QWidget()
         self.form_layout = QVBoxLayout(self.form_widget)
         self.form_layout.setContentsMargins(0, 0, 0, 0)
         self.form_layout.setSpacing(10)
         self.layout.addWidget(self.form_widget)
 
+        self._build_identity_ui()
+        self._build_scene_ui()
+        self._build_logic_ui()
+        self._show_groups(None)
+
     def set_project(self, project: ProjectModel):
         self.project_ref = project
+        self.targets.reset(project.nodes.values())
 
     def load_node(self, node: NodeModel):
-        """Reconstruit toute l'interface pour le nœud donné."""
+        """Relie le formulaire au nœud donné : les widgets sont réutilisés, seules les valeurs changent."""
         self.current_node = node
-        self._clear_layout(self.form_layout)
+        self.targets.set_excluded(node.id if node else None)
+        self._show_groups(node)
 
         if node is None:
             self.header_label.setText("SÉLECTIONNEZ UN NŒUD")
             return
 
         self.header_label.setText(f"ÉDITION : {node.type.value.upper()}")
-
-        # --- 1. BLOC IDENTITÉ (Titre) ---
-        id_group = QGroupBox("Identité")
-        id_layout = QFormLayout(id_group)
-
-        current_title = getattr(self.current_node, 'title', self.current_node.id[:8])
-        self.name_edit = QLineEdit(current_title)
-        self.name_edit.setPlaceholderText("Nom unique (ex: Village_Entree)")
-        self.name_edit.textChanged.connect(self._update_title)
-
-        id_layout.addRow("Titre du Passage:", self.name_edit)
-        self.form_layout.addWidget(id_group)
+        self._loading = True
+        try:
+            self.name_edit.setText(getattr(node, 'title', node.id[:8]))
+            if node.type == NodeType.SCENE:
+                self._bind_scene(node)
+            elif node.type == NodeType.SET_VAR:
+                self._bind_logic(node)
+        finally:
+            self._loading = False
 
         # Focus automatique ergonomique
         QTimer.singleShot(50, self._focus_name_field)
 
-        # --- 2. CONTENU SPÉCIFIQUE ---
-        if node.type == NodeType.SCENE:
-            self._build_scene_ui()
-        elif node.type == NodeType.SET_VAR:
-            self._build_logic_ui()
+    def _show_groups(self, node: NodeModel):
+        node_type = node.type if node is not None else None
+        self.id_group.setVisible(node is not None)
+        for group in self.scene_groups:
+            group.setVisible(node_type == NodeType.SCENE)
+        self.logic_group.setVisible(node_type == NodeType.SET_VAR)
 
     def _focus_name_field(self):
-        if hasattr(self, 'name_edit') and self.name_edit.isVisible():
+        if self.name_edit.isVisible():
             self.name_edit.setFocus()
             self.name_edit.selectAll()
 
     def _update_title(self, text):
-        if self.current_node:
-            self.current_node.title = text
+        if self.current_node and not self._loading:
+            self._set(self.current_node, 'title', text)
+            self.targets.node_changed(self.current_node.id)
+
+    def _set(self, obj, attr: str, value):
+        """Modifie le modèle et signale le nœud courant comme modifié."""
+        if self._loading:
+            return
+        setattr(obj, attr, value)
+        self._notify_edit()
 
-    def _clear_layout(self, layout):
-        while layout.count():
-            item = layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-            elif item.layout():
-                self._clear_layout(item.layout())
+    def _notify_edit(self):
+        if self.current_node is not None:
+            self.nodeEdited.emit(self.current_node.id)
+
+    # =========================================================================
+    #  IDENTITÉ
+    # =========================================================================
+    def _build_identity_ui(self):
+        self.id_group = QGroupBox("Identité")
+        id_layout = QFormLayout(self.id_group)
+
+        self.name_edit = QLineEdit()
+        self.name_edit.setPlaceholderText("Nom unique (ex: Village_Entree)")
+        self.name_edit.textChanged.connect(self._update_title)
+
+        id_layout.addRow("Titre du Passage:", self.name_edit)
+        self.form_layout.addWidget(self.id_group)
 
     # =========================================================================
     #  UI SCÈNE (TEXTE, ACTIONS, CHOIX)
@@ -136,15 +171,15 @@ class PropertiesPanel(QWidget):
         narr_group = QGroupBox("Narration")
         narr_layout = QFormLayout(narr_group)
 
-        self.text_edit = QTextEdit(self.current_node.content.text)
+        self.text_edit = QTextEdit()
         self.text_edit.setPlaceholderText("Écrivez l'histoire ici...")
         self.text_edit.setMinimumHeight(100)
         self.text_edit.textChanged.connect(
-            lambda: setattr(self.current_node.content, 'text', self.text_edit.toPlainText()))
+            lambda: self._set(self.current_node.content, 'text', self.text_edit.toPlainText()))
 
-        self.bg_edit = QLineEdit(self.current_node.content.background_image or "")
+        self.bg_edit = QLineEdit()
         self.bg_edit.setPlaceholderText("assets/images/fond.png")
-        self.bg_edit.textChanged.connect(lambda t: setattr(self.current_node.content, 'background_image', t))
+        self.bg_edit.textChanged.connect(lambda t: self._set(self.current_node.content, 'background_image', t))
 
         narr_layout.addRow("Texte:", self.text_edit)
         narr_layout.addRow("Image de fond:", self.bg_edit)
@@ -152,193 +187,287 @@ class PropertiesPanel(QWidget):
 
         # --- B. ÉVÉNEMENTS (ACTIONS) ---
         evt_group = QGroupBox("Événements (On Enter)")
-        evt_layout = QVBoxLayout(evt_group)
+        self.action_layout = QVBoxLayout(evt_group)
 
-        # Liste des actions existantes
-        for i, action in enumerate(self.current_node.content.actions):
-            self._add_action_block(evt_layout, i, action)
-
-        # Bouton Ajouter
+        # Bouton Ajouter (les blocs d'action sont insérés avant lui)
         add_act_btn = QPushButton("+ Ajouter un Événement")
         add_act_btn.setProperty("class", "add-btn")  # CORRECTION
         add_act_btn.setCursor(Qt.PointingHandCursor)
         add_act_btn.clicked.connect(self._add_action)
-        evt_layout.addWidget(add_act_btn)
+        self.action_layout.addWidget(add_act_btn)
 
         self.form_layout.addWidget(evt_group)
 
         # --- C. NAVIGATION (CHOIX) ---
         choice_group = QGroupBox("Navigation & Choix")
-        choice_layout = QVBoxLayout(choice_group)
-
-        # Liste des choix existants
-        for i, choice in enumerate(self.current_node.content.choices):
-            self._add_choice_block(choice_layout, i, choice)
+        self.choice_layout = QVBoxLayout(choice_group)
 
-        # Bouton Ajouter
+        # Bouton Ajouter (les blocs de choix sont insérés avant lui)
         add_ch_btn = QPushButton("+ Ajouter un Choix")
         add_ch_btn.setProperty("class", "add-btn")  # CORRECTION
         add_ch_btn.setCursor(Qt.PointingHandCursor)
         add_ch_btn.clicked.connect(self._add_choice)
-        choice_layout.addWidget(add_ch_btn)
+        self.choice_layout.addWidget(add_ch_btn)
 
         self.form_layout.addWidget(choice_group)
+        self.scene_groups = (narr_group, evt_group, choice_group)
+
+    def _bind_scene(self, node: NodeModel):
+        self.text_edit.setPlainText(node.content.text)
+        self.bg_edit.setText(node.content.background_image or "")
+        self._bind_blocks(node.content.actions, self._action_blocks, self._action_pool,
+                          self.action_layout, self._action_block, self._bind_action)
+        self._bind_blocks(node.content.choices, self._choice_blocks, self._choice_pool,
+                          self.choice_layout, self._choice_block, self._bind_choice)
+
+    def _bind_blocks(self, models, blocks, pool, layout, make, bind):
+        """Autant de blocs affichés que d'éléments : blocs existants reliés, manquants pris dans la réserve."""
+        while len(blocks) > len(models):
+            self._release_block(blocks, pool, layout, len(blocks) - 1)
+        for index, model in enumerate(models):
+            if index == len(blocks):
+                self._insert_block(layout, blocks, pool.pop() if pool else make())
+            bind(blocks[index], index, model)
 
     # --- BLOC ACTION INDIVIDUEL ---
-    def _add_action_block(self, parent_layout, index, action: ActionModel):
+    def _action_block(self) -> QFrame:
+        """Bloc d'action avec les champs de tous les types ; seuls ceux du type courant sont visibles."""
         # Conteneur visuel pour une action
         frame = QFrame()
         frame.setStyleSheet("background-color: #333337; border-radius: 4px; border: 1px solid #454545;")
         layout = QFormLayout(frame)
+        frame.form = layout
+        frame.action = None
 
         # Header avec bouton supprimer
         header_layout = QHBoxLayout()
-        lbl = QLabel(f"<b>Action #{index + 1}</b>")
+        frame.title_label = QLabel()
         del_btn = QPushButton("Supprimer")
         del_btn.setProperty("class", "del-btn")  # CORRECTION
         del_btn.setCursor(Qt.PointingHandCursor)
         del_btn.setFixedWidth(80)
-        del_btn.clicked.connect(lambda _, i=index: self._delete_action(i))
+        # Les callbacks retrouvent la position du bloc au moment du clic (blocs supprimés entre-temps)
+        del_btn.clicked.connect(lambda _, f=frame: self._delete_action(self._action_blocks.index(f)))
 
-        header_layout.addWidget(lbl)
+        header_layout.addWidget(frame.title_label)
         header_layout.addStretch()
         header_layout.addWidget(del_btn)
         layout.addRow(header_layout)
 
         # Type d'action
-        type_combo = QComboBox()
-        type_combo.addItems([t.value for t in ActionType])
-        type_combo.setCurrentText(action.type.value)
-        type_combo.currentTextChanged.connect(lambda t, i=index: self._update_action_type(i, t))
-        layout.addRow("Type:", type_combo)
+        frame.type_combo = QComboBox()
+        frame.type_combo.addItems([t.value for t in ActionType])
+        frame.type_combo.currentTextChanged.connect(lambda t, f=frame: self._update_action_type(f, t))
+        layout.addRow("Type:", frame.type_combo)
 
         # Paramètres contextuels
-        if action.type in [ActionType.ADD_ITEM, ActionType.REMOVE_ITEM]:
-            item_id_edit = QLineEdit(str(action.params.get("item_id", "")))
-            item_id_edit.setPlaceholderText("ID de l'objet (ex: sword)")
-            item_id_edit.textChanged.connect(lambda t, i=index: self._update_action_param(i, "item_id", t))
-
-            qty_spin = QSpinBox()
-            qty_spin.setRange(1, 999)
-            qty_spin.setValue(int(action.params.get("qty", 1)))
-            qty_spin.valueChanged.connect(lambda v, i=index: self._update_action_param(i, "qty", v))
-
-            layout.addRow("ID Objet:", item_id_edit)
-            layout.addRow("Quantité:", qty_spin)
-
-        elif action.type in [ActionType.NPC_SPAWN, ActionType.NPC_STATUS]:
-            npc_edit = QLineEdit(str(action.params.get("npc_id", "")))
-            npc_edit.setPlaceholderText("ID du PNJ (ex: Cyndra)")
-            npc_edit.textChanged.connect(lambda t, i=index: self._update_action_param(i, "npc_id", t))
-            layout.addRow("ID PNJ:", npc_edit)
-
-            if action.type == ActionType.NPC_STATUS:
-                status_combo = QComboBox()
-                status_combo.addItems(["fixed", "follow", "dead"])
-                status_combo.setCurrentText(str(action.params.get("status", "fixed")))
-                status_combo.currentTextChanged.connect(lambda t, i=index: self._update_action_param(i, "status", t))
-                layout.addRow("Statut:", status_combo)
-
-        parent_layout.addWidget(frame)
+        frame.item_edit = QLineEdit()
+        frame.item_edit.setPlaceholderText("ID de l'objet (ex: sword)")
+        frame.item_edit.textChanged.connect(lambda t, f=frame: self._update_action_param(f.action, "item_id", t))
+
+        frame.qty_spin = QSpinBox()
+        frame.qty_spin.setRange(1, 999)
+        frame.qty_spin.valueChanged.connect(lambda v, f=frame: self._update_action_param(f.action, "qty", v))
+
+        frame.npc_edit = QLineEdit()
+        frame.npc_edit.setPlaceholderText("ID du PNJ (ex: Cyndra)")
+        frame.npc_edit.textChanged.connect(lambda t, f=frame: self._update_action_param(f.action, "npc_id", t))
+
+        frame.status_combo = QComboBox()
+        frame.status_combo.addItems(["fixed", "follow", "dead"])
+        frame.status_combo.currentTextChanged.connect(
+            lambda t, f=frame: self._update_action_param(f.action, "status", t))
+
+        frame.location_edit = QLineEdit()
+        frame.location_edit.setPlaceholderText("Lieu (ex: taverne)")
+        frame.location_edit.textChanged.connect(
+            lambda t, f=frame: self._update_action_param(f.action, "location", t))
+
+        frame.file_edit = QLineEdit()
+        frame.file_edit.setPlaceholderText("Fichier dans assets (ex: sfx/porte.wav)")
+        frame.file_edit.textChanged.connect(lambda t, f=frame: self._update_action_param(f.action, "file", t))
+
+        layout.addRow("ID Objet:", frame.item_edit)
+        layout.addRow("Quantité:", frame.qty_spin)
+        layout.addRow("ID PNJ:", frame.npc_edit)
+        layout.addRow("Statut:", frame.status_combo)
+        layout.addRow("Lieu:", frame.location_edit)
+        layout.addRow("Son:", frame.file_edit)
+        return frame
+
+    def _bind_action(self, frame: QFrame, index: int, action: ActionModel):
+        loading, self._loading = self._loading, True
+        try:
+            frame.action = action
+            frame.title_label.setText(f"<b>Action #{index + 1}</b>")
+            frame.type_combo.setCurrentText(action.type.value)
+            params = action.params
+            frame.item_edit.setText(str(params.get("item_id", "")))
+            frame.qty_spin.setValue(int(params.get("qty", 1)))
+            frame.npc_edit.setText(str(params.get("npc_id", "")))
+            frame.status_combo.setCurrentText(str(params.get("status", "fixed")))
+            frame.location_edit.setText(str(params.get("location", "")))
+            frame.file_edit.setText(str(params.get("file", "")))
+        finally:
+            self._loading = loading
+        self._show_action_fields(frame, action.type)
+
+    @staticmethod
+    def _show_action_fields(frame: QFrame, action_type: ActionType):
+        item = action_type in (ActionType.ADD_ITEM, ActionType.REMOVE_ITEM)
+        npc = action_type in (ActionType.NPC_SPAWN, ActionType.NPC_STATUS, ActionType.NPC_MOVE)
+        visible = {
+            frame.item_edit: item,
+            frame.qty_spin: item,
+            frame.npc_edit: npc,
+            frame.status_combo: action_type == ActionType.NPC_STATUS,
+            frame.location_edit: action_type == ActionType.NPC_MOVE,
+            frame.file_edit: action_type == ActionType.PLAY_SOUND,
+        }
+        for widget, shown in visible.items():
+            frame.form.setRowVisible(widget, shown)
 
     # --- BLOC CHOIX INDIVIDUEL ---
-    def _add_choice_block(self, parent_layout, index, choice: ChoiceModel):
+    def _choice_block(self) -> QFrame:
         frame = QFrame()
         frame.setStyleSheet("background-color: #333337; border-radius: 4px; border: 1px solid #454545;")
         layout = QFormLayout(frame)
+        frame.choice = None
 
         # Header
         header_layout = QHBoxLayout()
-        lbl = QLabel(f"<b>Option #{index + 1}</b>")
+        frame.title_label = QLabel()
         del_btn = QPushButton("X")
         del_btn.setProperty("class", "del-btn")  # CORRECTION
         del_btn.setFixedSize(30, 25)
-        del_btn.clicked.connect(lambda _, i=index: self._delete_choice(i))
+        del_btn.clicked.connect(lambda _, f=frame: self._delete_choice(self._choice_blocks.index(f)))
 
-        header_layout.addWidget(lbl)
+        header_layout.addWidget(frame.title_label)
         header_layout.addStretch()
         header_layout.addWidget(del_btn)
         layout.addRow(header_layout)
 
         # Texte
-        txt_edit = QLineEdit(choice.text)
-        txt_edit.setPlaceholderText("Ce que voit le joueur...")
-        txt_edit.textChanged.connect(lambda t, i=index: setattr(self.current_node.content.choices[i], 'text', t))
-        layout.addRow("Texte:", txt_edit)
-
-        # Cible (Smart Combo)
-        target_combo = QComboBox()
-        target_combo.addItem("--- (Fin / Rien) ---", None)
-
-        if self.project_ref:
-            for nid, node in self.project_ref.nodes.items():
-                if nid != self.current_node.id:
-                    # Affichage: Titre + (ID court)
-                    label = f"{node.title} ({nid[:4]})"
-                    target_combo.addItem(label, nid)
-
-        # Sélectionner la valeur actuelle
-        idx = target_combo.findData(choice.target_node_id)
-        if idx >= 0: target_combo.setCurrentIndex(idx)
-
-        target_combo.currentIndexChanged.connect(
-            lambda _, c=target_combo, i=index: setattr(self.current_node.content.choices[i], 'target_node_id',
-                                                       c.currentData()))
-        layout.addRow("Vers:", target_combo)
-
-        parent_layout.addWidget(frame)
+        frame.text_edit = QLineEdit()
+        frame.text_edit.setPlaceholderText("Ce que voit le joueur...")
+        frame.text_edit.textChanged.connect(lambda t, f=frame: self._set(f.choice, 'text', t))
+        layout.addRow("Texte:", frame.text_edit)
+
+        # Cible (Smart Combo) : modèle partagé, recherche par titre
+        frame.target_combo = TargetComboBox(self.targets)
+        # activated : choix de l'utilisateur uniquement (pas les lignes insérées / retirées du modèle)
+        frame.target_combo.activated.connect(
+            lambda _, f=frame: self._set(f.choice, 'target_node_id', f.target_combo.currentData()))
+        layout.addRow("Vers:", frame.target_combo)
+        return frame
+
+    def _bind_choice(self, frame: QFrame, index: int, choice: ChoiceModel):
+        loading, self._loading = self._loading, True
+        try:
+            frame.choice = choice
+            frame.title_label.setText(f"<b>Option #{index + 1}</b>")
+            frame.text_edit.setText(choice.text)
+            frame.target_combo.set_target(choice.target_node_id)
+        finally:
+            self._loading = loading
+
+    # --- MISE À JOUR SUR PLACE DES LISTES DE BLOCS ---
+    def _insert_block(self, layout, blocks, frame):
+        """Ajoute un bloc à la fin de la liste (avant le bouton « Ajouter »)."""
+        layout.insertWidget(len(blocks), frame)
+        frame.show()
+        blocks.append(frame)
+
+    def _release_block(self, blocks, pool, layout, index):
+        """Retire un bloc de la liste affichée et le garde en réserve."""
+        frame = blocks.pop(index)
+        layout.removeWidget(frame)
+        frame.hide()
+        pool.append(frame)
+
+    def _remove_block(self, blocks, pool, layout, index, title):
+        """Retire un bloc et renumérote les suivants."""
+        self._release_block(blocks, pool, layout, index)
+        for i in range(index, len(blocks)):
+            blocks[i].title_label.setText(f"<b>{title} #{i + 1}</b>")
+
+    def _new_block(self, blocks, pool, layout, make, bind, model):
+        frame = pool.pop() if pool else make()
+        self._insert_block(layout, blocks, frame)
+        bind(frame, len(blocks) - 1, model)
 
     # --- LOGIQUE DE MISE À JOUR DU MODÈLE ---
 
     def _add_action(self):
-        self.current_node.content.actions.append(ActionModel())
-        self.load_node(self.current_node)  # Refresh complet pour afficher
+        actions = self.current_node.content.actions
+        actions.append(ActionModel())
+        self._notify_edit()
+        self._new_block(self._action_blocks, self._action_pool, self.action_layout,
+                        self._action_block, self._bind_action, actions[-1])
 
     def _delete_action(self, index):
         if 0 <= index < len(self.current_node.content.actions):
             self.current_node.content.actions.pop(index)
-            self.load_node(self.current_node)
+            self._notify_edit()
+            self._remove_block(self._action_blocks, self._action_pool, self.action_layout, index, "Action")
 
-    def _update_action_type(self, index, type_str):
+    def _update_action_type(self, frame: QFrame, type_str):
+        if self._loading or frame.action is None:
+            return
         for at in ActionType:
             if at.value == type_str:
-                self.current_node.content.actions[index].type = at
-                # On recharge pour afficher les bons champs de paramètres
-                self.load_node(self.current_node)
+                frame.action.type = at
+                self._notify_edit()
+                # Seuls les champs de paramètres affichés changent
+                self._show_action_fields(frame, at)
                 break
 
-    def _update_action_param(self, index, key, value):
-        self.current_node.content.actions[index].params[key] = value
+    def _update_action_param(self, action: ActionModel, key, value):
+        if self._loading or action is None:
+            return
+        action.params[key] = value
+        self._notify_edit()
 
     def _add_choice(self):
-        self.current_node.content.choices.append(ChoiceModel(text="Nouveau choix"))
-        self.load_node(self.current_node)
+        choices = self.current_node.content.choices
+        choices.append(ChoiceModel(text="Nouveau choix"))
+        self._notify_edit()
+        self._new_block(self._choice_blocks, self._choice_pool, self.choice_layout,
+                        self._choice_block, self._bind_choice, choices[-1])
 
     def _delete_choice(self, index):
         if 0 <= index < len(self.current_node.content.choices):
             self.current_node.content.choices.pop(index)
-            self.load_node(self.current_node)
+            self._notify_edit()
+            self._remove_block(self._choice_blocks, self._choice_pool, self.choice_layout, index, "Option")
 
     # --- UI LOGIQUE (SET VAR) ---
     def _build_logic_ui(self):
-        group = QGroupBox("Opération sur Variable")
-        layout = QFormLayout(group)
-
-        var_edit = QLineEdit(self.current_node.content.variable_name or "")
-        var_edit.setPlaceholderText("Nom variable (ex: gold)")
-        var_edit.textChanged.connect(lambda t: setattr(self.current_node.content, 'variable_name', t))
-        layout.addRow("Variable:", var_edit)
-
-        op_combo = QComboBox()
-        op_combo.addItems([e.value for e in VarOperation])
-        if self.current_node.content.operation:
-            op_combo.setCurrentText(self.current_node.content.operation)
-        op_combo.currentTextChanged.connect(lambda t: setattr(self.current_node.content, 'operation', t))
-        layout.addRow("Opération:", op_combo)
-
-        val_edit = QLineEdit(str(self.current_node.content.value))
-        val_edit.setPlaceholderText("Valeur (ex: 10)")
-        val_edit.textChanged.connect(lambda t: setattr(self.current_node.content, 'value', t))
-        layout.addRow("Valeur:", val_edit)
-
-        self.form_layout.addWidget(group)
\ No newline at end of file
+        self.logic_group = QGroupBox("Opération sur Variable")
+        layout = QFormLayout(self.logic_group)
+
+        self.var_edit = QLineEdit()
+        self.var_edit.setPlaceholderText("Nom variable (ex: gold)")
+        self.var_edit.textChanged.connect(lambda t: self._set(self.current_node.content, 'variable_name', t))
+        layout.addRow("Variable:", self.var_edit)
+
+        self.op_combo = QComboBox()
+        self.op_combo.addItems([e.value for e in VarOperation])
+        self.op_combo.currentTextChanged.connect(lambda t: self._set(self.current_node.content, 'operation', t))
+        layout.addRow("Opération:", self.op_combo)
+
+        self.val_edit = QLineEdit()
+        self.val_edit.setPlaceholderText("Valeur (ex: 10)")
+        self.val_edit.textChanged.connect(lambda t: self._set(self.current_node.content, 'value', t))
+        layout.addRow("Valeur:", self.val_edit)
+
+        self.form_layout.addWidget(self.logic_group)
+
+    def _bind_logic(self, node: NodeModel):
+        content = node.content
+        self.var_edit.setText(content.variable_name or "")
+        if content.operation:
+            self.op_combo.setCurrentText(content.operation)
+        else:
+            self.op_combo.setCurrentIndex(0)
+        self.val_edit.setText(str(content.value))
@@ -0,0 +1,128 @@
+from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QComboBox, QLineEdit,
+                               QPushButton, QListWidget, QListWidgetItem, QLabel, QInputDialog)
+from PySide6.QtCore import Qt, Signal
+from src.editor.project_index import ProjectIndex, KIND_READ, KIND_WRITE, KIND_ITEM, KIND_NPC
+
+# (libellé, table de l'index) ; None = recherche d'un nœud par titre
+SEARCH_KINDS = [
+    ("Nœud (titre)", None),
+    ("Variable", KIND_READ),
+    ("Objet", KIND_ITEM),
+    ("PNJ", KIND_NPC),
+]
+
+
+class ReferencesPanel(QWidget):
+    """
+    Recherche des références (liens entrants d'un nœud, usages d'une variable,
+    d'un objet ou d'un PNJ) et renommage, via le ProjectIndex de l'éditeur.
+    """
+    nodeActivated = Signal(str)  # UUID du nœud à afficher
+    nodesRenamed = Signal(object)  # UUIDs des nœuds modifiés par un renommage
+
+    def __init__(self, index: ProjectIndex, parent=None):
+        super().__init__(parent)
+        self.index = index
+
+        layout = QVBoxLayout(self)
+        row = QHBoxLayout()
+        self.kind_combo = QComboBox()
+        for label, _table in SEARCH_KINDS:
+            self.kind_combo.addItem(label)
+        self.query_edit = QLineEdit()
+        self.query_edit.setPlaceholderText("Titre, variable, objet ou PNJ...")
+        self.query_edit.returnPressed.connect(self.search)
+        row.addWidget(self.kind_combo)
+        row.addWidget(self.query_edit)
+        layout.addLayout(row)
+
+        buttons = QHBoxLayout()
+        search_btn = QPushButton("Références")
+        search_btn.clicked.connect(self.search)
+        rename_btn = QPushButton("Renommer...")
+        rename_btn.clicked.connect(self.rename)
+        buttons.addWidget(search_btn)
+        buttons.addWidget(rename_btn)
+        layout.addLayout(buttons)
+
+        self.summary_label = QLabel("")
+        layout.addWidget(self.summary_label)
+        self.results = QListWidget()
+        self.results.itemDoubleClicked.connect(lambda item: self.nodeActivated.emit(item.data(Qt.UserRole)))
+        layout.addWidget(self.results)
+
+    def _title(self, node_id: str) -> str:
+        node = self.index.project.nodes.get(node_id)
+        return node.title if node is not None else node_id[:8]
+
+    def _add_result(self, text: str, node_id: str):
+        item = QListWidgetItem(text)
+        item.setData(Qt.UserRole, node_id)
+        self.results.addItem(item)
+
+    def search(self):
+        query = self.query_edit.text().strip()
+        table = SEARCH_KINDS[self.kind_combo.currentIndex()][1]
+        self.results.clear()
+        if not query:
+            self.summary_label.setText("")
+            return
+
+        if table is None:
+            # Titre exact, sinon les titres qui commencent par la saisie
+            targets = self.index.find_by_title(query) or self.index.search_titles(query)
+            count = 0
+            for target_id in targets:
+                self._add_result(f"■ {self._title(target_id)}", target_id)
+                for source_id, where in sorted(self.index.backlinks(target_id)):
+                    self._add_result(f"    ← {self._title(source_id)} ({where})", source_id)
+                    count += 1
+            self.summary_label.setText(f"{len(targets)} nœud(s), {count} lien(s) entrant(s)")
+            return
+
+        groups = [("lecture", KIND_READ), ("écriture", KIND_WRITE)] if table == KIND_READ else [("", table)]
+        count = 0
+        for label, kind in groups:
+            for node_id, where in sorted(self.index.references(kind, query)):
+                prefix = f"[{label}] " if label else ""
+                self._add_result(f"{prefix}{self._title(node_id)} ({where})", node_id)
+                count += 1
+        self.summary_label.setText(f"{count} référence(s)")
+
+    def rename(self):
+        old = self.query_edit.text().strip()
+        table = SEARCH_KINDS[self.kind_combo.currentIndex()][1]
+        if not old:
+            return
+        if table is None:
+            targets = self.index.find_by_title(old)
+            if len(targets) != 1:
+                self.summary_label.setText("Renommage : le titre doit désigner un seul nœud")
+                return
+        new, ok = QInputDialog.getText(self, "Renommer", f"Nouveau nom pour « {old} » :", text=old)
+        new = new.strip()
+        if not ok or not new or new == old:
+            return
+        if table == KIND_READ:
+            # Vérifié avant tout changement : un mot-clé ou un nom existant casserait les conditions
+            error = self.index.variable_name_error(new)
+            if error:
+                self.summary_label.setText(f"Renommage refusé : {error}")
+                return
+
+        if table is None:
+            changed, skipped = self.index.rename_title(targets[0], new)
+        elif table == KIND_READ:
+            changed, skipped = self.index.rename_variable(old, new)
+        elif table == KIND_ITEM:
+            changed, skipped = self.index.rename_item(old, new)
+        else:
+            changed, skipped = self.index.rename_npc(old, new)
+
+        self.query_edit.setText(new)
+        self.nodesRenamed.emit(changed)
+        self.search()
+        if skipped:
+            # Expressions que le renommage n'a pas su réécrire : à corriger à la main
+            names = ", ".join(sorted(self._title(node_id) for node_id in skipped))
+            self.summary_label.setText(f"{self.summary_label.text()} — non réécrit(s) : {names}")
@@ -0,0 +1,122 @@
+from typing import Dict, Iterable, Optional
+
+from PySide6.QtWidgets import QComboBox, QCompleter, QListView
+from PySide6.QtGui import QStandardItem, QStandardItemModel
+from PySide6.QtCore import Qt
+from src.common.models import NodeModel
+
+NO_TARGET_LABEL = "--- (Fin / Rien) ---"
+
+
+class NodeTargetModel(QStandardItemModel):
+    """
+    Liste des cibles possibles d'un choix : « Fin / Rien » puis un nœud par ligne.
+
+    Un seul modèle partagé par toutes les listes déroulantes du panneau, tenu à jour
+    nœud par nœud (node_added / node_removed / node_changed) au lieu d'être recopié
+    dans chaque liste. Les lignes sont des QStandardItem (stockage C++) : Qt parcourt
+    toutes les lignes à chaque polissage d'une liste (feuille de style), un modèle
+    Python (rowCount / data surchargés) rendrait ce parcours proportionnel au projet.
+    Le nœud en cours d'édition reste listé mais n'est pas sélectionnable.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._items: Dict[str, QStandardItem] = {}  # UUID -> ligne
+        self._nodes: Dict[str, NodeModel] = {}
+        self._excluded: Optional[QStandardItem] = None
+        self.appendRow(QStandardItem(NO_TARGET_LABEL))
+
+    def row_of(self, node_id: Optional[str]) -> int:
+        """Ligne d'un nœud (0 pour « pas de cible » ou un nœud inconnu)."""
+        item = self._items.get(node_id) if node_id else None
+        return item.row() if item is not None else 0
+
+    # --- Mise à jour incrémentale ---
+    def reset(self, nodes: Iterable[NodeModel]):
+        self.removeRows(1, self.rowCount() - 1)
+        self._items = {}
+        self._nodes = {}
+        self._excluded = None
+        items = [self._make_item(node) for node in nodes]
+        if items:
+            self.invisibleRootItem().appendRows(items)
+
+    def node_added(self, node: NodeModel):
+        if node.id not in self._items:
+            self.appendRow(self._make_item(node))
+
+    def node_removed(self, node_id: str):
+        item = self._items.pop(node_id, None)
+        if item is not None:
+            del self._nodes[node_id]
+            if item is self._excluded:
+                self._excluded = None
+            self.removeRow(item.row())
+
+    def node_changed(self, node_id: str):
+        """Titre modifié : seule la ligne du nœud est réaffichée."""
+        item = self._items.get(node_id)
+        if item is not None:
+            item.setText(self._label(self._nodes[node_id]))
+
+    def set_excluded(self, node_id: Optional[str]):
+        if self._excluded is not None:
+            self._excluded.setEnabled(True)
+        self._excluded = self._items.get(node_id) if node_id else None
+        if self._excluded is not None:
+            self._excluded.setEnabled(False)
+
+    def _make_item(self, node: NodeModel) -> QStandardItem:
+        item = QStandardItem(self._label(node))
+        item.setData(node.id, Qt.UserRole)
+        self._items[node.id] = item
+        self._nodes[node.id] = node
+        return item
+
+    @staticmethod
+    def _label(node: NodeModel) -> str:
+        # Affichage: Titre + (ID court)
+        return f"{node.title} ({node.id[:4]})"
+
+
+class TargetComboBox(QComboBox):
+    """
+    Liste déroulante sur le NodeTargetModel partagé, avec recherche : taper une partie
+    du titre propose les nœuds correspondants. Aucune copie des lignes n'est faite
+    (ni à la création, ni au calcul de la taille), son coût ne dépend pas du projet.
+
+    Le completer n'est branché que lorsque la liste a le focus : QComboBox lui transmet
+    le texte de chaque nouvelle sélection, ce qui parcourt le modèle jusqu'à la ligne.
+    """
+
+    def __init__(self, model: NodeTargetModel, parent=None):
+        super().__init__(parent)
+        self.setSizeAdjustPolicy(QComboBox.AdjustToMinimumContentsLengthWithIcon)
+        self.setMinimumContentsLength(20)
+        self.setModel(model)
+        # Lignes de même hauteur, disposées par lots : la liste n'est pas parcourue d'un coup
+        # à chaque polissage (feuille de style du panneau)
+        self.view().setUniformItemSizes(True)
+        self.view().setLayoutMode(QListView.Batched)
+
+        self.setEditable(True)
+        self.setInsertPolicy(QComboBox.NoInsert)
+        self.setCompleter(None)
+        self._completer = QCompleter(model, self)
+        self._completer.setFilterMode(Qt.MatchContains)
+        self._completer.setCaseSensitivity(Qt.CaseInsensitive)
+        self._completer.setCompletionMode(QCompleter.PopupCompletion)
+
+    def set_target(self, node_id: Optional[str]):
+        self.setCurrentIndex(self.model().row_of(node_id))
+
+    def focusInEvent(self, event):
+        if self.completer() is None:
+            self.setCompleter(self._completer)
+        super().focusInEvent(event)
+
+    def focusOutEvent(self, event):
+        super().focusOutEvent(event)
+        if not self._completer.popup().isVisible():
+            self.setCompleter(None)
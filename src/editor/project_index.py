@@ -0,0 +1,350 @@
+"""
+Index du projet pour l'éditeur : qui pointe vers un nœud, quel nœud porte un titre,
+où une variable est lue / écrite, où un objet ou un PNJ est cité.
+
+ProjectIndex est construit une fois au chargement puis tenu à jour nœud par nœud
+(node_added / node_changed / node_removed) : chaque nœud mémorise ce qu'il a apporté
+aux tables, une mise à jour retire ces entrées et ajoute les nouvelles. Une requête
+est une simple lecture de dictionnaire, quelle que soit la taille du projet.
+
+Une référence est un couple (UUID du nœud, emplacement) :
+  "choice:N"  condition ou cible du choix N
+  "next"      suite directe (outputs d'un nœud SET_VAR)
+  "set"       variable écrite par un nœud SET_VAR
+  "value"     expression de la valeur d'un nœud SET_VAR
+  "action:N"  paramètre de l'action N
+
+Table KIND_VISIT : nœuds cités par visited("UUID" ou "Titre") dans les conditions,
+tenue à jour pour qu'un renommage de titre réécrive aussi ces références.
+"""
+import ast
+import bisect
+import keyword
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple
+
+from src.common.constants import ActionType, NodeType
+from src.common.models import NodeModel, ProjectModel
+from src.engine.scripting import ScriptEngine
+
+# Noms connus du ScriptEngine (fonctions, visited() ajoutée par le FlowManager, constantes) :
+# ce ne sont pas des variables du projet
+SCRIPT_NAMES = frozenset(ScriptEngine().functions) | {"visited", "True", "False", "None"}
+
+ITEM_ACTIONS = (ActionType.ADD_ITEM, ActionType.REMOVE_ITEM)
+NPC_ACTIONS = (ActionType.NPC_SPAWN, ActionType.NPC_MOVE, ActionType.NPC_STATUS)
+
+# Tables de l'index (voir ProjectIndex.references)
+KIND_NODE = "node"
+KIND_READ = "read"
+KIND_WRITE = "write"
+KIND_ITEM = "item"
+KIND_NPC = "npc"
+KIND_VISIT = "visit"
+
+Ref = Tuple[str, str]
+
+
+def _parse(source: str) -> Optional[ast.AST]:
+    try:
+        return ast.parse(source, mode="eval")
+    except SyntaxError:
+        return None
+
+
+def _visited_args(tree: ast.AST):
+    """Arguments chaînes des appels visited("...")."""
+    for node in ast.walk(tree):
+        if (isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id == "visited"
+                and node.args and isinstance(node.args[0], ast.Constant) and isinstance(node.args[0].value, str)):
+            yield node.args[0]
+
+
+@lru_cache(maxsize=4096)
+def expression_names(source: str) -> FrozenSet[str]:
+    """Variables lues par une condition ou une expression (vide si la source est invalide)."""
+    tree = _parse(str(source).strip())
+    if tree is None:
+        return frozenset()
+    return frozenset(node.id for node in ast.walk(tree)
+                     if isinstance(node, ast.Name) and node.id not in SCRIPT_NAMES)
+
+
+@lru_cache(maxsize=4096)
+def visited_refs(source: str) -> FrozenSet[str]:
+    """Nœuds (UUID ou titre) cités par visited() dans une condition ou une expression."""
+    tree = _parse(str(source).strip())
+    if tree is None:
+        return frozenset()
+    return frozenset(arg.value for arg in _visited_args(tree))
+
+
+def _rewrite(source: str, replacements) -> str:
+    """
+    Remplace dans source les nœuds ast donnés par replacements(arbre, source lue) -> [(nœud, texte)].
+    Les espaces de tête sont retirés avant le parsing (ast les refuse) et les positions
+    décalées d'autant. Expressions sur une ligne : les positions d'ast sont des décalages
+    en octets UTF-8 de la ligne 1.
+    """
+    stripped = source.lstrip()
+    tree = _parse(stripped)
+    if tree is None:
+        return source
+    shift = len(source.encode("utf-8")) - len(stripped.encode("utf-8"))
+    spans = sorted(((node.col_offset + shift, node.end_col_offset + shift, text)
+                    for node, text in replacements(tree, stripped)
+                    if node.lineno == 1 and node.end_lineno == 1), reverse=True)
+    if not spans:
+        return source
+    data = source.encode("utf-8")
+    for start, end, text in spans:
+        data = data[:start] + text.encode("utf-8") + data[end:]
+    return data.decode("utf-8")
+
+
+def rename_in_expression(source: str, old: str, new: str) -> str:
+    """Renomme une variable dans une expression (noms uniquement, pas les chaînes ni les attributs)."""
+    return _rewrite(source, lambda tree, _text: [(node, new) for node in ast.walk(tree)
+                                                 if isinstance(node, ast.Name) and node.id == old])
+
+
+def rename_visited_ref(source: str, old: str, new: str) -> str:
+    """Réécrit visited("old") en visited("new"), avec le même guillemet."""
+    def replacements(tree, text):
+        for arg in _visited_args(tree):
+            if arg.value == old:
+                quote = "'" if ast.get_source_segment(text, arg).startswith("'") else '"'
+                yield arg, quote + new.replace("\\", "\\\\").replace(quote, "\\" + quote) + quote
+    return _rewrite(source, replacements)
+
+
+def _output_target(output: Any) -> Optional[str]:
+    if isinstance(output, dict):
+        return output.get("target_node_id")
+    return getattr(output, "target_node_id", None)
+
+
+def node_entries(node: NodeModel) -> List[Tuple[str, str, str]]:
+    """Entrées apportées par un nœud : (table, clé, emplacement)."""
+    entries = []
+    content = node.content
+    if node.type == NodeType.SET_VAR:
+        if content.variable_name:
+            entries.append((KIND_WRITE, content.variable_name, "set"))
+        for name in expression_names(content.value):
+            entries.append((KIND_READ, name, "value"))
+        for ref in visited_refs(content.value):
+            entries.append((KIND_VISIT, ref, "value"))
+        for output in node.outputs[:1]:
+            target = _output_target(output)
+            if target:
+                entries.append((KIND_NODE, target, "next"))
+    for slot, choice in enumerate(content.choices):
+        where = f"choice:{slot}"
+        if choice.target_node_id:
+            entries.append((KIND_NODE, choice.target_node_id, where))
+        for name in expression_names(choice.condition):
+            entries.append((KIND_READ, name, where))
+        for ref in visited_refs(choice.condition):
+            entries.append((KIND_VISIT, ref, where))
+    for slot, action in enumerate(content.actions):
+        if action.type in ITEM_ACTIONS and action.params.get("item_id"):
+            entries.append((KIND_ITEM, str(action.params["item_id"]), f"action:{slot}"))
+        elif action.type in NPC_ACTIONS and action.params.get("npc_id"):
+            entries.append((KIND_NPC, str(action.params["npc_id"]), f"action:{slot}"))
+    return entries
+
+
+class ProjectIndex:
+    """
+    tables[table][clé] -> {(UUID, emplacement)} ; table KIND_NODE = liens entrants (backlinks).
+    Titres : recherche exacte (insensible à la casse) et par préfixe (liste triée).
+    """
+
+    def __init__(self, project: Optional[ProjectModel] = None):
+        self.project: ProjectModel = None
+        self.tables: Dict[str, Dict[str, Set[Ref]]] = {}
+        self._entries: Dict[str, List[Tuple[str, str, str]]] = {}  # UUID -> entrées apportées
+        self._titles: Dict[str, str] = {}  # UUID -> titre indexé (minuscules)
+        self._by_title: Dict[str, Set[str]] = {}  # titre (minuscules) -> UUIDs
+        self._sorted_titles: List[Tuple[str, str]] = []  # (titre minuscules, UUID), trié
+        self.rebuild(project if project is not None else ProjectModel())
+
+    # --- Construction / mise à jour ---
+    def rebuild(self, project: ProjectModel):
+        self.project = project
+        self.tables = {kind: {} for kind in (KIND_NODE, KIND_READ, KIND_WRITE, KIND_ITEM, KIND_NPC, KIND_VISIT)}
+        self._entries = {}
+        self._titles = {}
+        self._by_title = {}
+        for node in project.nodes.values():
+            self._add_entries(node)
+            title = node.title.lower()
+            self._titles[node.id] = title
+            self._by_title.setdefault(title, set()).add(node.id)
+        self._sorted_titles = sorted((title, node_id) for node_id, title in self._titles.items())
+
+    def node_added(self, node: NodeModel):
+        if node.id in self._entries:
+            self.node_changed(node.id)
+            return
+        self._add_entries(node)
+        self._add_title(node.id, node.title.lower())
+
+    def node_removed(self, node_id: str):
+        if node_id not in self._entries:
+            return
+        self._remove_entries(node_id)
+        self._remove_title(node_id)
+
+    def node_changed(self, node_id: str):
+        """Le modèle du nœud a changé : ses entrées sont recalculées (coût proportionnel au nœud)."""
+        node = self.project.nodes.get(node_id)
+        if node is None or node_id not in self._entries:
+            return
+        entries = node_entries(node)
+        if entries != self._entries[node_id]:
+            self._remove_entries(node_id)
+            self._add_entries(node, entries)
+        title = node.title.lower()
+        if title != self._titles.get(node_id):
+            self._remove_title(node_id)
+            self._add_title(node_id, title)
+
+    def _add_entries(self, node: NodeModel, entries: Optional[List[Tuple[str, str, str]]] = None):
+        if entries is None:
+            entries = node_entries(node)
+        self._entries[node.id] = entries
+        for kind, key, where in entries:
+            self.tables[kind].setdefault(key, set()).add((node.id, where))
+
+    def _remove_entries(self, node_id: str):
+        for kind, key, where in self._entries.pop(node_id, ()):
+            refs = self.tables[kind].get(key)
+            if refs is not None:
+                refs.discard((node_id, where))
+                if not refs:
+                    del self.tables[kind][key]
+
+    def _add_title(self, node_id: str, title: str):
+        self._titles[node_id] = title
+        self._by_title.setdefault(title, set()).add(node_id)
+        bisect.insort(self._sorted_titles, (title, node_id))
+
+    def _remove_title(self, node_id: str):
+        title = self._titles.pop(node_id, None)
+        if title is None:
+            return
+        ids = self._by_title[title]
+        ids.discard(node_id)
+        if not ids:
+            del self._by_title[title]
+        pos = bisect.bisect_left(self._sorted_titles, (title, node_id))
+        if pos < len(self._sorted_titles) and self._sorted_titles[pos] == (title, node_id):
+            del self._sorted_titles[pos]
+
+    # --- Requêtes ---
+    def references(self, kind: str, key: str) -> List[Ref]:
+        """Références d'une clé dans une table (KIND_NODE, KIND_READ, ...), sans ordre particulier."""
+        return list(self.tables[kind].get(key, ()))
+
+    def backlinks(self, node_id: str) -> List[Ref]:
+        """Nœuds qui mènent à node_id : (UUID source, emplacement)."""
+        return self.references(KIND_NODE, node_id)
+
+    def variable_usage(self, name: str) -> Dict[str, List[Ref]]:
+        return {"read": self.references(KIND_READ, name), "write": self.references(KIND_WRITE, name)}
+
+    def find_by_title(self, title: str) -> List[str]:
+        """UUIDs des nœuds portant exactement ce titre (casse ignorée)."""
+        return sorted(self._by_title.get(title.lower(), ()))
+
+    def search_titles(self, prefix: str, limit: int = 50) -> List[str]:
+        """UUIDs des nœuds dont le titre commence par prefix (casse ignorée), par ordre alphabétique."""
+        prefix = prefix.lower()
+        pos = bisect.bisect_left(self._sorted_titles, (prefix, ""))
+        found = []
+        for title, node_id in self._sorted_titles[pos:pos + limit]:
+            if not title.startswith(prefix):
+                break
+            found.append(node_id)
+        return found
+
+    def keys(self, kind: str) -> List[str]:
+        """Clés connues d'une table (noms de variables, d'objets, de PNJ)."""
+        return sorted(self.tables[kind])
+
+    # --- Renommage ---
+    # Chaque renommage retourne (nœuds modifiés, nœuds ignorés) : une expression que le
+    # renommage ne sait pas réécrire (sur plusieurs lignes par exemple) est signalée.
+    def variable_name_error(self, new: str) -> Optional[str]:
+        """Raison pour laquelle new ne peut pas devenir un nom de variable (None s'il est valide)."""
+        if not new.isidentifier() or keyword.iskeyword(new):
+            return f"« {new} » n'est pas un nom de variable valide"
+        if new in SCRIPT_NAMES:
+            return f"« {new} » est une fonction ou une constante des scripts"
+        if new in self.project.variables or new in self.tables[KIND_READ] or new in self.tables[KIND_WRITE]:
+            return f"La variable « {new} » existe déjà"
+        return None
+
+    def rename_variable(self, old: str, new: str) -> Tuple[Set[str], Set[str]]:
+        """Renomme une variable partout où elle est lue ou écrite (ValueError si new est refusé)."""
+        error = self.variable_name_error(new)
+        if error:
+            raise ValueError(error)
+        changed, skipped = set(), set()
+        for node_id, where in self.references(KIND_READ, old) + self.references(KIND_WRITE, old):
+            if where == "set":
+                self.project.nodes[node_id].content.variable_name = new
+                changed.add(node_id)
+            else:
+                self._rewrite_ref(node_id, where, rename_in_expression, expression_names, old, new, changed, skipped)
+        if old in self.project.variables:
+            self.project.variables[new] = self.project.variables.pop(old)
+        for node_id in changed:
+            self.node_changed(node_id)
+        return changed, skipped
+
+    def rename_title(self, node_id: str, new: str) -> Tuple[Set[str], Set[str]]:
+        """Renomme un nœud et réécrit les visited("Ancien titre") qui le désignent (titre exact, comme le moteur)."""
+        node = self.project.nodes[node_id]
+        old, node.title = node.title, new
+        changed, skipped = {node_id}, set()
+        for source_id, where in self.references(KIND_VISIT, old):
+            self._rewrite_ref(source_id, where, rename_visited_ref, visited_refs, old, new, changed, skipped)
+        for changed_id in changed:
+            self.node_changed(changed_id)
+        return changed, skipped
+
+    def _rewrite_ref(self, node_id: str, where: str, rewrite, keys, old: str, new: str,
+                     changed: Set[str], skipped: Set[str]):
+        """
+        Réécrit l'expression à l'emplacement where ("value" ou "choice:N").
+        Le nœud est ignoré (skipped) si keys(expression) cite encore old après réécriture.
+        """
+        content = self.project.nodes[node_id].content
+        target = content if where == "value" else content.choices[int(where.split(":")[1])]
+        field = "value" if where == "value" else "condition"
+        source = getattr(target, field)
+        result = rewrite(source, old, new)
+        if result != source:
+            setattr(target, field, result)
+            changed.add(node_id)
+        if old in keys(result):
+            skipped.add(node_id)
+
+    def rename_item(self, old: str, new: str) -> Tuple[Set[str], Set[str]]:
+        return self._rename_param(KIND_ITEM, "item_id", old, new)
+
+    def rename_npc(self, old: str, new: str) -> Tuple[Set[str], Set[str]]:
+        return self._rename_param(KIND_NPC, "npc_id", old, new)
+
+    def _rename_param(self, kind: str, param: str, old: str, new: str) -> Tuple[Set[str], Set[str]]:
+        changed = set()
+        for node_id, where in self.references(kind, old):
+            action = self.project.nodes[node_id].content.actions[int(where.split(":")[1])]
+            action.params[param] = new
+            changed.add(node_id)
+        for node_id in changed:
+            self.node_changed(node_id)
+        return changed, set()
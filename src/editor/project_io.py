@@ -0,0 +1,245 @@
+"""
+Sauvegarde du projet depuis l'éditeur : en arrière-plan, atomique, incrémentale.
+
+Le thread de l'UI ne fait que la capture : les nœuds modifiés depuis la dernière
+sauvegarde (mark_dirty) sont sérialisés, les autres réutilisent leur JSON en cache.
+L'assemblage du fichier, l'écriture et le fsync sont faits par un thread de fond ;
+une capture plus récente remplace celle qui attend encore (comme l'autosave du moteur).
+
+Disposition monolithique : le fichier est identique à model_dump_json(indent=2)
+(nœuds dans l'ordre du projet). Disposition découpée (split=True, voir
+src.common.loaders) : seuls les fichiers de nœuds contenant un nœud modifié sont
+réécrits, puis le manifeste les valide.
+"""
+import json
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from src.common.loaders import SPLIT_FORMAT, SPLIT_VERSION, chunk_dir, chunk_of, is_split, write_atomic
+from src.common.models import ProjectModel
+
+
+def _json_object(members: Iterable[Tuple[str, str]], level: int) -> str:
+    """Objet JSON indenté de 2 comme pydantic, à la profondeur level, à partir de valeurs déjà sérialisées (indent=2)."""
+    pad = "  " * (level + 1)
+    body = ",\n".join(pad + json.dumps(key, ensure_ascii=False) + ": " + blob.replace("\n", "\n" + pad)
+                       for key, blob in members)
+    return "{\n" + body + "\n" + "  " * level + "}" if body else "{}"
+
+
+def _manifest_generation(path: Path) -> int:
+    """Génération du manifeste découpé déjà présent à cet emplacement (0 sinon)."""
+    try:
+        data = json.loads(path.read_bytes())
+    except (OSError, ValueError):
+        return 0
+    return int(data.get("generation", 0)) if is_split(data) else 0
+
+
+class _SaveJob:
+    """Capture d'une sauvegarde : tout ce dont le thread de fond a besoin, déjà sérialisé."""
+    __slots__ = ("path", "header", "nodes", "order", "chunks", "generation", "full", "done")
+
+    def __init__(self, path: Path, header: str, nodes: Optional[Dict[str, str]], order: Optional[List[str]] = None,
+                 chunks: Optional[Dict[str, Dict[str, str]]] = None, generation: int = 0, full: bool = False):
+        self.path = path
+        self.header = header  # ProjectModel sans les nœuds (JSON, indent=2)
+        self.nodes = nodes  # Monolithique : UUID -> JSON de tous les nœuds
+        self.order = order  # Monolithique : UUIDs dans l'ordre du projet
+        self.chunks = chunks  # Découpé : fichier -> {UUID: JSON} des seuls fichiers à réécrire
+        self.generation = generation
+        self.full = full  # Découpé : premier manifeste de la session (tous les fichiers)
+        self.done: List[Callable[[], None]] = []  # Appelés une fois cette capture écrite
+
+
+class ProjectSaver:
+    """
+    on_saved : callbacks(chemin, erreur ou None), appelés depuis le thread de fond.
+    """
+
+    def __init__(self, project: ProjectModel):
+        self.project = project
+        self.on_saved: List[Callable[[str, Optional[str]], None]] = []
+
+        self._blobs: Dict[str, str] = {}  # UUID -> JSON du nœud (indent=2) à sa dernière capture
+        self._members: Dict[str, Set[str]] = {}  # Fichier de nœuds -> UUIDs
+        self._dirty: Set[str] = set(project.nodes)
+        # Disposition découpée : fichiers à réécrire pour split_path, génération courante
+        self.split_path: Optional[Path] = None
+        self._dirty_chunks: Set[str] = set()
+        self._chunk_files: Dict[str, str] = {}  # fichier -> nom avec génération (dernier manifeste)
+        self._generation = 0
+
+        self._pending: Dict[Path, _SaveJob] = {}  # Une capture en attente par fichier
+        self._split_failed = False  # Écriture découpée échouée : tout réécrire la prochaine fois
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._idle = threading.Event()
+        self._idle.set()
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+
+    # --- Suivi des modifications ---
+    def mark_dirty(self, node_id: str):
+        """Nœud ajouté, modifié, déplacé ou supprimé depuis la dernière sauvegarde."""
+        self._dirty.add(node_id)
+
+    @property
+    def dirty_count(self) -> int:
+        return len(self._dirty)
+
+    def _capture_nodes(self) -> Set[str]:
+        """Sérialise les nœuds modifiés ; retourne les fichiers de nœuds touchés."""
+        touched = set()
+        nodes = self.project.nodes
+        for node_id in self._dirty:
+            node = nodes.get(node_id)
+            chunk = chunk_of(node_id)
+            if node is not None:
+                self._blobs[node_id] = node.model_dump_json(indent=2)
+                self._members.setdefault(chunk, set()).add(node_id)
+            elif self._blobs.pop(node_id, None) is not None:
+                self._members[chunk].discard(node_id)
+            else:
+                continue
+            touched.add(chunk)
+        self._dirty.clear()
+        return touched
+
+    # --- Sauvegarde ---
+    def save(self, path, split: bool = False, on_written: Optional[Callable[[], None]] = None):
+        """
+        Capture le projet (coût proportionnel aux nœuds modifiés) et confie l'écriture au thread de fond.
+        on_written : appelé depuis le thread de fond une fois cette capture (ou une plus récente) écrite.
+        """
+        path = Path(path)
+        touched = self._capture_nodes()
+        header = self.project.model_dump_json(indent=2, exclude={"nodes"})
+
+        if split:
+            with self._lock:
+                full = path != self.split_path or self._split_failed
+                self._split_failed = False
+            if full:
+                # Nouveau manifeste : tous les fichiers de nœuds sont écrits, avec des noms
+                # que l'éventuel manifeste existant n'utilise pas
+                self.split_path = path
+                self._generation = max(self._generation, _manifest_generation(path))
+                self._dirty_chunks = set(self._members)
+            self._dirty_chunks |= touched
+            blobs = self._blobs
+            chunks = {chunk: {node_id: blobs[node_id] for node_id in self._members.get(chunk, ())}
+                      for chunk in self._dirty_chunks}
+            self._dirty_chunks = set()
+            self._generation += 1
+            job = _SaveJob(path, header, None, None, chunks, self._generation, full)
+        else:
+            if self.split_path is not None:
+                self._dirty_chunks |= touched
+            job = _SaveJob(path, header, dict(self._blobs), list(self.project.nodes))
+
+        if on_written is not None:
+            job.done.append(on_written)
+
+        with self._lock:
+            if self._closed:
+                return
+            previous = self._pending.get(path)
+            if previous is not None:
+                job.done[:0] = previous.done
+            if previous is not None and previous.chunks is not None and job.chunks is not None:
+                # Capture pas encore écrite : ses fichiers de nœuds restent à écrire
+                previous.chunks.update(job.chunks)
+                job.chunks = previous.chunks
+                job.full = job.full or previous.full
+            self._pending[path] = job
+            self._idle.clear()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._save_loop, name="project-save", daemon=True)
+                self._thread.start()
+        self._wakeup.set()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Attend que la sauvegarde en attente soit écrite."""
+        return self._idle.wait(timeout)
+
+    def close(self):
+        """Termine le thread de fond après avoir écrit la dernière capture."""
+        with self._lock:
+            self._closed = True
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    # --- Thread de fond ---
+    def _save_loop(self):
+        while True:
+            self._wakeup.wait()
+            self._wakeup.clear()
+            with self._lock:
+                jobs, self._pending = list(self._pending.values()), {}
+                closed = self._closed
+
+            for job in jobs:
+                error = None
+                try:
+                    if job.chunks is None:
+                        self._write_monolithic(job)
+                    else:
+                        self._write_split(job)
+                except OSError as e:
+                    error = str(e)
+                    if job.chunks is not None:
+                        with self._lock:
+                            self._split_failed = True
+                if error is None:
+                    for callback in job.done:
+                        callback()
+                for callback in self.on_saved:
+                    callback(str(job.path), error)
+
+            with self._lock:
+                if not self._pending:
+                    self._idle.set()
+            if closed:
+                return
+
+    @staticmethod
+    def _write_monolithic(job: _SaveJob):
+        # Les nœuds reprennent leur place parmi les champs de ProjectModel (avant le champ qui les suit)
+        fields = list(ProjectModel.model_fields)
+        following = fields[fields.index("nodes") + 1]
+        marker = f'\n  "{following}": '
+        head, tail = job.header.split(marker, 1)
+        nodes = _json_object(((node_id, job.nodes[node_id]) for node_id in job.order), 1)
+        data = f'{head}\n  "nodes": {nodes},{marker}{tail}'
+        write_atomic(job.path, data.encode("utf-8"))
+
+    def _write_split(self, job: _SaveJob):
+        folder = chunk_dir(job.path)
+        folder.mkdir(parents=True, exist_ok=True)
+        files = {} if job.full else dict(self._chunk_files)
+        for chunk, members in job.chunks.items():
+            if not members:
+                files.pop(chunk, None)
+                continue
+            name = f"{chunk}-{job.generation}.json"
+            write_atomic(folder / name, _json_object(sorted(members.items()), 0).encode("utf-8"))
+            files[chunk] = name
+
+        manifest = json.loads(job.header)
+        manifest.update({"format": SPLIT_FORMAT, "version": SPLIT_VERSION, "generation": job.generation,
+                         "chunks": dict(sorted(files.items()))})
+        write_atomic(job.path, json.dumps(manifest, ensure_ascii=False, indent=2).encode("utf-8"))
+        self._chunk_files = files
+
+        # Manifeste validé : les générations précédentes ne sont plus référencées
+        live = set(files.values())
+        for stale in folder.glob("*.json"):
+            if stale.name not in live:
+                try:
+                    stale.unlink()
+                except OSError:
+                    pass
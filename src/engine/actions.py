@@ -0,0 +1,173 @@
+"""
+Registre des actions exécutées à l'entrée des nœuds.
+
+Chaque type d'action déclare un parseur (params bruts -> charge utile typée, appelé une
+seule fois au chargement du projet) et un handler (flow, charge utile). Un nouveau type
+s'ajoute sans toucher à flow.py :
+
+    @register_action("Mon Action", parse_mon_action)
+    def _mon_action(flow, payload): ...
+"""
+from typing import Any, Callable, Dict, List, NamedTuple, Tuple
+
+from src.common.models import ActionModel
+from src.common.constants import ActionType
+
+
+class ActionError(ValueError):
+    """Paramètres d'action invalides (détectés au chargement du projet)."""
+
+
+class ActionSpec(NamedTuple):
+    parse: Callable[[Dict[str, Any]], Any]
+    execute: Callable[[Any, Any], None]
+
+
+class CompiledAction:
+    """Action prête à l'emploi : handler résolu + paramètres déjà validés."""
+    __slots__ = ("kind", "execute", "payload")
+
+    def __init__(self, kind: str, execute: Callable, payload: Any):
+        self.kind = kind
+        self.execute = execute
+        self.payload = payload
+
+
+# Clé : valeur de l'ActionType (ou nom libre pour un type ajouté par un module)
+_REGISTRY: Dict[str, ActionSpec] = {}
+
+
+def _kind(kind) -> str:
+    return getattr(kind, "value", kind)
+
+
+def register_action(kind: str, parse: Callable[[Dict[str, Any]], Any]):
+    """Décorateur : enregistre le handler du type `kind` (remplace un handler existant)."""
+    def decorator(execute: Callable[[Any, Any], None]):
+        _REGISTRY[_kind(kind)] = ActionSpec(parse, execute)
+        return execute
+    return decorator
+
+
+def compile_action(action: ActionModel) -> CompiledAction:
+    kind = _kind(action.type)
+    spec = _REGISTRY.get(kind)
+    if spec is None:
+        raise ActionError(f"Aucun handler pour l'action '{kind}'")
+    return CompiledAction(kind, spec.execute, spec.parse(action.params))
+
+
+def compile_node_actions(graph) -> Tuple[List[tuple], List[Tuple[int, str, str]]]:
+    """
+    Compile les actions de tous les nœuds du graphe.
+    Retourne (actions compilées par index de nœud, erreurs (index, type, message)) ;
+    une action invalide est signalée puis ignorée à l'exécution.
+    """
+    node_actions: List[tuple] = [()] * len(graph.nodes)
+    errors = []
+    for node in graph.nodes:
+        if not node.actions:
+            continue
+        compiled = []
+        for action in node.actions:
+            try:
+                compiled.append(compile_action(action))
+            except ActionError as e:
+                errors.append((node.index, _kind(action.type), str(e)))
+        node_actions[node.index] = tuple(compiled)
+    return node_actions, errors
+
+
+# --- Validation des paramètres ---
+def _required_str(params: Dict[str, Any], key: str) -> str:
+    value = params.get(key)
+    if value is None or not str(value).strip():
+        raise ActionError(f"Paramètre '{key}' manquant")
+    return str(value).strip()
+
+
+def _int_param(params: Dict[str, Any], key: str, default: int) -> int:
+    try:
+        return int(params.get(key, default))
+    except (TypeError, ValueError):
+        raise ActionError(f"Paramètre '{key}' non entier: {params.get(key)!r}")
+
+
+def _float_param(params: Dict[str, Any], key: str, default: float) -> float:
+    try:
+        return float(params.get(key, default))
+    except (TypeError, ValueError):
+        raise ActionError(f"Paramètre '{key}' non numérique: {params.get(key)!r}")
+
+
+# --- Charges utiles ---
+class ItemParams:
+    __slots__ = ("item_id", "qty")
+
+    def __init__(self, params: Dict[str, Any]):
+        self.item_id = _required_str(params, "item_id")
+        self.qty = _int_param(params, "qty", 1)
+
+
+class NpcParams:
+    __slots__ = ("npc_id",)
+
+    def __init__(self, params: Dict[str, Any]):
+        self.npc_id = _required_str(params, "npc_id")
+
+
+class NpcStatusParams:
+    __slots__ = ("npc_id", "status")
+
+    def __init__(self, params: Dict[str, Any]):
+        self.npc_id = _required_str(params, "npc_id")
+        self.status = str(params.get("status", "fixed"))
+
+
+class NpcMoveParams:
+    __slots__ = ("npc_id", "location")
+
+    def __init__(self, params: Dict[str, Any]):
+        self.npc_id = _required_str(params, "npc_id")
+        self.location = _required_str(params, "location")
+
+
+class SoundParams:
+    __slots__ = ("file", "volume")
+
+    def __init__(self, params: Dict[str, Any]):
+        self.file = _required_str(params, "file")
+        self.volume = min(max(_float_param(params, "volume", 1.0), 0.0), 1.0)
+
+
+# --- Handlers intégrés ---
+@register_action(ActionType.ADD_ITEM, ItemParams)
+def _add_item(flow, p: ItemParams):
+    flow.state.add_item(p.item_id, p.qty)
+
+
+@register_action(ActionType.REMOVE_ITEM, ItemParams)
+def _remove_item(flow, p: ItemParams):
+    flow.state.remove_item(p.item_id, p.qty)
+
+
+@register_action(ActionType.NPC_SPAWN, NpcParams)
+def _npc_spawn(flow, p: NpcParams):
+    flow.state.update_npc(p.npc_id, {"spawned": True, "location": flow.state.current_node_id})
+
+
+@register_action(ActionType.NPC_STATUS, NpcStatusParams)
+def _npc_status(flow, p: NpcStatusParams):
+    flow.state.update_npc(p.npc_id, {"status": p.status})
+
+
+@register_action(ActionType.NPC_MOVE, NpcMoveParams)
+def _npc_move(flow, p: NpcMoveParams):
+    flow.state.update_npc(p.npc_id, {"location": p.location})
+
+
+@register_action(ActionType.PLAY_SOUND, SoundParams)
+def _play_sound(flow, p: SoundParams):
+    # Le cœur est headless : l'hôte (GameEngine -> AudioManager) s'abonne à on_play_sound
+    for callback in flow.on_play_sound:
+        callback(p.file, p.volume)
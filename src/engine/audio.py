@@ -1,56 +1,255 @@
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional
+
 from PySide6.QtMultimedia import QMediaPlayer, QAudioOutput, QSoundEffect
-from PySide6.QtCore import QUrl
+from PySide6.QtCore import QUrl, QPropertyAnimation, QParallelAnimationGroup, QEasingCurve
 from src.common.paths import get_assets_path
+from src.engine.log import log
 import os
 
+# Extensions jouables par QSoundEffect (PCM non compressé)
+SFX_EXTENSIONS = (".wav",)
+# Coût supposé d'un son dont la taille n'est pas connue (pas de stat sur le thread de l'UI)
+DEFAULT_SFX_COST = 256 * 1024
+
+
+class _SfxEntry:
+    """Un son en cache : ses voix (QSoundEffect) et le coût mémoire d'une voix."""
+    __slots__ = ("voices", "cost", "next_voice")
+
+    def __init__(self, cost: int):
+        self.voices: List[QSoundEffect] = []
+        self.cost = cost
+        self.next_voice = 0
+
+    def is_playing(self) -> bool:
+        return any(voice.isPlaying() for voice in self.voices)
+
+    def release(self):
+        for voice in self.voices:
+            voice.stop()
+            voice.deleteLater()
+        self.voices = []
+
+
+class _MusicDeck:
+    """Lecteur de musique en streaming (deux decks pour le fondu enchaîné)."""
+
+    def __init__(self):
+        self.player = QMediaPlayer()
+        self.output = QAudioOutput()
+        self.output.setVolume(0.0)
+        self.player.setAudioOutput(self.output)
+        self.player.setLoops(QMediaPlayer.Infinite)
+        self.player.errorOccurred.connect(self._on_error)
+
+    def _on_error(self, error, message: str):
+        log.warning("Audio", "Musique illisible (%s): %s", self.player.source().toLocalFile(), message)
+
 
 class AudioManager:
     """
-    Gère la musique de fond (streaming) et les effets sonores (chargés en mémoire).
+    Gère la musique de fond (streaming, fondu enchaîné) et les effets sonores (chargés en mémoire).
+
+    Les sons sont gardés dans un cache LRU borné par memory_budget (octets, estimés d'après
+    la taille des fichiers) ; un son en cours de lecture n'est jamais évincé. Chaque son
+    dispose de voices_per_effect voix au plus : rejouer un son encore audible le superpose
+    au lieu de le redémarrer (au-delà, la voix la plus ancienne est réutilisée).
+    Compteurs : hits / misses (play_sfx), evictions.
     """
 
-    def __init__(self):
-        # Musique (BGM)
-        self.music_player = QMediaPlayer()
-        self.music_output = QAudioOutput()
-        self.music_player.setAudioOutput(self.music_output)
-        self.music_output.setVolume(0.5)  # 50% par défaut
+    def __init__(self, memory_budget: int = 32 * 1024 * 1024, voices_per_effect: int = 3,
+                 crossfade_ms: int = 1200):
+        self.memory_budget = memory_budget
+        self.memory_used = 0
+        self.voices_per_effect = voices_per_effect
+        self.crossfade_ms = crossfade_ms
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
 
+        # Musique (BGM)
+        self.music_volume = 0.5  # 50% par défaut
+        self._decks = (_MusicDeck(), _MusicDeck())
+        self._active = 0
+        self._fade: Optional[QParallelAnimationGroup] = None
         self.current_music_file = None
 
         # Sound Effects (SFX)
-        self.sfx_cache = {}  # Cache pour éviter de recharger
+        self.sfx_cache: "OrderedDict[str, _SfxEntry]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}  # Taille des fichiers relevée au préchargement
 
-    def play_music(self, filename: str):
-        """Joue une musique en boucle. Ne redémarre pas si c'est la même."""
-        if not filename:
-            self.music_player.stop()
+    # --- Musique ---
+    @property
+    def music_player(self) -> QMediaPlayer:
+        return self._decks[self._active].player
+
+    def play_music(self, filename: Optional[str], fade_ms: Optional[int] = None):
+        """Joue une musique en boucle, en fondu avec la précédente. Ne redémarre pas si c'est la même."""
+        if fade_ms is None:
+            fade_ms = self.crossfade_ms
+        if filename == self.current_music_file and (
+                not filename or self.music_player.playbackState() == QMediaPlayer.PlayingState):
             return
 
-        if filename == self.current_music_file and self.music_player.playbackState() == QMediaPlayer.PlayingState:
+        old = self._decks[self._active]
+        self.current_music_file = filename or None
+        if filename:
+            self._active = 1 - self._active
+            new = self._decks[self._active]
+            url = QUrl.fromLocalFile(str(get_assets_path() / filename))
+            if new.player.source() != url:  # Sinon déjà ouverte par preload_music
+                new.player.setSource(url)
+            new.player.play()
+        else:
+            new = None
+
+        self._crossfade(old, new, fade_ms)
+
+    def preload_music(self, filenames: Iterable[str]):
+        """
+        Ouvre à l'avance la musique la plus probable des nœuds suivants sur le deck libre
+        (QMediaPlayer lit l'en-tête du fichier en arrière-plan) : play_music n'a plus qu'à la lancer.
+        Le deck libre n'est pas touché pendant un fondu sortant.
+        """
+        filename = next((f for f in filenames if f and f != self.current_music_file), None)
+        idle = self._decks[1 - self._active]
+        if filename is None or idle.player.playbackState() != QMediaPlayer.StoppedState:
             return
+        url = QUrl.fromLocalFile(str(get_assets_path() / filename))
+        if idle.player.source() != url:
+            idle.player.setSource(url)
 
-        full_path = get_assets_path() / filename
-        if not os.path.exists(full_path):
-            print(f"[Audio] Fichier manquant: {full_path}")
+    def stop_music(self, fade_ms: Optional[int] = None):
+        self.play_music(None, fade_ms)
+
+    def set_music_volume(self, volume: float):
+        self.music_volume = min(max(volume, 0.0), 1.0)
+        if self._fade is None and self.current_music_file:
+            self._decks[self._active].output.setVolume(self.music_volume)
+
+    def _crossfade(self, old: _MusicDeck, new: Optional[_MusicDeck], fade_ms: int):
+        if self._fade is not None:
+            self._fade.stop()  # Fondu précédent interrompu : on repart des volumes actuels
+            self._fade = None
+
+        if fade_ms <= 0:
+            old.output.setVolume(0.0)
+            old.player.stop()
+            if new is not None:
+                new.output.setVolume(self.music_volume)
             return
 
-        self.current_music_file = filename
-        self.music_player.setSource(QUrl.fromLocalFile(str(full_path)))
-        self.music_player.setLoops(QMediaPlayer.Infinite)
-        self.music_player.play()
+        group = QParallelAnimationGroup()
+        for deck, target in ((old, 0.0), (new, self.music_volume)):
+            if deck is None:
+                continue
+            animation = QPropertyAnimation(deck.output, b"volume", group)
+            animation.setDuration(fade_ms)
+            animation.setStartValue(deck.output.volume())
+            animation.setEndValue(target)
+            animation.setEasingCurve(QEasingCurve.InOutSine)
+            group.addAnimation(animation)
+        group.finished.connect(lambda: self._on_fade_finished(group, old))
+        self._fade = group
+        group.start()
+
+    def _on_fade_finished(self, group: QParallelAnimationGroup, old: _MusicDeck):
+        if old is not self._decks[self._active]:
+            old.player.stop()
+        if self._fade is group:
+            self._fade = None
 
-    def play_sfx(self, filename: str):
-        """Joue un effet sonore (one-shot)."""
+    # --- Effets sonores ---
+    def preload_project(self, filenames: Iterable[str]):
+        """
+        Précharge les sons du projet (liste d'assets + actions PLAY_SOUND) tant que le budget
+        le permet. Appelé au chargement : c'est le seul moment où la taille des fichiers est lue.
+        """
+        for filename in dict.fromkeys(filenames):
+            if not filename or not filename.lower().endswith(SFX_EXTENSIONS):
+                continue
+            try:
+                self._sizes[filename] = os.path.getsize(get_assets_path() / filename)
+            except OSError:
+                log.warning("Audio", "Fichier manquant: %s", filename)
+                continue
+            if self.memory_used + self._sizes[filename] > self.memory_budget:
+                continue
+            self._entry(filename)
+
+    def preload_sfx(self, filenames: Iterable[str]):
+        """Charge à l'avance les sons des nœuds suivants (QSoundEffect décode hors du thread de l'UI)."""
+        for filename in filenames:
+            if filename:
+                self._entry(filename)
+
+    def play_sfx(self, filename: str, volume: float = 1.0):
+        """Joue un effet sonore (one-shot), superposé aux lectures en cours du même son."""
         if not filename:
             return
 
-        if filename not in self.sfx_cache:
-            full_path = get_assets_path() / filename
-            if not os.path.exists(full_path):
-                return
-            effect = QSoundEffect()
-            effect.setSource(QUrl.fromLocalFile(str(full_path)))
-            self.sfx_cache[filename] = effect
+        if filename in self.sfx_cache:
+            self.hits += 1
+        else:
+            self.misses += 1
+        entry = self._entry(filename)
+
+        voice = self._free_voice(filename, entry)
+        if voice is None:
+            return  # Fichier manquant ou illisible
+        voice.setVolume(volume)
+        voice.play()
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                "cached": len(self.sfx_cache), "memory_used": self.memory_used}
 
-        self.sfx_cache[filename].play()
\ No newline at end of file
+    def _entry(self, filename: str) -> _SfxEntry:
+        entry = self.sfx_cache.get(filename)
+        if entry is not None:
+            self.sfx_cache.move_to_end(filename)
+            return entry
+        entry = _SfxEntry(self._sizes.get(filename, DEFAULT_SFX_COST))
+        self.sfx_cache[filename] = entry
+        self._add_voice(filename, entry)
+        self._evict()
+        return entry
+
+    def _add_voice(self, filename: str, entry: _SfxEntry) -> QSoundEffect:
+        voice = QSoundEffect()
+        voice.setSource(QUrl.fromLocalFile(str(get_assets_path() / filename)))
+        entry.voices.append(voice)
+        self.memory_used += entry.cost
+        return voice
+
+    def _free_voice(self, filename: str, entry: _SfxEntry) -> Optional[QSoundEffect]:
+        if entry.voices[0].status() == QSoundEffect.Error:
+            return None
+        for voice in entry.voices:
+            if not voice.isPlaying():
+                return voice
+        if len(entry.voices) < self.voices_per_effect:
+            voice = self._add_voice(filename, entry)
+            self._evict()
+            return voice
+        # Toutes les voix sont occupées : la plus ancienne est réutilisée
+        voice = entry.voices[entry.next_voice]
+        entry.next_voice = (entry.next_voice + 1) % len(entry.voices)
+        voice.stop()
+        return voice
+
+    def _evict(self):
+        """Évince les sons les moins récemment utilisés (jamais un son en cours de lecture)."""
+        if self.memory_used <= self.memory_budget:
+            return
+        for filename in list(self.sfx_cache):
+            if self.memory_used <= self.memory_budget:
+                break
+            entry = self.sfx_cache[filename]
+            if filename == next(reversed(self.sfx_cache)) or entry.is_playing():
+                continue
+            del self.sfx_cache[filename]
+            self.memory_used -= entry.cost * len(entry.voices)
+            entry.release()
+            self.evictions += 1
@@ -0,0 +1,278 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+from array import array
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from src.common.models import (ProjectModel, ProjectMetadata, VariableDefinition, NodeModel,
+                               NodeContentModel, ChoiceModel, ActionModel)
+from src.common.constants import NodeType, ActionType, VariableType
+from src.common.loaders import load_project_data
+from src.engine.log import log
+from src.engine.runtime import RuntimeGraph, RuntimeNode, LogicOp, compile_project, NO_NODE
+
+# Cache binaire du graphe compilé, stocké à côté du story.json.
+#
+# Disposition (little-endian) :
+#   en-tête   : MAGIC, version, empreinte du story.json, nb de nœuds, table des sections
+#   sections  : header projet (JSON), ids, titres, fonds, musiques, enregistrements nœuds, tables de choix,
+#               conditions, opérations SET_VAR, actions, offsets + blobs JSON des nœuds.
+# Les blobs des nœuds (texte, choix...) restent dans le fichier mappé et ne sont
+# décodés qu'au premier accès (LazyNodeMap).
+
+CACHE_MAGIC = b"VNCG"
+CACHE_VERSION = 3
+CACHE_SUFFIX = ".vncache"
+
+_HEADER = struct.Struct("<4sH16sI")
+_SECTION = struct.Struct("<QQ")
+_NODE_RECORD = struct.Struct("<BiIIii")  # kind, next, choice_begin, choice_end, actions_ref, logic_ref
+
+SECTIONS = ("project", "ids", "titles", "backgrounds", "music", "nodes", "choice_target",
+            "choice_condition", "conditions", "logic", "actions", "blob_offsets", "blobs")
+
+
+def cache_path_for(json_path: str) -> Path:
+    """story.json -> story.vncache (même dossier)."""
+    path = Path(json_path)
+    return path.with_suffix(CACHE_SUFFIX)
+
+
+def content_hash(data: bytes) -> bytes:
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+# --- Matérialisation paresseuse ---
+def _construct_node(data: dict) -> NodeModel:
+    """Reconstruit un NodeModel sans validation (données issues d'un model_dump validé)."""
+    content = data["content"]
+    content["choices"] = [ChoiceModel.model_construct(**c) for c in content["choices"]]
+    content["actions"] = [_construct_action(a) for a in content["actions"]]
+    data["content"] = NodeContentModel.model_construct(**content)
+    data["type"] = NodeType(data["type"])
+    return NodeModel.model_construct(**data)
+
+
+def _construct_action(data: dict) -> ActionModel:
+    return ActionModel.model_construct(type=ActionType(data["type"]), params=data["params"])
+
+
+class LazyNodeMap(Mapping):
+    """
+    Dict en lecture des NodeModel du projet, adossé au cache mappé en mémoire.
+    Un nœud n'est décodé qu'à son premier accès.
+    close() libère le mapping (changement de projet, fermeture) : tant qu'il est ouvert,
+    le .vncache ne peut pas être remplacé sous Windows. Les nœuds déjà décodés restent lisibles.
+    """
+
+    def __init__(self, buffer, index_of: Dict[str, int], offsets: array, blobs_start: int):
+        self._buffer = buffer
+        self._index_of = index_of
+        self._offsets = offsets
+        self._blobs_start = blobs_start
+        self._materialized: Dict[str, NodeModel] = {}
+
+    def __getitem__(self, node_id: str) -> NodeModel:
+        node = self._materialized.get(node_id)
+        if node is None:
+            if self._buffer is None:
+                raise RuntimeError(f"Cache fermé : nœud {node_id} non chargé")
+            index = self._index_of[node_id]
+            begin = self._blobs_start + self._offsets[index]
+            end = self._blobs_start + self._offsets[index + 1]
+            node = _construct_node(json.loads(self._buffer[begin:end]))
+            self._materialized[node_id] = node
+        return node
+
+    def __contains__(self, node_id) -> bool:
+        return node_id in self._index_of
+
+    def __iter__(self):
+        return iter(self._index_of)
+
+    def __len__(self) -> int:
+        return len(self._index_of)
+
+    @property
+    def materialized_count(self) -> int:
+        return len(self._materialized)
+
+    def close(self):
+        if self._buffer is not None:
+            self._buffer.close()
+            self._buffer = None
+
+
+def close_project(project: Optional[ProjectModel]):
+    """Libère le cache mappé d'un projet chargé par load_project_cached (sans effet sinon)."""
+    if project is not None and isinstance(project.nodes, LazyNodeMap):
+        project.nodes.close()
+
+
+# --- Écriture ---
+def write_cache(path: Path, digest: bytes, graph: RuntimeGraph):
+    """Sérialise le graphe compilé et les nœuds (écriture atomique)."""
+    project = graph.project
+
+    logic_table: List[list] = []
+    action_table: List[list] = []
+    records = bytearray()
+    blob_offsets = array('Q', [0])
+    blobs = bytearray()
+
+    for node, model in zip(graph.nodes, project.nodes.values()):
+        logic_ref = NO_NODE
+        if node.logic is not None:
+            logic_ref = len(logic_table)
+            logic_table.append([node.logic.variable, node.logic.operation, node.logic.expression])
+
+        actions_ref = NO_NODE
+        if node.actions:
+            actions_ref = len(action_table)
+            action_table.append([a.model_dump(mode='json') for a in node.actions])
+
+        records += _NODE_RECORD.pack(node.kind, node.next, node.choice_begin, node.choice_end,
+                                     actions_ref, logic_ref)
+        blobs += model.model_dump_json().encode('utf-8')
+        blob_offsets.append(len(blobs))
+
+    header = project.model_dump(mode='json', exclude={"nodes"})
+    sections = [
+        json.dumps(header).encode('utf-8'),
+        "\0".join(graph.ids).encode('utf-8'),
+        "\0".join(graph.titles).encode('utf-8'),
+        "\0".join(graph.backgrounds).encode('utf-8'),
+        "\0".join(graph.music).encode('utf-8'),
+        bytes(records),
+        graph.choice_target.tobytes(),
+        graph.choice_condition.tobytes(),
+        "\0".join(graph.conditions).encode('utf-8'),
+        json.dumps(logic_table).encode('utf-8'),
+        json.dumps(action_table).encode('utf-8'),
+        blob_offsets.tobytes(),
+        bytes(blobs),
+    ]
+
+    table_size = _HEADER.size + _SECTION.size * len(sections)
+    offset = table_size
+    table = bytearray(_HEADER.pack(CACHE_MAGIC, CACHE_VERSION, digest, len(graph.nodes)))
+    for data in sections:
+        table += _SECTION.pack(offset, len(data))
+        offset += len(data)
+
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(table)
+        for data in sections:
+            f.write(data)
+    os.replace(tmp_path, path)
+
+
+# --- Lecture ---
+def read_cache(path: Path, digest: bytes) -> Optional[Tuple[ProjectModel, RuntimeGraph]]:
+    """Charge le cache s'il correspond à l'empreinte du story.json, sinon None."""
+    if not path.exists():
+        return None
+
+    with open(path, 'rb') as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    magic, version, cached_digest, node_count = _HEADER.unpack_from(buffer, 0)
+    if magic != CACHE_MAGIC or version != CACHE_VERSION or cached_digest != digest:
+        buffer.close()
+        return None
+
+    spans = {}
+    for i, name in enumerate(SECTIONS):
+        spans[name] = _SECTION.unpack_from(buffer, _HEADER.size + i * _SECTION.size)
+
+    def section(name: str) -> bytes:
+        begin, size = spans[name]
+        return buffer[begin:begin + size]
+
+    def strings(name: str) -> List[str]:
+        data = section(name).decode('utf-8')
+        return data.split("\0") if data else []
+
+    header = json.loads(section("project"))
+    ids = strings("ids")
+    index_of = {node_id: i for i, node_id in enumerate(ids)}
+
+    offsets = array('Q')
+    offsets.frombytes(section("blob_offsets"))
+    nodes = LazyNodeMap(buffer, index_of, offsets, spans["blobs"][0])
+
+    project = ProjectModel.model_construct(
+        meta=ProjectMetadata.model_construct(**header["meta"]),
+        variables={name: VariableDefinition.model_construct(type=VariableType(v["type"]),
+                                                            default_value=v["default_value"])
+                   for name, v in header["variables"].items()},
+        nodes=nodes,
+        assets=header["assets"],
+        start_node_id=header["start_node_id"],
+    )
+
+    graph = RuntimeGraph(project)
+    graph.ids = ids
+    graph.index_of = index_of
+    # Une entrée par nœud, chaînes vides comprises
+    graph.titles, graph.backgrounds, graph.music = (
+        section(name).decode('utf-8').split("\0") if node_count else [] for name in ("titles", "backgrounds", "music"))
+    graph.choice_target.frombytes(section("choice_target"))
+    graph.choice_condition.frombytes(section("choice_condition"))
+    graph.conditions = strings("conditions") or [""]
+
+    logic_table = [LogicOp(*entry) for entry in json.loads(section("logic"))]
+    action_table = [tuple(_construct_action(a) for a in group) for group in json.loads(section("actions"))]
+
+    graph.nodes = [
+        RuntimeNode(index, kind, next_index, begin, end,
+                    action_table[actions_ref] if actions_ref != NO_NODE else (),
+                    logic_table[logic_ref] if logic_ref != NO_NODE else None)
+        for index, (kind, next_index, begin, end, actions_ref, logic_ref)
+        in enumerate(_NODE_RECORD.iter_unpack(section("nodes")))
+    ]
+    graph.start_index = graph.index(project.start_node_id)
+    return project, graph
+
+
+def load_project_cached(json_path: str, use_cache: bool = True) -> Tuple[ProjectModel, RuntimeGraph, bool]:
+    """
+    Charge un projet compilé.
+    Cache valide : aucun parsing JSON global ni validation Pydantic. L'empreinte est celle
+    du story.json seul : pour un projet découpé, le manifeste nomme la génération de
+    chaque fichier de nœuds (voir src.common.loaders).
+    Sinon : validation complète, compilation puis écriture du cache.
+    Le projet précédemment chargé depuis ce cache doit avoir été libéré (close_project)
+    avant l'appel, sans quoi le remplacement du .vncache échoue sous Windows.
+    Retourne (projet, graphe, cache_hit).
+    """
+    with open(json_path, 'rb') as f:
+        raw = f.read()
+    digest = content_hash(raw)
+    path = cache_path_for(json_path)
+
+    if use_cache:
+        try:
+            cached = read_cache(path, digest)
+        except (OSError, ValueError, struct.error) as e:
+            log.warning("Cache", "Cache illisible (%s), recompilation.", e)
+            cached = None
+        if cached is not None:
+            return cached[0], cached[1], True
+
+    # Validation Pydantic automatique (story.json monolithique ou manifeste + fichiers de nœuds)
+    project = ProjectModel(**load_project_data(json_path, raw))
+    graph = compile_project(project)
+
+    if use_cache:
+        try:
+            write_cache(path, digest, graph)
+        except OSError as e:
+            log.warning("Cache", "Écriture impossible: %s", e)
+
+    return project, graph, False
@@ -1,16 +1,22 @@
-import json
 from PySide6.QtCore import QObject, Signal
 from src.common.models import ProjectModel, NodeModel
+from src.common.constants import ActionType
 from src.engine.state import SessionState
 from src.engine.flow import FlowManager
+from src.engine.runtime import RuntimeGraph
+from src.engine.session import StorySession
 from src.engine.audio import AudioManager
+from src.engine.prefetch import ASSET_MUSIC, ASSET_SFX
+from src.engine.log import log
+from src.engine.profiling import profiler
+from src.common.paths import get_project_path
 
 
 class GameEngine(QObject):
     """
     Contrôleur principal du jeu.
-    Fait le lien entre les données (ProjectModel), la logique (Flow) et l'UI.
-    Émet des signaux Qt quand l'état change pour que l'UI se mette à jour.
+    Adaptateur Qt autour du cœur headless (StorySession) : relaie ses callbacks
+    en signaux Qt pour l'UI et pilote l'audio.
     """
     # Signaux pour l'UI
     nodeChanged = Signal(object)  # Émet le nouveau NodeModel
@@ -18,61 +24,73 @@ class GameEngine(QObject):
 
     def __init__(self):
         super().__init__()
-        self.project: ProjectModel = None
-        self.state = SessionState()
-        self.flow: FlowManager = None
+        self.session = StorySession()
+        self.session.on_node_changed.append(self._process_node)
+        self.session.on_game_ended.append(self.gameEnded.emit)
         self.audio = AudioManager()
+        self.session.on_play_sound.append(self.audio.play_sfx)
+        self.session.prefetcher.warmers[ASSET_SFX] = self.audio.preload_sfx
+        self.session.prefetcher.warmers[ASSET_MUSIC] = self.audio.preload_music
 
-    def load_project(self, json_path: str):
-        """Charge le fichier story.json et initialise le moteur."""
-        try:
-            with open(json_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                # Validation Pydantic automatique
-                self.project = ProjectModel(**data)
+    # --- Accès au cœur (compatibilité UI) ---
+    @property
+    def project(self) -> ProjectModel:
+        return self.session.project
+
+    @property
+    def graph(self) -> RuntimeGraph:
+        return self.session.graph
+
+    @property
+    def state(self) -> SessionState:
+        return self.session.state
 
-            self.state.initialize_from_project(self.project)
-            self.flow = FlowManager(self.project, self.state)
-            print(f"[Engine] Projet '{self.project.meta.name}' chargé.")
+    @property
+    def flow(self) -> FlowManager:
+        return self.session.flow
 
+    def load_project(self, json_path: str, collapse_chains: bool = False, use_cache: bool = True):
+        """Charge le fichier story.json et initialise le moteur (voir StorySession.load_project)."""
+        try:
+            self.session.load_project(json_path, collapse_chains, use_cache)
+            # Sons du projet chargés d'avance (liste d'assets + actions PLAY_SOUND)
+            self.audio.preload_project(self._sound_files())
+            # Exceptions non gérées : trace + derniers événements du moteur à côté du projet
+            log.install_crash_report(get_project_path(json_path) / "crash_report.jsonl")
         except Exception as e:
-            print(f"[Engine] Erreur fatale au chargement: {e}")
+            log.error("Engine", "Erreur fatale au chargement: %s", e)
             raise e
 
+    def _sound_files(self):
+        yield from self.project.assets.values()
+        for actions in self.flow.node_actions:
+            for action in actions:
+                if action.kind == ActionType.PLAY_SOUND.value:
+                    yield action.payload.file
+
     def start_game(self):
         """Lance le jeu au noeud de départ."""
-        if not self.project.start_node_id:
-            print("[Engine] Aucun start_node_id défini !")
-            return
-
-        start_node = self.flow.get_node(self.project.start_node_id)
-        self._process_node(start_node)
+        self.session.start_game()
 
     def select_choice(self, index: int):
         """Appelé par l'UI quand le joueur clique sur un choix."""
-        next_node = self.flow.advance(index)
-        self._process_node(next_node)
+        self.session.select_choice(index)
 
     def next_dialogue(self):
         """Appelé par l'UI pour avancer après un dialogue simple."""
-        next_node = self.flow.advance()
-        self._process_node(next_node)
-
-    def _process_node(self, node: NodeModel):
-        """Traite le noeud courant : audio, mise à jour état, signal UI."""
-        if not node:
-            print("[Engine] Fin du flux.")
-            self.gameEnded.emit()
-            return
+        self.session.next_dialogue()
 
-        # 1. Mise à jour de l'état (History) - déjà fait dans flow.advance mais on confirme
-        self.state.current_node_id = node.id
+    def step_back(self) -> bool:
+        """Retour arrière d'un nœud (rollback)."""
+        return self.session.step_back()
 
-        # 2. Gestion Audio (si le noeud demande de changer la musique/jouer un son)
-        if node.content.audio_clip:
-            # Simplification: ici on considère que audio_clip est un SFX
-            # Pour une BGM, il faudrait un champ séparé ou une convention de nommage
-            self.audio.play_sfx(node.content.audio_clip)
+    def step_forward(self) -> bool:
+        return self.session.step_forward()
 
-        # 3. Notification à l'UI
-        self.nodeChanged.emit(node)
\ No newline at end of file
+    def _process_node(self, node: NodeModel):
+        """Traite le noeud courant : signal UI (rendu inclus, les slots sont synchrones)."""
+        with profiler.span("engine.process_node", "engine", self.state.current_index):
+            # Musique : ne change que si le nœud en définit une (fondu enchaîné)
+            if node.content.music:
+                self.audio.play_music(node.content.music)
+            self.nodeChanged.emit(node)
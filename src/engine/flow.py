@@ -1,103 +1,215 @@
-from typing import Optional
+from typing import Callable, Optional, List, Dict
 from src.common.models import ProjectModel, NodeModel, ActionModel
-from src.common.constants import NodeType, VarOperation, ActionType
+from src.common.constants import VarOperation
 from src.engine.state import SessionState
+from src.engine.log import log, DEBUG
+from src.engine.profiling import profiler
+from src.engine.actions import CompiledAction, compile_action, compile_node_actions
 from src.engine.scripting import ScriptEngine  # CORRECTION CRITIQUE : Import sans .py
+from src.engine.runtime import (RuntimeGraph, LogicOp, compile_project, collapse_logic_chains,
+                                KIND_SCENE, KIND_SET_VAR, NO_NODE)
+
+
+class FlowError(RuntimeError):
+    """Erreur d'exécution du flux (boucle logique, budget de pas dépassé)."""
 
 
 class FlowManager:
     """
     Cerveau de la navigation et exécution des actions.
+    Tourne sur le RuntimeGraph compilé (index entiers) ; les NodeModel ne sont
+    consultés que pour être renvoyés à l'UI.
+
+    Les suites de nœuds SET_VAR sont exécutées itérativement (profondeur de pile
+    constante), dans la limite de max_steps nœuds logiques par advance().
+    Avec collapse_chains, chaque suite est précompilée en une seule mise à jour
+    groupée (LogicChain).
     """
 
-    def __init__(self, project: ProjectModel, state: SessionState):
+    def __init__(self, project: ProjectModel, state: SessionState, graph: RuntimeGraph = None,
+                 max_steps: int = 10_000, collapse_chains: bool = False):
         self.project = project
         self.state = state
+        self.graph = graph if graph is not None else compile_project(project)
         self.script_engine = ScriptEngine()
+        self.max_steps = max_steps
+        self.collapse_chains = collapse_chains
 
-    def get_node(self, node_id: str) -> Optional[NodeModel]:
-        return self.project.nodes.get(node_id)
-
-    def advance(self, choice_index: int = -1) -> Optional[NodeModel]:
-        current_node = self.get_node(self.state.current_node_id)
-        if not current_node:
-            return None
-
-        next_node_id = None
-
-        if current_node.type == NodeType.SCENE:
-            if choice_index >= 0 and choice_index < len(current_node.content.choices):
-                choice = current_node.content.choices[choice_index]
-                # Vérification de condition optionnelle
-                if choice.condition:
-                    if not self.script_engine.evaluate_condition(choice.condition, self.state.variables):
-                        print(f"[Flow] Condition '{choice.condition}' non remplie.")
-                        return current_node
-
-                next_node_id = choice.target_node_id
+        # Fonctions de script liées à la partie : visited("UUID" ou "Titre")
+        self._visited_refs: Dict[str, int] = {}
+        self.script_engine.functions["visited"] = self._visited
 
-            elif not current_node.content.choices and current_node.outputs:
-                next_node_id = current_node.outputs[0].target_node_id
+        # Conditions et expressions SET_VAR parsées une fois pour toutes
+        self.script_errors = self.script_engine.precompile(self.graph.script_sources())
 
-        elif current_node.type == NodeType.SET_VAR:
-            self._execute_logic(current_node)
-            if current_node.outputs:
-                next_node_id = current_node.outputs[0].target_node_id
+        # Actions des nœuds : handler résolu et paramètres validés une fois pour toutes
+        self.node_actions, self.action_errors = compile_node_actions(self.graph)
+        self.on_play_sound: List[Callable[[str, float], None]] = []
 
-        if next_node_id:
-            self.state.current_node_id = next_node_id
-            self.state.push_history(next_node_id)
+        # Boucles SET_VAR détectées à la compilation (mode collapsed uniquement)
+        self.cyclic_chains = collapse_logic_chains(self.graph) if collapse_chains else []
 
-            next_node = self.get_node(next_node_id)
-
-            # --- EXÉCUTION DES ACTIONS (EVENTS) DU NOUVEAU NŒUD ---
-            if next_node and next_node.type == NodeType.SCENE:
-                for action in next_node.content.actions:
-                    self._execute_action(action)
+    def get_node(self, node_id: str) -> Optional[NodeModel]:
+        return self.project.nodes.get(node_id)
 
-            if next_node and next_node.type == NodeType.SET_VAR:
-                return self.advance()
+    def advance(self, choice_index: int = -1) -> Optional[NodeModel]:
+        """Avance dans le flux et retourne le NodeModel atteint (None en fin de flux)."""
+        return self.graph.node_model(self.advance_index(choice_index))
+
+    def _visited(self, ref: str) -> bool:
+        """Le nœud (UUID ou titre) est-il sur le chemin de la partie ? O(1), suit les retours arrière."""
+        index = self._visited_refs.get(ref)
+        if index is None:
+            index = self.graph.index(ref)
+            if index == NO_NODE:
+                index = self.graph.index_by_title(ref)
+            self._visited_refs[ref] = index
+        return index != NO_NODE and self.state.has_visited(index)
+
+    def available_choices(self, index: int) -> List[int]:
+        """Index locaux des choix du nœud dont la condition est remplie."""
+        graph = self.graph
+        node = graph.nodes[index]
+        available = []
+        for local, slot in enumerate(range(node.choice_begin, node.choice_end)):
+            cond_id = graph.choice_condition[slot]
+            if not cond_id or self._condition_passes(graph.conditions[cond_id], index):
+                available.append(local)
+        return available
+
+    def _condition_passes(self, condition: str, index: int) -> bool:
+        if profiler.enabled:
+            with profiler.span("script.condition", "script", index):
+                return self.script_engine.evaluate_condition(condition, self.state.variables)
+        return self.script_engine.evaluate_condition(condition, self.state.variables)
+
+    def advance_index(self, choice_index: int = -1) -> int:
+        """Comme advance(), mais reste sur les index du graphe (aucune matérialisation)."""
+        if profiler.enabled:
+            with profiler.span("flow.advance", "flow", self.state.current_index):
+                return self._advance_index(choice_index)
+        return self._advance_index(choice_index)
+
+    def _advance_index(self, choice_index: int) -> int:
+        graph = self.graph
+        current_index = self.state.current_index
+        if current_index == NO_NODE:
+            return NO_NODE
+
+        current = graph.nodes[current_index]
+        next_index = NO_NODE
+
+        if current.kind == KIND_SCENE:
+            if 0 <= choice_index < current.choice_end - current.choice_begin:
+                slot = current.choice_begin + choice_index
+                # Vérification de condition optionnelle
+                cond_id = graph.choice_condition[slot]
+                if cond_id:
+                    condition = graph.conditions[cond_id]
+                    if not self._condition_passes(condition, current_index):
+                        log.debug("Flow", "Condition '%s' non remplie.", condition)
+                        return current_index
+
+                next_index = graph.choice_target[slot]
+
+            elif current.choice_begin == current.choice_end:
+                next_index = current.next
+
+        elif current.kind == KIND_SET_VAR:
+            # Nœud logique courant (ex: départ sur un SET_VAR) : exécuté sans être ré-empilé
+            self._execute_logic(current.logic)
+            next_index = current.next
+
+        if next_index == NO_NODE:
+            return NO_NODE
+
+        next_index = self._run_logic_chain(next_index)
+        if next_index == NO_NODE:
+            return NO_NODE
+
+        self.state.current_index = next_index
+
+        # --- EXÉCUTION DES ACTIONS (EVENTS) DU NOUVEAU NŒUD ---
+        actions = self.node_actions[next_index]
+        if actions:
+            self._run_actions(actions)
+
+        return next_index
+
+    def _run_logic_chain(self, index: int) -> int:
+        """
+        Entre dans le nœud index et exécute la suite de SET_VAR qui en part.
+        Retourne le premier nœud non logique atteint (ou NO_NODE).
+        """
+        state = self.state
+        nodes = self.graph.nodes
+
+        if nodes[index].kind != KIND_SET_VAR:
+            state.push_history(index)
+            return index
+
+        if self.collapse_chains:
+            chain = self.graph.logic_chain(index)
+            if chain.cyclic:
+                raise FlowError(f"Boucle SET_VAR infinie à partir de '{self.graph.node_id(index)}'")
+            if len(chain.path) > self.max_steps:
+                raise FlowError(f"Budget de {self.max_steps} nœuds logiques dépassé")
+            for op in chain.ops:
+                self._execute_logic(op)
+            state.extend_history(chain.path)
+            state.current_index = chain.path[-1]
+            if chain.exit != NO_NODE:
+                state.push_history(chain.exit)
+            return chain.exit
+
+        seen = set()
+        while nodes[index].kind == KIND_SET_VAR:
+            if index in seen:
+                raise FlowError(f"Boucle SET_VAR infinie sur '{self.graph.node_id(index)}'")
+            if len(seen) >= self.max_steps:
+                raise FlowError(f"Budget de {self.max_steps} nœuds logiques dépassé")
+            seen.add(index)
+            state.push_history(index)
+            state.current_index = index
+
+            node = nodes[index]
+            self._execute_logic(node.logic)
+            index = node.next
+            if index == NO_NODE:
+                return NO_NODE
+
+        state.push_history(index)
+        return index
 
-            return next_node
+    def _execute_action(self, action: ActionModel):
+        """Exécute une action définie dans l'éditeur (hors graphe : compilée à la volée)."""
+        self._run_action(compile_action(action))
 
-        return None
+    def _run_actions(self, actions: tuple):
+        if profiler.enabled or log.enabled(DEBUG):
+            for action in actions:
+                self._run_action(action)
+            return
+        # Chemin direct : aucun span ni événement à produire
+        for action in actions:
+            action.execute(self, action.payload)
+
+    def _run_action(self, action: CompiledAction):
+        log.debug("Event", "Exécution action : %s", action.kind)
+        if profiler.enabled:
+            with profiler.span(action.kind, "action", self.state.current_index):
+                action.execute(self, action.payload)
+            return
+        action.execute(self, action.payload)
 
-    def _execute_action(self, action: ActionModel):
-        """Exécute une action définie dans l'éditeur (Spawn, Give Item...)."""
-        print(f"[Event] Exécution action : {action.type.value}")
-        p = action.params
-
-        if action.type == ActionType.ADD_ITEM:
-            item_id = p.get("item_id")
-            qty = int(p.get("qty", 1))
-            if item_id:
-                self.state.add_item(item_id, qty)
-
-        elif action.type == ActionType.REMOVE_ITEM:
-            item_id = p.get("item_id")
-            qty = int(p.get("qty", 1))
-            if item_id:
-                self.state.remove_item(item_id, qty)
-
-        elif action.type == ActionType.NPC_SPAWN:
-            npc_id = p.get("npc_id")
-            if npc_id:
-                self.state.update_npc(npc_id, {"spawned": True, "location": self.state.current_node_id})
-
-        elif action.type == ActionType.NPC_STATUS:
-            npc_id = p.get("npc_id")
-            status = p.get("status", "fixed")
-            if npc_id:
-                self.state.update_npc(npc_id, {"status": status})
-
-    def _execute_logic(self, node: NodeModel):
-        var_name = node.content.variable_name
-        op = node.content.operation
-        val_expr = node.content.value
-
-        if not var_name or not op:
+    def _execute_logic(self, logic: Optional[LogicOp]):
+        if logic is None:
             return
 
+        var_name = logic.variable
+        op = logic.operation
+        val_expr = logic.expression
+
         current_val = self.state.get_variable(var_name)
         target_val = self.script_engine.evaluate_expression(val_expr, self.state.variables)
 
@@ -0,0 +1,236 @@
+import os
+import threading
+import weakref
+from array import array
+from pathlib import Path
+from typing import Iterator, Optional, Union
+
+_ITEM_SIZE = array('i').itemsize
+
+
+def _read_range(path: Optional[Path], start: int, stop: int) -> bytes:
+    """Entrées [start, stop) d'un fichier de déversement."""
+    if stop <= start or path is None or not path.exists():
+        return b""
+    with open(path, 'rb') as f:
+        f.seek(start * _ITEM_SIZE)
+        return f.read((stop - start) * _ITEM_SIZE)
+
+
+class HistoryView:
+    """
+    Historique figé par NodeHistory.freeze() : rien n'est copié à la capture,
+    tobytes() sérialise plus tard (thread d'autosave).
+    """
+    __slots__ = ("_spill_path", "_spilled", "_buffer", "_length", "_lock", "__weakref__")
+
+    def __init__(self, spill_path: Optional[Path], spilled: int, buffer: array, length: int):
+        self._spill_path = spill_path
+        self._spilled = spilled  # Entrées du fichier de déversement (ou leurs octets une fois relues)
+        self._buffer = buffer  # Partagé avec NodeHistory, qui le copie avant toute modification
+        self._length = length
+        self._lock = threading.Lock()
+
+    def materialize(self):
+        """Relit la partie déversée : le fichier va être tronqué ou supprimé."""
+        with self._lock:
+            if self._spill_path is not None:
+                self._spilled = _read_range(self._spill_path, 0, self._spilled)
+                self._spill_path = None
+
+    def tobytes(self) -> bytes:
+        with self._lock:
+            if self._spill_path is not None:
+                spilled = _read_range(self._spill_path, 0, self._spilled)
+            else:
+                spilled = self._spilled or b""
+        return spilled + self._buffer[:self._length].tobytes()
+
+
+class NodeHistory:
+    """
+    Historique des nœuds visités : index int32 contigus (4 octets par visite).
+
+    cap : nombre maximal d'entrées gardées en mémoire (None = illimité). Au-delà,
+          la moitié la plus ancienne est déversée dans spill_path (ou oubliée sans fichier).
+    Les positions restent logiques : len() compte aussi les entrées déversées.
+
+    Deux réponses en O(1) à « ce nœud a-t-il été visité ? » :
+      - seen()    : bitset des nœuds déjà lus ; jamais effacé par un retour arrière
+                    (un texte lu reste lu, pour le mode skip) ;
+      - on_path() : nombre d'occurrences dans l'historique courant, tenu à jour par
+                    append / truncate (conditions visited() : chemin de la partie).
+    Entrées oubliées (cap sans spill_path) : un truncate en deçà ne peut pas les relire,
+    elles restent comptées sur le chemin.
+    """
+
+    def __init__(self, cap: Optional[int] = None, spill_path: Optional[Path] = None):
+        self.cap = cap
+        self.spill_path = Path(spill_path) if spill_path is not None else None
+        self._buffer = array('i')
+        self._offset = 0  # Entrées déversées / oubliées avant le buffer
+        self._seen = bytearray()
+        self._counts = array('i')  # Occurrences de chaque nœud dans l'historique
+        self.revisit = False  # Le dernier nœud ajouté avait déjà été vu
+        # Vues figées (freeze) : buffer partagé jusqu'à sa prochaine modification hors ajout,
+        # fichier de déversement relu par les vues avant d'être tronqué ou supprimé
+        self._shared = False
+        self._views = weakref.WeakSet()
+
+    def reset(self, node_count: int = 0):
+        self._release_spill()
+        self._buffer = array('i')
+        self._shared = False
+        self._offset = 0
+        self._seen = bytearray((node_count + 7) >> 3)
+        self._counts = array('i', bytes(_ITEM_SIZE * node_count))
+        self.revisit = False
+        if self.spill_path is not None and self.spill_path.exists():
+            self.spill_path.unlink()
+
+    # --- Ajout ---
+    def append(self, index: int):
+        seen = self._seen
+        byte, bit = index >> 3, 1 << (index & 7)
+        self.revisit = bool(seen[byte] & bit)
+        seen[byte] |= bit
+        self._counts[index] += 1
+        self._buffer.append(index)
+        if self.cap is not None and len(self._buffer) > self.cap:
+            self._spill()
+
+    def extend(self, indices):
+        for index in indices:
+            self.append(index)
+
+    def seen(self, index: int) -> bool:
+        byte = index >> 3
+        return byte < len(self._seen) and bool(self._seen[byte] & (1 << (index & 7)))
+
+    def on_path(self, index: int) -> bool:
+        """Le nœud figure-t-il dans l'historique courant (après retours arrière) ?"""
+        return 0 <= index < len(self._counts) and self._counts[index] > 0
+
+    # --- Lecture ---
+    def __len__(self) -> int:
+        return self._offset + len(self._buffer)
+
+    def __iter__(self) -> Iterator[int]:
+        """Entrées en mémoire uniquement (la partie déversée se relit avec tobytes())."""
+        return iter(self._buffer)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(len(self))
+            if start >= self._offset:
+                return self._buffer[start - self._offset:stop - self._offset:step]
+            entries = self._read_spilled(start, min(stop, self._offset))
+            entries.extend(self._buffer[:max(0, stop - self._offset)])
+            return entries[::step]
+        if key < 0:
+            key += len(self)
+        if key < self._offset:
+            return self._read_spilled(key, key + 1)[0]
+        return self._buffer[key - self._offset]
+
+    # --- Retour arrière ---
+    def truncate(self, length: int):
+        counts = self._counts
+        self._own_buffer()
+        if length >= self._offset:
+            for index in self._buffer[length - self._offset:]:
+                counts[index] -= 1
+            del self._buffer[length - self._offset:]
+            return
+        for index in self._buffer:
+            counts[index] -= 1
+        for index in self._read_spilled(length, self._offset):
+            counts[index] -= 1
+        self._buffer = array('i')
+        self._shared = False
+        self._release_spill()
+        if self.spill_path is not None and self.spill_path.exists():
+            os.truncate(self.spill_path, length * _ITEM_SIZE)
+        self._offset = length
+
+    def clear(self):
+        """Historique vide et nœuds oubliés (bitset compris), sans réallouer les tables."""
+        if self._offset:
+            self.reset(len(self._counts))
+            return
+        for index in self._buffer:
+            self._counts[index] -= 1
+        self._own_buffer()
+        del self._buffer[:]
+        self._seen[:] = bytes(len(self._seen))
+        self.revisit = False
+
+    # --- Sérialisation (sauvegardes) ---
+    def tobytes(self) -> bytes:
+        return self._read_spilled_bytes(0, self._offset) + self._buffer.tobytes()
+
+    def freeze(self) -> HistoryView:
+        """Vue figée de l'historique courant, en O(1) : la sérialisation est laissée à l'appelant."""
+        spill_path = self.spill_path if self._offset and self.spill_path is not None else None
+        view = HistoryView(spill_path, self._offset, self._buffer, len(self._buffer))
+        self._shared = True
+        if spill_path is not None:
+            self._views.add(view)
+        return view
+
+    def _own_buffer(self):
+        """Copy-on-write : le buffer partagé avec une vue est copié avant d'être modifié."""
+        if self._shared:
+            self._buffer = array('i', self._buffer)
+            self._shared = False
+
+    def _release_spill(self):
+        for view in list(self._views):
+            view.materialize()
+        self._views = weakref.WeakSet()
+
+    def seen_bytes(self) -> bytes:
+        return bytes(self._seen)
+
+    def load(self, data: Union[bytes, array], node_count: int, seen: Optional[bytes] = None):
+        """
+        Restaure l'historique (et le bitset ; recalculé depuis l'historique s'il manque).
+        data : int32 bruts ou array('i') déjà décodé (repris tel quel), index < node_count.
+        """
+        self.reset(node_count)
+        if isinstance(data, array):
+            buffer = data
+        else:
+            buffer = array('i')
+            buffer.frombytes(data)
+        if seen is not None and len(seen) == len(self._seen):
+            self._seen[:] = seen
+        else:
+            for index in buffer:
+                self._seen[index >> 3] |= 1 << (index & 7)
+        counts = self._counts
+        for index in buffer:
+            counts[index] += 1
+        self._buffer = buffer
+        if self.cap is not None and len(self._buffer) > self.cap:
+            self._spill()
+
+    # --- Déversement ---
+    def _spill(self):
+        """Sort la moitié la plus ancienne du buffer (amorti : O(1) par ajout)."""
+        count = len(self._buffer) - self.cap // 2
+        self._own_buffer()
+        if self.spill_path is not None:
+            self.spill_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.spill_path, 'ab') as f:
+                f.write(self._buffer[:count].tobytes())
+        del self._buffer[:count]
+        self._offset += count
+
+    def _read_spilled_bytes(self, start: int, stop: int) -> bytes:
+        return _read_range(self.spill_path, start, stop)
+
+    def _read_spilled(self, start: int, stop: int) -> array:
+        entries = array('i')
+        entries.frombytes(self._read_spilled_bytes(start, stop))
+        return entries
@@ -0,0 +1,133 @@
+"""
+Canal d'événements du moteur (remplace les print() des chemins chauds).
+
+    from src.engine.log import log
+    log.debug("Inventaire", "Ajout: %s x%d", item_id, qty, item=item_id)
+
+Le message n'est formaté (message % args) que s'il est affiché ou exporté.
+Les derniers événements restent dans un tampon circulaire pour les rapports de crash,
+DEBUG compris (ring_level) même quand la console n'affiche qu'à partir d'INFO.
+Un appel sous les deux niveaux s'arrête à une comparaison d'entiers :
+log.disable() rend le canal quasi gratuit (simulation en lot, validation).
+"""
+import json
+import sys
+import time
+import traceback
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+OFF = 100
+
+LEVEL_NAMES = {DEBUG: "DEBUG", INFO: "INFO", WARNING: "WARNING", ERROR: "ERROR"}
+
+# (horodatage, niveau, tag, message, args, champs structurés)
+LogRecord = Tuple[float, int, str, str, tuple, Dict[str, Any]]
+
+
+class EngineLog:
+    """
+    level      : niveau minimal affiché (echo) et transmis aux sinks (OFF = désactivé).
+    ring_level : niveau minimal gardé dans le tampon des rapports de crash (recent).
+    echo       : affiche aussi les événements sur la console, au format historique "[Tag] message".
+    """
+
+    def __init__(self, level: int = INFO, ring_size: int = 1000, echo: bool = True, ring_level: int = DEBUG):
+        self.echo = echo
+        self.ring_level = ring_level
+        self.recent: deque = deque(maxlen=ring_size)
+        self.sinks: List[Callable[[LogRecord], None]] = []
+        self.crash_report_path: Optional[Path] = None
+        self.set_level(level)
+
+    def set_level(self, level: int, ring_level: Optional[int] = None):
+        self.level = level
+        if ring_level is not None:
+            self.ring_level = ring_level
+        # Seuil d'émission : le plus bas des deux niveaux (OFF coupe aussi le tampon)
+        self._floor = OFF if level >= OFF else min(level, self.ring_level)
+
+    def disable(self):
+        self.set_level(OFF)
+
+    def enabled(self, level: int) -> bool:
+        """À tester avant de préparer des arguments coûteux (vrai si l'événement est gardé quelque part)."""
+        return level >= self._floor
+
+    # --- Émission ---
+    def log(self, level: int, tag: str, message: str, *args, **fields):
+        if level < self._floor:
+            return
+        record = (time.time(), level, tag, message, args, fields)
+        if level >= self.ring_level:
+            self.recent.append(record)
+        if level < self.level:
+            return
+        if self.echo:
+            print(f"[{tag}] {message % args if args else message}")
+        for sink in self.sinks:
+            sink(record)
+
+    def debug(self, tag: str, message: str, *args, **fields):
+        if DEBUG >= self._floor:
+            self.log(DEBUG, tag, message, *args, **fields)
+
+    def info(self, tag: str, message: str, *args, **fields):
+        if INFO >= self._floor:
+            self.log(INFO, tag, message, *args, **fields)
+
+    def warning(self, tag: str, message: str, *args, **fields):
+        if WARNING >= self._floor:
+            self.log(WARNING, tag, message, *args, **fields)
+
+    def error(self, tag: str, message: str, *args, **fields):
+        if ERROR >= self._floor:
+            self.log(ERROR, tag, message, *args, **fields)
+
+    # --- Export ---
+    @staticmethod
+    def format(record: LogRecord) -> str:
+        stamp, level, tag, message, args, _fields = record
+        text = message % args if args else message
+        return f"{time.strftime('%H:%M:%S', time.localtime(stamp))} {LEVEL_NAMES.get(level, level)} [{tag}] {text}"
+
+    @staticmethod
+    def to_dict(record: LogRecord) -> Dict[str, Any]:
+        stamp, level, tag, message, args, fields = record
+        return {"time": stamp, "level": LEVEL_NAMES.get(level, level), "tag": tag,
+                "message": message % args if args else message, **fields}
+
+    def dump(self, path: Path, crash: str = ""):
+        """Écrit le tampon d'événements récents (une ligne JSON par événement, trace en tête)."""
+        with open(path, 'w', encoding='utf-8') as f:
+            if crash:
+                f.write(json.dumps({"traceback": crash}, ensure_ascii=False) + "\n")
+            for record in self.recent:
+                f.write(json.dumps(self.to_dict(record), ensure_ascii=False, default=str) + "\n")
+
+    def install_crash_report(self, path: Path):
+        """Sur exception non gérée : écrit la trace et les derniers événements dans path."""
+        installed = self.crash_report_path is not None
+        self.crash_report_path = Path(path)
+        if installed:
+            return
+        previous_hook = sys.excepthook
+
+        def hook(exc_type, exc, tb):
+            try:
+                self.dump(self.crash_report_path, "".join(traceback.format_exception(exc_type, exc, tb)))
+                print(f"[Engine] Rapport de crash écrit dans {self.crash_report_path}")
+            except OSError:
+                pass
+            previous_hook(exc_type, exc, tb)
+
+        sys.excepthook = hook
+
+
+# Canal partagé par tout le moteur
+log = EngineLog()
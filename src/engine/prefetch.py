@@ -0,0 +1,158 @@
+"""
+Préchargement des ressources des nœuds à venir (lecteur).
+
+À chaque nœud atteint, AssetPrefetcher parcourt le graphe sur `depth` nœuds de scène
+au plus, du chemin le plus probable au moins probable, et transmet à l'hôte la liste
+ordonnée des fonds, musiques et sons rencontrés. Chaque type de ressource a son
+« warmer » (ex: ImagePipeline.prefetch) ; une nouvelle liste remplace la précédente,
+ce qui annule le préchargement d'une branche que le joueur n'a pas prise.
+
+Probabilité d'un chemin : produit des poids de ses arêtes (1 pour un choix disponible
+ou une suite directe, BLOCKED_WEIGHT pour un choix dont la condition échoue
+actuellement), divisé par la distance. Une condition qui tire au sort (random,
+randint) n'est pas évaluée, pour ne pas consommer le générateur de la partie :
+son choix compte comme disponible.
+
+Les fonds et musiques viennent des tables du RuntimeGraph : aucun NodeModel n'est
+matérialisé (cache .vncache paresseux).
+"""
+import heapq
+from typing import Callable, Dict, List, Tuple
+
+from src.common.constants import ActionType
+from src.engine.profiling import profiler
+from src.engine.runtime import KIND_SCENE, NO_NODE
+
+ASSET_BACKGROUND = "background"
+ASSET_MUSIC = "music"
+ASSET_SFX = "sfx"
+
+# (type de ressource, fichier relatif au dossier assets)
+Asset = Tuple[str, str]
+
+# Fonctions de script qui consomment le générateur aléatoire
+RANDOM_FUNCTIONS = ("random", "randint")
+
+
+class AssetPrefetcher:
+    """
+    depth      : nombre de nœuds de scène regardés en avant (les SET_VAR ne comptent pas)
+    max_nodes  : nœuds explorés au plus par nœud atteint
+    max_assets : ressources transmises au plus par nœud atteint
+    warmers    : type de ressource -> callback(fichiers, du plus probable au moins probable)
+    """
+    BLOCKED_WEIGHT = 0.2
+
+    def __init__(self, depth: int = 2, max_nodes: int = 64, max_assets: int = 16):
+        self.depth = depth
+        self.max_nodes = max_nodes
+        self.max_assets = max_assets
+        self.warmers: Dict[str, Callable[[List[str]], None]] = {}
+        self.flow = None
+        self._assets: Dict[int, Tuple[Asset, ...]] = {}
+        self._random_conditions: Dict[int, bool] = {}  # cond_id -> tire au sort
+
+    def attach(self, flow):
+        self.flow = flow
+        self._assets = {}
+        self._random_conditions = {}
+
+    # --- Ressources d'un nœud ---
+    def node_assets(self, index: int) -> Tuple[Asset, ...]:
+        """Fond, musique et sons joués à l'entrée du nœud (calculé une fois par nœud)."""
+        assets = self._assets.get(index)
+        if assets is None:
+            found = []
+            graph = self.flow.graph
+            if graph.backgrounds[index]:
+                found.append((ASSET_BACKGROUND, graph.backgrounds[index]))
+            if graph.music[index]:
+                found.append((ASSET_MUSIC, graph.music[index]))
+            for action in self.flow.node_actions[index]:
+                if action.kind == ActionType.PLAY_SOUND.value:
+                    found.append((ASSET_SFX, action.payload.file))
+            assets = tuple(found)
+            self._assets[index] = assets
+        return assets
+
+    # --- Parcours ---
+    def plan(self, index: int) -> List[Tuple[float, str, str]]:
+        """Ressources des nœuds à venir : (score, type, fichier), meilleur score d'abord."""
+        graph = self.flow.graph
+        script = self.flow.script_engine
+        variables = self.flow.state.variables
+
+        best: Dict[int, float] = {index: 1.0}
+        # Tas (-probabilité, distance, nœud) : chemins les plus probables d'abord
+        heap = [(-1.0, 0, index)]
+        planned: Dict[Asset, float] = {}
+        explored = 0
+
+        while heap and explored < self.max_nodes:
+            neg_weight, hops, current = heapq.heappop(heap)
+            weight = -neg_weight
+            if weight < best.get(current, 0.0):
+                continue
+            explored += 1
+
+            if hops > 0:
+                score = weight / hops
+                for asset in self.node_assets(current):
+                    if score > planned.get(asset, 0.0):
+                        planned[asset] = score
+
+            node = graph.nodes[current]
+            if node.kind == KIND_SCENE:
+                if hops >= self.depth:
+                    continue
+                next_hops = hops + 1
+                if node.choice_begin == node.choice_end:
+                    edges = [(node.next, 1.0)]
+                else:
+                    edges = []
+                    for slot in range(node.choice_begin, node.choice_end):
+                        cond_id = graph.choice_condition[slot]
+                        passes = (not cond_id or self._is_random(cond_id)
+                                  or script.evaluate_condition(graph.conditions[cond_id], variables))
+                        edges.append((graph.choice_target[slot], 1.0 if passes else self.BLOCKED_WEIGHT))
+            else:
+                next_hops = hops
+                edges = [(node.next, 1.0)]
+
+            for target, edge_weight in edges:
+                if target == NO_NODE:
+                    continue
+                target_weight = weight * edge_weight
+                if target_weight > best.get(target, 0.0):
+                    best[target] = target_weight
+                    heapq.heappush(heap, (-target_weight, next_hops, target))
+
+        # Tri stable : à score égal, ordre de découverte (ordre des choix)
+        ranked = sorted(((score, kind, file) for (kind, file), score in planned.items()), key=lambda entry: -entry[0])
+        return ranked[:self.max_assets]
+
+    def _is_random(self, cond_id: int) -> bool:
+        result = self._random_conditions.get(cond_id)
+        if result is None:
+            result = self.flow.script_engine.calls(self.flow.graph.conditions[cond_id], RANDOM_FUNCTIONS)
+            self._random_conditions[cond_id] = result
+        return result
+
+    def on_node(self, index: int):
+        """Nœud atteint : transmet le nouveau plan à chaque warmer (remplace le précédent)."""
+        if not self.warmers or self.flow is None or index == NO_NODE:
+            return
+        with profiler.span("prefetch.plan", "engine", index):
+            ranked = self.plan(index)
+        files: Dict[str, List[str]] = {kind: [] for kind in self.warmers}
+        current = set(self.node_assets(index))
+        for _score, kind, file in ranked:
+            if kind in files and (kind, file) not in current:
+                files[kind].append(file)
+        for kind, warmer in self.warmers.items():
+            warmer(files[kind])
+
+    def cancel(self):
+        """Vide les files de préchargement (fin de partie, changement de projet)."""
+        for warmer in self.warmers.values():
+            warmer([])
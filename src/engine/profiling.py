@@ -0,0 +1,156 @@
+"""
+Instrumentation du moteur : spans chronométrés, agrégats par nœud et export Chrome trace.
+
+    from src.engine.profiling import profiler
+    with profiler.span("flow.advance", node=index):
+        ...
+
+Désactivé, span() renvoie un contexte vide partagé (aucune mesure, aucune allocation).
+Le fichier de trace s'ouvre dans chrome://tracing ou https://ui.perfetto.dev.
+"""
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from src.engine.runtime import RuntimeGraph, NO_NODE
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Span:
+    __slots__ = ("profiler", "name", "cat", "node", "args", "start", "children")
+
+    def __init__(self, profiler: "Profiler", name: str, cat: str, node: int, args: Optional[Dict[str, Any]]):
+        self.profiler = profiler
+        self.name = name
+        self.cat = cat
+        self.node = node
+        self.args = args
+
+    def __enter__(self):
+        self.children = 0  # Temps passé dans les spans imbriqués
+        self.profiler._stack.append(self)
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        duration = time.perf_counter_ns() - self.start
+        stack = self.profiler._stack
+        stack.pop()
+        if stack:
+            stack[-1].children += duration
+        self.profiler._record(self, duration)
+        return False
+
+
+class Profiler:
+    """
+    Collecte les spans (max_events au plus pour la trace) et agrège, par nœud,
+    le nombre d'appels, le temps total, le temps propre (hors spans imbriqués)
+    et le pire temps de chaque span. Prévu pour le thread principal.
+    """
+
+    def __init__(self, max_events: int = 500_000):
+        self.enabled = False
+        self.max_events = max_events
+        self.dropped = 0
+        self._origin = time.perf_counter_ns()
+        self._events: List[tuple] = []  # (nom, catégorie, début ns, durée ns, tid, nœud, args)
+        self._node_stats: Dict[int, Dict[str, List[int]]] = {}  # nœud -> span -> [appels, total, propre, max] (ns)
+        self._stack: List[Span] = []
+
+    def enable(self):
+        self.clear()
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def clear(self):
+        self._origin = time.perf_counter_ns()
+        self._events = []
+        self._node_stats = {}
+        self._stack = []
+        self.dropped = 0
+
+    def span(self, name: str, cat: str = "engine", node: int = NO_NODE, args: Optional[Dict[str, Any]] = None):
+        if not self.enabled:
+            return _NULL_SPAN
+        return Span(self, name, cat, node, args)
+
+    def _record(self, span: Span, duration: int):
+        if len(self._events) < self.max_events:
+            self._events.append((span.name, span.cat, span.start, duration, threading.get_ident(), span.node, span.args))
+        else:
+            self.dropped += 1
+
+        if span.node != NO_NODE:
+            stats = self._node_stats.setdefault(span.node, {})
+            entry = stats.get(span.name)
+            own = duration - span.children
+            if entry is None:
+                stats[span.name] = [1, duration, own, duration]
+            else:
+                entry[0] += 1
+                entry[1] += duration
+                entry[2] += own
+                if duration > entry[3]:
+                    entry[3] = duration
+
+    # --- Export ---
+    def node_timings(self, graph: Optional[RuntimeGraph] = None) -> List[Dict[str, Any]]:
+        """Agrégats par nœud, du plus coûteux au moins coûteux (somme des temps propres)."""
+        timings = []
+        for node, stats in self._node_stats.items():
+            node_id = graph.node_id(node) if graph is not None and 0 <= node < len(graph) else node
+            model = graph.node_model(node) if graph is not None and 0 <= node < len(graph) else None
+            spans = {name: {"calls": calls, "total_ms": total / 1e6, "self_ms": own / 1e6, "max_ms": worst / 1e6}
+                     for name, (calls, total, own, worst) in stats.items()}
+            timings.append({
+                "node": node_id,
+                "title": model.title if model is not None else "",
+                "total_ms": sum(entry["self_ms"] for entry in spans.values()),
+                "spans": spans,
+            })
+        timings.sort(key=lambda entry: -entry["total_ms"])
+        return timings
+
+    def chrome_trace(self, graph: Optional[RuntimeGraph] = None) -> Dict[str, Any]:
+        """Format « Trace Event » (événements complets 'X', temps en microsecondes)."""
+        events = []
+        for name, cat, start, duration, tid, node, args in self._events:
+            event_args = dict(args) if args else {}
+            if node != NO_NODE:
+                event_args["node"] = graph.node_id(node) if graph is not None and 0 <= node < len(graph) else node
+            events.append({
+                "name": name, "cat": cat, "ph": "X", "pid": 1, "tid": tid,
+                "ts": (start - self._origin) / 1000, "dur": duration / 1000, "args": event_args,
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export(self, directory: Path, graph: Optional[RuntimeGraph] = None):
+        """Écrit profile_trace.json (Chrome trace) et profile_nodes.json (agrégats par nœud)."""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        with open(directory / "profile_trace.json", 'w', encoding='utf-8') as f:
+            json.dump(self.chrome_trace(graph), f)
+        with open(directory / "profile_nodes.json", 'w', encoding='utf-8') as f:
+            json.dump({"dropped_events": self.dropped, "nodes": self.node_timings(graph)}, f, indent=2,
+                      ensure_ascii=False)
+
+
+# Profileur partagé par le moteur et le lecteur (désactivé par défaut)
+profiler = Profiler()
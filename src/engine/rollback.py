@@ -0,0 +1,130 @@
+import sys
+from collections import deque
+from typing import Optional
+
+from src.engine.state import SessionState
+
+# Coût fixe estimé d'un point de retour (objet à slots + entrée de deque)
+_CHECKPOINT_OVERHEAD = 120
+
+
+class Checkpoint:
+    """
+    État de la partie à un nœud atteint.
+    Les dicts sont ceux du SessionState au moment du point (partagés en copy-on-write) :
+    d'un point à l'autre, seuls les dicts réellement modifiés diffèrent.
+    """
+    __slots__ = ("index", "variables", "inventory", "npcs", "history_len", "history_tail", "cost")
+
+    def __init__(self, state: SessionState, history_start: int):
+        self.index = state.current_index
+        self.variables = state.variables
+        self.inventory = state.inventory
+        self.npcs = state.npcs
+        self.history_len = len(state.history)
+        # Nœuds ajoutés à l'historique depuis le point précédent (rejoués en avant)
+        self.history_tail = tuple(state.history[history_start:])
+        self.cost = 0
+
+
+class RollbackLog:
+    """
+    Journal de retour arrière / avant du lecteur.
+    record() ne copie rien : l'état est gelé, et la première écriture qui suit dans un dict
+    (variables, inventaire ou PNJ) le copie en entier. Un pas qui écrit coûte donc la taille
+    du dict touché, les autres dicts restent partagés. Les plus anciens points sont évincés
+    au-delà du budget mémoire.
+    """
+
+    def __init__(self, memory_budget: int = 4 * 1024 * 1024):
+        self.memory_budget = memory_budget
+        self.memory_used = 0
+        self._checkpoints: deque = deque()
+        self._position = -1  # Point affiché (dernier sauf après un retour arrière)
+
+    def __len__(self) -> int:
+        return len(self._checkpoints)
+
+    def clear(self):
+        self._checkpoints.clear()
+        self._position = -1
+        self.memory_used = 0
+
+    def can_back(self) -> bool:
+        return self._position > 0
+
+    def can_forward(self) -> bool:
+        return self._position < len(self._checkpoints) - 1
+
+    def record(self, state: SessionState):
+        """Ajoute un point pour le nœud courant (abandonne la branche « future » éventuelle)."""
+        checkpoints = self._checkpoints
+        if self._position >= 0:
+            current = checkpoints[self._position]
+            if current.index == state.current_index and current.history_len == len(state.history):
+                return  # Rien n'a avancé (ex: condition non remplie) : pas de doublon
+        while len(checkpoints) - 1 > self._position:
+            self.memory_used -= checkpoints.pop().cost
+
+        previous: Optional[Checkpoint] = checkpoints[-1] if checkpoints else None
+        if previous is not None and previous.history_len > len(state.history):
+            previous = None  # Historique réinitialisé entre-temps
+        checkpoint = Checkpoint(state, previous.history_len if previous is not None else 0)
+        checkpoint.cost = self._estimate_cost(checkpoint, previous)
+        state.freeze()
+
+        checkpoints.append(checkpoint)
+        self._position = len(checkpoints) - 1
+        self.memory_used += checkpoint.cost
+
+        # Éviction des plus anciens points (le point courant est toujours conservé)
+        while self.memory_used > self.memory_budget and len(checkpoints) > 1:
+            self.memory_used -= checkpoints.popleft().cost
+            self._position -= 1
+            # Le nouveau premier point ne partage plus ses dicts avec un prédécesseur : il les porte seul
+            first = checkpoints[0]
+            self.memory_used -= first.cost
+            first.cost = self._estimate_cost(first, None)
+            self.memory_used += first.cost
+
+    def back(self, state: SessionState) -> bool:
+        if not self.can_back():
+            return False
+        self._position -= 1
+        checkpoint = self._checkpoints[self._position]
+        self._restore(state, checkpoint)
+        state.truncate_history(checkpoint.history_len)
+        return True
+
+    def forward(self, state: SessionState) -> bool:
+        if not self.can_forward():
+            return False
+        self._position += 1
+        checkpoint = self._checkpoints[self._position]
+        self._restore(state, checkpoint)
+        state.extend_history(checkpoint.history_tail)
+        return True
+
+    @staticmethod
+    def _restore(state: SessionState, checkpoint: Checkpoint):
+        state.current_index = checkpoint.index
+        state.variables = checkpoint.variables
+        state.inventory = checkpoint.inventory
+        state.npcs = checkpoint.npcs
+        state.freeze()
+
+    @staticmethod
+    def _estimate_cost(checkpoint: Checkpoint, previous: Optional[Checkpoint]) -> int:
+        """Mémoire propre au point : les dicts qu'il ne partage pas avec le précédent."""
+        cost = _CHECKPOINT_OVERHEAD + sys.getsizeof(checkpoint.history_tail)
+        if previous is None or checkpoint.variables is not previous.variables:
+            cost += sys.getsizeof(checkpoint.variables)
+        if previous is None or checkpoint.inventory is not previous.inventory:
+            cost += sys.getsizeof(checkpoint.inventory)
+        if previous is None or checkpoint.npcs is not previous.npcs:
+            cost += sys.getsizeof(checkpoint.npcs)
+            shared = previous.npcs if previous is not None else {}
+            for npc_id, npc in checkpoint.npcs.items():
+                if shared.get(npc_id) is not npc:
+                    cost += sys.getsizeof(npc)
+        return cost
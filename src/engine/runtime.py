@@ -0,0 +1,286 @@
+import hashlib
+from array import array
+from typing import Dict, List, Optional, Any, Iterator, Tuple
+from src.common.models import ProjectModel, NodeModel
+from src.common.constants import NodeType, VarOperation
+
+# Codes entiers des types de nœuds (évite les comparaisons d'Enum pendant advance)
+KIND_START = 0
+KIND_SCENE = 1
+KIND_SET_VAR = 2
+
+KIND_CODES = {
+    NodeType.START: KIND_START,
+    NodeType.SCENE: KIND_SCENE,
+    NodeType.SET_VAR: KIND_SET_VAR,
+}
+
+# Index "aucun nœud" (fin du flux, cible vide ou inconnue)
+NO_NODE = -1
+
+
+class LogicOp:
+    """Opération SET_VAR précompilée (variable, opérateur, expression source)."""
+    __slots__ = ("variable", "operation", "expression")
+
+    def __init__(self, variable: str, operation: str, expression: str):
+        self.variable = variable
+        self.operation = operation
+        self.expression = expression
+
+
+class RuntimeNode:
+    """
+    Nœud d'exécution compact.
+    Les choix ne sont pas stockés ici : [choice_begin, choice_end) est une
+    plage dans les tables à plat du RuntimeGraph.
+    """
+    __slots__ = ("index", "kind", "next", "choice_begin", "choice_end", "actions", "logic")
+
+    def __init__(self, index: int, kind: int, next_index: int, choice_begin: int, choice_end: int,
+                 actions: tuple, logic: Optional[LogicOp]):
+        self.index = index
+        self.kind = kind
+        self.next = next_index
+        self.choice_begin = choice_begin
+        self.choice_end = choice_end
+        self.actions = actions
+        self.logic = logic
+
+
+class LogicChain:
+    """
+    Suite de nœuds SET_VAR consécutifs fusionnée en une seule mise à jour.
+    path : nœuds traversés (historique), ops : opérations après repliement
+    des constantes, exit : premier nœud non SET_VAR (ou NO_NODE).
+    """
+    __slots__ = ("path", "ops", "exit", "cyclic")
+
+    def __init__(self, path: tuple, ops: tuple, exit_index: int, cyclic: bool):
+        self.path = path
+        self.ops = ops
+        self.exit = exit_index
+        self.cyclic = cyclic
+
+
+class RuntimeGraph:
+    """
+    Graphe d'exécution compilé à partir du ProjectModel.
+    Les nœuds sont adressés par index entier (plus d'UUID dans la boucle de jeu),
+    les cibles et conditions des choix sont rangées dans des tables à plat,
+    les conditions étant internées (une seule chaîne par source distincte).
+    """
+
+    def __init__(self, project: ProjectModel):
+        self.project = project
+
+        self.ids: List[str] = []  # index -> UUID
+        self.index_of: Dict[str, int] = {}  # UUID -> index
+        self.titles: List[str] = []  # index -> titre (références visited("Titre"))
+        # index -> fond / musique du nœud ("" si aucun) : préchargement sans matérialiser de NodeModel
+        self.backgrounds: List[str] = []
+        self.music: List[str] = []
+        self._title_index: Optional[Dict[str, int]] = None  # titre -> premier index, construit à la demande
+        self.nodes: List[RuntimeNode] = []
+
+        # Tables des choix (toutes les plages des nœuds bout à bout)
+        self.choice_target = array('i')  # index du nœud cible ou NO_NODE
+        self.choice_condition = array('I')  # index dans self.conditions (0 = aucune)
+        self.conditions: List[str] = [""]
+
+        self.start_index: int = NO_NODE
+
+        # Chaînes SET_VAR repliées (mode "collapsed"), calculées à la demande
+        self.chains: Dict[int, LogicChain] = {}
+
+        self._fingerprint: Optional[bytes] = None
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def index(self, node_id: Optional[str]) -> int:
+        if node_id is None:
+            return NO_NODE
+        return self.index_of.get(node_id, NO_NODE)
+
+    def index_by_title(self, title: str) -> int:
+        """Index du premier nœud portant ce titre (NO_NODE sinon), sans matérialiser de NodeModel."""
+        if self._title_index is None:
+            self._title_index = {}
+            for index, node_title in enumerate(self.titles):
+                self._title_index.setdefault(node_title, index)
+        return self._title_index.get(title, NO_NODE)
+
+    def node_id(self, index: int) -> Optional[str]:
+        if index == NO_NODE:
+            return None
+        return self.ids[index]
+
+    def node_model(self, index: int) -> Optional[NodeModel]:
+        """Retourne le NodeModel complet (texte, images...) destiné à l'UI."""
+        if index == NO_NODE:
+            return None
+        return self.project.nodes.get(self.ids[index])
+
+    @property
+    def fingerprint(self) -> bytes:
+        """Empreinte de la numérotation index -> UUID (un historique d'index n'est valable que pour elle)."""
+        if self._fingerprint is None:
+            self._fingerprint = hashlib.blake2b("\n".join(self.ids).encode('utf-8'), digest_size=16).digest()
+        return self._fingerprint
+
+    def choice_count(self, index: int) -> int:
+        node = self.nodes[index]
+        return node.choice_end - node.choice_begin
+
+    def script_sources(self) -> Iterator[Tuple[int, str]]:
+        """Toutes les sources de script du projet : (index du nœud, source)."""
+        for node in self.nodes:
+            for slot in range(node.choice_begin, node.choice_end):
+                cond_id = self.choice_condition[slot]
+                if cond_id:
+                    yield node.index, self.conditions[cond_id]
+            if node.logic is not None:
+                yield node.index, node.logic.expression
+
+    def logic_chain(self, index: int) -> LogicChain:
+        """Chaîne SET_VAR démarrant à index (calculée une fois puis mise en cache)."""
+        chain = self.chains.get(index)
+        if chain is None:
+            chain = _build_chain(self, index)
+            self.chains[index] = chain
+        return chain
+
+
+_SIGNS = {VarOperation.SET.value: 0, VarOperation.ADD.value: 1, VarOperation.SUB.value: -1}
+
+
+def _literal_int(expression: str) -> Optional[int]:
+    try:
+        return int(str(expression).strip())
+    except ValueError:
+        return None
+
+
+def _fold(ops: List[LogicOp], op: LogicOp):
+    """Replie op dans la dernière opération si les deux sont des constantes sur la même variable."""
+    if ops and ops[-1].variable == op.variable:
+        last = ops[-1]
+        value = _literal_int(op.expression)
+        last_value = _literal_int(last.expression)
+        if value is not None and last_value is not None and op.operation in _SIGNS and last.operation in _SIGNS:
+            if op.operation == VarOperation.SET:
+                ops[-1] = LogicOp(op.variable, VarOperation.SET.value, str(value))
+            elif last.operation == VarOperation.SET:
+                total = last_value + _SIGNS[op.operation] * value
+                ops[-1] = LogicOp(op.variable, VarOperation.SET.value, str(total))
+            else:
+                total = _SIGNS[last.operation] * last_value + _SIGNS[op.operation] * value
+                ops[-1] = LogicOp(op.variable, VarOperation.ADD.value, str(total))
+            return
+    ops.append(op)
+
+
+def _build_chain(graph: RuntimeGraph, index: int) -> LogicChain:
+    path = []
+    ops: List[LogicOp] = []
+    seen = set()
+    nodes = graph.nodes
+
+    while index != NO_NODE and nodes[index].kind == KIND_SET_VAR:
+        if index in seen:
+            return LogicChain(tuple(path), tuple(ops), NO_NODE, True)
+        seen.add(index)
+        path.append(index)
+        node = nodes[index]
+        if node.logic is not None:
+            _fold(ops, node.logic)
+        index = node.next
+
+    return LogicChain(tuple(path), tuple(ops), index, False)
+
+
+def collapse_logic_chains(graph: RuntimeGraph) -> List[int]:
+    """
+    Précalcule les chaînes SET_VAR (têtes de chaîne d'abord, puis les nœuds
+    restants, ex. une boucle sans entrée logique).
+    Retourne les index de départ des chaînes qui bouclent sur elles-mêmes.
+    """
+    logic_nodes = [node.index for node in graph.nodes if node.kind == KIND_SET_VAR]
+    fed_by_logic = {graph.nodes[i].next for i in logic_nodes}
+    heads = [i for i in logic_nodes if i not in fed_by_logic]
+    others = [i for i in logic_nodes if i in fed_by_logic]
+
+    covered = set()
+    cyclic = []
+    for index in heads + others:
+        if index in covered:
+            continue
+        chain = graph.logic_chain(index)
+        covered.update(chain.path)
+        if chain.cyclic:
+            cyclic.append(index)
+    return cyclic
+
+
+def _output_target(output: Any) -> Optional[str]:
+    """Les outputs sont typés Any : objets ou dicts selon l'origine du JSON."""
+    if isinstance(output, dict):
+        return output.get("target_node_id")
+    return getattr(output, "target_node_id", None)
+
+
+def compile_project(project: ProjectModel) -> RuntimeGraph:
+    """
+    Compile le projet en RuntimeGraph.
+    À appeler une fois après le chargement ; le ProjectModel reste la source
+    des données d'affichage.
+    """
+    graph = RuntimeGraph(project)
+
+    # 1. Attribution des index
+    for node_id in project.nodes:
+        graph.index_of[node_id] = len(graph.ids)
+        graph.ids.append(node_id)
+
+    interned: Dict[str, int] = {"": 0}
+    index_of = graph.index_of
+
+    # 2. Nœuds + tables de choix
+    for index, node in enumerate(project.nodes.values()):
+        content = node.content
+        graph.titles.append(node.title)
+        graph.backgrounds.append(content.background_image or "")
+        graph.music.append(content.music or "")
+        kind = KIND_CODES.get(node.type, KIND_START)
+
+        begin = len(graph.choice_target)
+        for choice in content.choices:
+            target = choice.target_node_id
+            graph.choice_target.append(index_of.get(target, NO_NODE) if target else NO_NODE)
+
+            condition = choice.condition.strip() if choice.condition else ""
+            cond_id = interned.get(condition)
+            if cond_id is None:
+                cond_id = len(graph.conditions)
+                interned[condition] = cond_id
+                graph.conditions.append(condition)
+            graph.choice_condition.append(cond_id)
+        end = len(graph.choice_target)
+
+        next_index = NO_NODE
+        if node.outputs:
+            target = _output_target(node.outputs[0])
+            if target:
+                next_index = index_of.get(target, NO_NODE)
+
+        logic = None
+        if kind == KIND_SET_VAR and content.variable_name and content.operation:
+            logic = LogicOp(content.variable_name, content.operation, content.value)
+
+        actions = tuple(content.actions) if kind == KIND_SCENE else ()
+
+        graph.nodes.append(RuntimeNode(index, kind, next_index, begin, end, actions, logic))
+
+    graph.start_index = graph.index(project.start_node_id)
+    return graph
@@ -0,0 +1,247 @@
+import json
+import struct
+import threading
+import time
+import zlib
+from array import array
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from src.common.loaders import write_atomic
+from src.engine.history import HistoryView
+from src.engine.state import SessionState
+from src.engine.runtime import NO_NODE
+from src.engine.log import log
+
+# Format binaire d'une sauvegarde (.sav, little-endian) :
+#   en-tête  : MAGIC, version, flags, empreinte du graphe, index courant,
+#              taille de l'historique, taille du payload
+#   payload  : JSON compressé (zlib) -> variables, inventaire, PNJ, nœud courant, date
+#   historique : index des nœuds en int32 bruts (copie mémoire, coût quasi constant)
+#   nœuds vus  : bitset de NodeHistory (si le flag FLAG_SEEN est présent)
+
+SAVE_MAGIC = b"VNSV"
+SAVE_VERSION = 1
+SAVE_SUFFIX = ".sav"
+AUTOSAVE_SLOT = "autosave"
+
+FLAG_SEEN = 1
+
+_HEADER = struct.Struct("<4sHH16siII")
+_ITEM_SIZE = array('i').itemsize
+
+
+class SaveError(Exception):
+    """Sauvegarde illisible ou incompatible."""
+
+
+class SaveSnapshot:
+    """
+    Copie figée d'un SessionState, prise sur le thread appelant puis écrite ailleurs.
+    history : octets int32 (sauvegarde relue) ou HistoryView (capture, sérialisée par to_bytes).
+    """
+    __slots__ = ("fingerprint", "current_index", "current_node_id", "variables", "inventory", "npcs",
+                 "history", "seen", "label", "saved_at")
+
+    @classmethod
+    def capture(cls, state: SessionState, label: str = "") -> "SaveSnapshot":
+        snapshot = cls()
+        snapshot.fingerprint = state.graph.fingerprint
+        snapshot.current_index = state.current_index
+        snapshot.current_node_id = state.current_node_id
+        # Dicts partagés en copy-on-write : la partie peut continuer pendant l'écriture
+        state.freeze()
+        snapshot.variables = state.variables
+        snapshot.inventory = state.inventory
+        snapshot.npcs = state.npcs
+        snapshot.history = state.history.freeze()
+        snapshot.seen = state.history.seen_bytes()
+        snapshot.label = label
+        snapshot.saved_at = time.time()
+        return snapshot
+
+    def to_bytes(self) -> bytes:
+        history = self.history.tobytes() if isinstance(self.history, HistoryView) else self.history
+        payload = zlib.compress(json.dumps({
+            "variables": self.variables,
+            "inventory": self.inventory,
+            "npcs": self.npcs,
+            "current_node_id": self.current_node_id,
+            "label": self.label,
+            "saved_at": self.saved_at,
+        }).encode('utf-8'))
+        header = _HEADER.pack(SAVE_MAGIC, SAVE_VERSION, FLAG_SEEN if self.seen else 0, self.fingerprint,
+                              self.current_index, len(history) // _ITEM_SIZE, len(payload))
+        return header + payload + history + (self.seen or b"")
+
+    @classmethod
+    def from_bytes(cls, data: bytes, with_history: bool = True) -> "SaveSnapshot":
+        if len(data) < _HEADER.size:
+            raise SaveError("Fichier de sauvegarde tronqué")
+        magic, version, flags, fingerprint, current_index, history_len, payload_len = _HEADER.unpack_from(data)
+        if magic != SAVE_MAGIC:
+            raise SaveError("Ce fichier n'est pas une sauvegarde")
+        if version > SAVE_VERSION:
+            raise SaveError(f"Version de sauvegarde {version} non supportée")
+
+        offset = _HEADER.size
+        payload = json.loads(zlib.decompress(data[offset:offset + payload_len]))
+        offset += payload_len
+
+        snapshot = cls()
+        snapshot.fingerprint = fingerprint
+        snapshot.current_index = current_index
+        snapshot.current_node_id = payload["current_node_id"]
+        snapshot.variables = payload["variables"]
+        snapshot.inventory = payload["inventory"]
+        snapshot.npcs = payload["npcs"]
+        snapshot.label = payload.get("label", "")
+        snapshot.saved_at = payload.get("saved_at", 0.0)
+        snapshot.history = b""
+        snapshot.seen = None
+        if with_history:
+            snapshot.history = data[offset:offset + history_len * _ITEM_SIZE]
+            if len(snapshot.history) != history_len * _ITEM_SIZE:
+                raise SaveError("Historique de la sauvegarde tronqué")
+            if flags & FLAG_SEEN:
+                snapshot.seen = data[offset + history_len * _ITEM_SIZE:]
+        return snapshot
+
+    def apply(self, state: SessionState):
+        """
+        Restaure la partie. Si le projet a changé depuis, on se recale sur l'UUID du nœud courant.
+        SaveError (état intact) si l'historique est illisible ou désigne des nœuds inexistants.
+        """
+        same_graph = self.fingerprint == state.graph.fingerprint
+        if same_graph:
+            # Vérifié avant toute modification : une sauvegarde corrompue laisse la partie en cours intacte
+            history = array('i')
+            try:
+                history.frombytes(self.history)
+            except ValueError as e:
+                raise SaveError(f"Historique illisible : {e}")
+            node_count = len(state.graph)
+            if history and (min(history) < 0 or max(history) >= node_count) \
+                    or not 0 <= self.current_index < node_count:
+                raise SaveError("Historique incohérent avec le projet")
+
+        state.variables = dict(self.variables)
+        state.inventory = dict(self.inventory)
+        state.npcs = {npc_id: dict(data) for npc_id, data in self.npcs.items()}
+
+        if same_graph:
+            state.current_index = self.current_index
+            state.history.load(history, len(state.graph), self.seen)
+        else:
+            log.warning("Save", "Le projet a changé depuis la sauvegarde : historique ignoré.")
+            state.current_node_id = self.current_node_id
+            state.history.reset(len(state.graph))
+
+
+class SaveManager:
+    """
+    Emplacements de sauvegarde d'un projet (dossier saves/ à côté du story.json).
+    L'autosave est écrite par un thread de fond : l'appelant ne paie que la copie de l'état.
+    """
+
+    def __init__(self, saves_dir: Path):
+        self.saves_dir = Path(saves_dir)
+
+        self._pending: Optional[SaveSnapshot] = None
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._idle = threading.Event()
+        self._idle.set()
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+
+    def slot_path(self, slot: str) -> Path:
+        return self.saves_dir / f"{slot}{SAVE_SUFFIX}"
+
+    # --- Sauvegarde / chargement synchrones ---
+    def save(self, slot: str, state: SessionState, label: str = ""):
+        self.saves_dir.mkdir(parents=True, exist_ok=True)
+        write_atomic(self.slot_path(slot), SaveSnapshot.capture(state, label).to_bytes())
+        log.info("Save", "Partie sauvegardée (%s).", slot)
+
+    def load(self, slot: str, state: SessionState) -> bool:
+        path = self.slot_path(slot)
+        if not path.exists():
+            log.info("Save", "Aucune sauvegarde '%s'.", slot)
+            return False
+        try:
+            snapshot = SaveSnapshot.from_bytes(path.read_bytes())
+        except (SaveError, ValueError, zlib.error) as e:
+            log.warning("Save", "Sauvegarde '%s' illisible: %s", slot, e)
+            return False
+
+        if state.graph.index(snapshot.current_node_id) == NO_NODE:
+            log.warning("Save", "Le nœud sauvegardé n'existe plus dans le projet.")
+            return False
+        try:
+            snapshot.apply(state)
+        except SaveError as e:
+            log.warning("Save", "Sauvegarde '%s' rejetée: %s", slot, e)
+            return False
+        return True
+
+    def list_slots(self) -> List[Dict[str, Any]]:
+        """Emplacements existants (sans lire l'historique)."""
+        slots = []
+        if not self.saves_dir.exists():
+            return slots
+        for path in sorted(self.saves_dir.glob(f"*{SAVE_SUFFIX}")):
+            try:
+                snapshot = SaveSnapshot.from_bytes(path.read_bytes(), with_history=False)
+            except (SaveError, ValueError, zlib.error):
+                continue
+            slots.append({"slot": path.stem, "label": snapshot.label, "saved_at": snapshot.saved_at})
+        return slots
+
+    # --- Autosave en arrière-plan ---
+    def autosave(self, state: SessionState, label: str = ""):
+        """Capture l'état et confie l'écriture au thread de fond (la plus récente remplace l'attente)."""
+        snapshot = SaveSnapshot.capture(state, label)
+        with self._lock:
+            if self._closed:
+                return
+            self._pending = snapshot
+            self._idle.clear()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._autosave_loop, name="autosave", daemon=True)
+                self._thread.start()
+        self._wakeup.set()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Attend que l'autosave en attente soit écrite."""
+        return self._idle.wait(timeout)
+
+    def close(self):
+        """Termine le thread d'autosave après avoir écrit la dernière capture."""
+        with self._lock:
+            self._closed = True
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _autosave_loop(self):
+        while True:
+            self._wakeup.wait()
+            self._wakeup.clear()
+            with self._lock:
+                snapshot, self._pending = self._pending, None
+                closed = self._closed
+
+            if snapshot is not None:
+                try:
+                    self.saves_dir.mkdir(parents=True, exist_ok=True)
+                    write_atomic(self.slot_path(AUTOSAVE_SLOT), snapshot.to_bytes())
+                except OSError as e:
+                    log.error("Save", "Autosave impossible: %s", e)
+
+            with self._lock:
+                if self._pending is None:
+                    self._idle.set()
+            if closed:
+                return
@@ -1,10 +1,21 @@
 from simpleeval import SimpleEval
-from typing import Dict, Any
+from collections import OrderedDict
+from typing import Dict, Any, Iterable, List, Tuple
+import ast
 import random
 import math
 
+from src.engine.log import log
+
+
 class ScriptEngine:
-    def __init__(self):
+    """
+    Évaluation sécurisée des conditions et expressions (simpleeval).
+    Les sources connues au chargement sont parsées une seule fois (precompile) ;
+    les expressions dynamiques passent par un cache LRU borné.
+    """
+
+    def __init__(self, cache_size: int = 256):
         self.functions = {
             "min": min, "max": max, "abs": abs, "round": round,
             "random": random.random, "randint": random.randint,
@@ -12,20 +23,82 @@ class ScriptEngine:
         }
         self.evaluator = SimpleEval(functions=self.functions)
 
+        self.cache_size = cache_size
+        self._compiled: Dict[str, ast.AST] = {}  # Sources du projet (permanent)
+        self._dynamic: "OrderedDict[str, ast.AST]" = OrderedDict()  # LRU
+        self._invalid: Dict[str, str] = {}  # Source -> erreur de compilation
+
+    # --- Compilation ---
+    def precompile(self, sources: Iterable[Tuple[int, str]]) -> List[Tuple[int, str, str]]:
+        """
+        Parse toutes les sources du projet (node_index, source).
+        Retourne la liste des erreurs (node_index, source, message).
+        """
+        errors = []
+        for node_index, source in sources:
+            source = str(source).strip()
+            if not source or source in self._compiled:
+                continue
+            if source in self._invalid:
+                errors.append((node_index, source, self._invalid[source]))
+                continue
+            try:
+                self._compiled[source] = self.evaluator.parse(source)
+            except Exception as e:
+                self._invalid[source] = str(e)
+                errors.append((node_index, source, str(e)))
+        return errors
+
+    def _parsed(self, source: str) -> ast.AST:
+        tree = self._compiled.get(source)
+        if tree is not None:
+            return tree
+
+        tree = self._dynamic.get(source)
+        if tree is not None:
+            self._dynamic.move_to_end(source)
+            return tree
+
+        tree = self.evaluator.parse(source)
+        self._dynamic[source] = tree
+        if len(self._dynamic) > self.cache_size:
+            self._dynamic.popitem(last=False)
+        return tree
+
+    def calls(self, source: str, names: Iterable[str]) -> bool:
+        """La source appelle-t-elle l'une des fonctions names ? (False si elle est vide ou invalide)"""
+        source = str(source).strip()
+        if not source or source in self._invalid:
+            return False
+        try:
+            tree = self._compiled.get(source) or self.evaluator.parse(source)
+        except Exception:
+            return False
+        names = set(names)
+        return any(isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id in names
+                   for node in ast.walk(tree))
+
+    # --- Évaluation ---
     def evaluate_condition(self, condition: str, context: Dict[str, Any]) -> bool:
         if not condition or not condition.strip(): return True
+        condition = condition.strip()
+        if condition in self._invalid:
+            return False
         self.evaluator.names = context
         try:
-            return bool(self.evaluator.eval(condition))
+            return bool(self.evaluator.eval(condition, self._parsed(condition)))
         except Exception as e:
-            print(f"[Script] Erreur condition '{condition}': {e}")
+            log.warning("Script", "Erreur condition '%s': %s", condition, e)
             return False
 
     def evaluate_expression(self, expression: str, context: Dict[str, Any]) -> Any:
         if not expression: return 0
+        expression = str(expression).strip()
+        if expression in self._invalid:
+            return 0
         self.evaluator.names = context
         try:
-            return self.evaluator.eval(str(expression))
+            return self.evaluator.eval(expression, self._parsed(expression))
         except Exception as e:
-            print(f"[Script] Erreur expression '{expression}': {e}")
-            return 0
\ No newline at end of file
+            log.warning("Script", "Erreur expression '%s': %s", expression, e)
+            return 0
@@ -0,0 +1,159 @@
+from typing import Callable, List, Optional
+from src.common.models import ProjectModel, NodeModel
+from src.engine.state import SessionState
+from src.engine.flow import FlowManager, FlowError
+from src.engine.runtime import RuntimeGraph, NO_NODE
+from src.engine.cache import load_project_cached, close_project
+from src.engine.saves import SaveManager, AUTOSAVE_SLOT
+from src.engine.rollback import RollbackLog
+from src.engine.prefetch import AssetPrefetcher
+from src.engine.log import log
+from src.common.paths import get_project_path
+
+
+class StorySession:
+    """
+    Cœur du moteur sans dépendance Qt (FlowManager + SessionState + ScriptEngine).
+    L'hôte (GameEngine, simulateur, serveur...) s'abonne via de simples callbacks :
+        on_node_changed(node: NodeModel)
+        on_game_ended()
+        on_play_sound(file: str, volume: float)   (action PLAY_SOUND)
+    Les sauvegardes sont rangées dans le dossier saves/ du projet ; l'autosave
+    (désactivée par défaut) est écrite en arrière-plan à chaque nœud atteint.
+    Chaque nœud atteint est aussi un point de retour arrière (voir RollbackLog).
+    Les ressources des nœuds suivants sont signalées aux warmers de l'hôte
+    (prefetcher.warmers, voir AssetPrefetcher) ; sans warmer, rien n'est calculé.
+    """
+
+    def __init__(self):
+        self.project: Optional[ProjectModel] = None
+        self.graph: Optional[RuntimeGraph] = None
+        self.state = SessionState()
+        self.flow: Optional[FlowManager] = None
+        self.saves: Optional[SaveManager] = None
+        self.autosave_enabled = False
+        self.rollback = RollbackLog()
+        self.prefetcher = AssetPrefetcher()
+
+        self.on_node_changed: List[Callable[[NodeModel], None]] = []
+        self.on_game_ended: List[Callable[[], None]] = []
+        self.on_play_sound: List[Callable[[str, float], None]] = []
+
+    def load_project(self, json_path: str, collapse_chains: bool = False, use_cache: bool = True):
+        """
+        Charge le fichier story.json et initialise le moteur.
+        collapse_chains : fusionne les suites de SET_VAR en mises à jour groupées.
+        use_cache : réutilise le graphe compilé (.vncache) si le story.json n'a pas changé.
+        """
+        # Libère le cache mappé du projet précédent avant une éventuelle réécriture
+        close_project(self.project)
+        # Validation Pydantic + compilation uniquement si le cache est absent/périmé
+        project, graph, cache_hit = load_project_cached(json_path, use_cache)
+        if cache_hit:
+            log.info("Engine", "Graphe compilé chargé depuis le cache.")
+        self.attach(project, graph, collapse_chains)
+        if self.saves is not None:
+            self.saves.close()
+        self.saves = SaveManager(get_project_path(json_path) / "saves")
+        log.info("Engine", "Projet '%s' chargé.", self.project.meta.name)
+
+    def attach(self, project: ProjectModel, graph: RuntimeGraph, collapse_chains: bool = False):
+        """Initialise la session sur un projet déjà compilé (ex: partagé par un simulateur)."""
+        self.project = project
+        self.graph = graph
+        self.state.initialize_from_project(project, graph)
+        self.flow = FlowManager(project, self.state, graph, collapse_chains=collapse_chains)
+        self.flow.on_play_sound = self.on_play_sound
+        self.rollback.clear()
+        self.prefetcher.attach(self.flow)
+
+        for index, source, message in self.flow.script_errors:
+            log.warning("Engine", "Script invalide dans '%s': '%s' (%s)", graph.node_model(index).title, source, message)
+        for index, kind, message in self.flow.action_errors:
+            log.warning("Engine", "Action '%s' ignorée dans '%s': %s", kind, graph.node_model(index).title, message)
+        for index in self.flow.cyclic_chains:
+            log.warning("Engine", "Boucle SET_VAR infinie à partir de '%s'", graph.node_model(index).title)
+
+    def reset(self):
+        """Remet la session au départ (variables par défaut, historique vide)."""
+        self.state.initialize_from_project(self.project, self.graph)
+        self.rollback.clear()
+
+    # --- Sauvegardes ---
+    def save_game(self, slot: str, label: str = ""):
+        self.saves.save(slot, self.state, label)
+
+    def load_game(self, slot: str = AUTOSAVE_SLOT) -> bool:
+        """Restaure une sauvegarde et notifie l'hôte du nœud restauré."""
+        if not self.saves.load(slot, self.state):
+            return False
+        self.rollback.clear()
+        self._process_index(self.state.current_index)
+        return True
+
+    def close(self):
+        """Attend la fin de l'autosave en cours et libère le cache du projet (à appeler à la fermeture)."""
+        if self.saves is not None:
+            self.saves.close()
+        close_project(self.project)
+
+    # --- Navigation ---
+    def start_game(self):
+        """Lance le jeu au noeud de départ."""
+        if self.graph.start_index == NO_NODE:
+            log.error("Engine", "Aucun start_node_id défini !")
+            return
+
+        self.state.current_index = self.graph.start_index
+        self._process_index(self.graph.start_index)
+
+    def select_choice(self, index: int):
+        """Appelé par l'UI quand le joueur clique sur un choix."""
+        self._process_index(self._advance(index))
+
+    def next_dialogue(self):
+        """Appelé par l'UI pour avancer après un dialogue simple."""
+        self._process_index(self._advance())
+
+    def step_back(self) -> bool:
+        """Revient au nœud précédent sans rejouer le flux."""
+        if not self.rollback.back(self.state):
+            return False
+        self._notify(self.state.current_index)
+        return True
+
+    def step_forward(self) -> bool:
+        """Refait un pas annulé par step_back()."""
+        if not self.rollback.forward(self.state):
+            return False
+        self._notify(self.state.current_index)
+        return True
+
+    def _advance(self, choice_index: int = -1) -> int:
+        try:
+            return self.flow.advance_index(choice_index)
+        except FlowError as e:
+            log.error("Engine", "Erreur de flux: %s", e)
+            return NO_NODE
+
+    def _process_index(self, index: int):
+        """Notifie l'hôte du nœud atteint (NodeModel matérialisé uniquement si quelqu'un écoute)."""
+        if index == NO_NODE:
+            log.info("Engine", "Fin du flux.")
+            self.prefetcher.cancel()
+            for callback in self.on_game_ended:
+                callback()
+            return
+
+        self.rollback.record(self.state)
+        if self.autosave_enabled and self.saves is not None:
+            self.saves.autosave(self.state)
+        self._notify(index)
+
+    def _notify(self, index: int):
+        if self.on_node_changed:
+            node = self.graph.node_model(index)
+            for callback in self.on_node_changed:
+                callback(node)
+        # Après le rendu : les ressources du nœud courant passent avant celles des suivants
+        self.prefetcher.on_node(index)
@@ -1,56 +1,116 @@
-from typing import Dict, Any, List
+from pathlib import Path
+from typing import Dict, Any, Optional
 from src.common.models import ProjectModel
+from src.engine.runtime import RuntimeGraph, NO_NODE
+from src.engine.history import NodeHistory
+from src.engine.log import log
 
 
 class SessionState:
     """
     Gère l'état courant d'une partie (Session).
     Stocke les variables, l'historique, l'inventaire et les PNJ.
+    history_cap / history_spill : voir NodeHistory (historique borné, déversé sur disque).
     """
 
-    def __init__(self):
+    def __init__(self, history_cap: Optional[int] = None, history_spill: Optional[Path] = None):
         self.variables: Dict[str, Any] = {}
-        self.history: List[str] = []
-        self.current_node_id: str = None
+        self.history = NodeHistory(history_cap, history_spill)  # Index des nœuds visités (RuntimeGraph)
+        self.current_index: int = NO_NODE
+        self.graph: Optional[RuntimeGraph] = None
 
         # NOUVEAU : Systèmes RPG
         self.inventory: Dict[str, int] = {}  # item_id -> quantité
         self.npcs: Dict[str, Dict[str, Any]] = {}  # npc_id -> {status, location, inventory...}
 
-    def initialize_from_project(self, project: ProjectModel):
+        # Copy-on-write : dicts référencés par un instantané (rollback), copiés à la prochaine écriture
+        self._shared_variables = False
+        self._shared_inventory = False
+        self._shared_npcs = False
+
+    def initialize_from_project(self, project: ProjectModel, graph: RuntimeGraph):
         self.variables = {}
         for name, var_def in project.variables.items():
             self.variables[name] = var_def.default_value
 
-        self.history = []
-        self.current_node_id = project.start_node_id
+        self.graph = graph
+        self.history.reset(len(graph))
+        self.current_index = graph.start_index
         self.inventory = {}
         self.npcs = {}
+        self._shared_variables = self._shared_inventory = self._shared_npcs = False
+
+    @property
+    def current_node_id(self) -> Optional[str]:
+        """UUID du nœud courant (traduit depuis l'index compilé)."""
+        if self.graph is None:
+            return None
+        return self.graph.node_id(self.current_index)
+
+    @current_node_id.setter
+    def current_node_id(self, node_id: Optional[str]):
+        self.current_index = self.graph.index(node_id) if self.graph is not None else NO_NODE
+
+    def freeze(self):
+        """
+        Partage les dicts courants avec un instantané : ils ne seront plus modifiés en place.
+        La prochaine écriture dans chacun le copie en entier (coût proportionnel à sa taille).
+        """
+        self._shared_variables = self._shared_inventory = self._shared_npcs = True
 
     def set_variable(self, name: str, value: Any):
+        if self._shared_variables:
+            self.variables = dict(self.variables)
+            self._shared_variables = False
         self.variables[name] = value
 
     def get_variable(self, name: str) -> Any:
         return self.variables.get(name, 0)
 
-    def push_history(self, node_id: str):
-        self.history.append(node_id)
+    def push_history(self, node_index: int):
+        self.history.append(node_index)
+
+    def extend_history(self, node_indices):
+        self.history.extend(node_indices)
+
+    def truncate_history(self, length: int):
+        self.history.truncate(length)
+
+    def has_seen(self, node_index: int) -> bool:
+        """Le nœud a-t-il déjà été lu pendant la partie, même sur une branche annulée (O(1)) ?"""
+        return self.history.seen(node_index)
+
+    def has_visited(self, node_index: int) -> bool:
+        """Le nœud est-il sur le chemin courant de la partie (O(1), suit les retours arrière) ?"""
+        return self.history.on_path(node_index)
 
     # --- Gestion Inventaire ---
+    def _own_inventory(self):
+        if self._shared_inventory:
+            self.inventory = dict(self.inventory)
+            self._shared_inventory = False
+
     def add_item(self, item_id: str, qty: int = 1):
+        self._own_inventory()
         current = self.inventory.get(item_id, 0)
         self.inventory[item_id] = current + qty
-        print(f"[Inventaire] Ajout: {item_id} x{qty} (Total: {self.inventory[item_id]})")
+        log.debug("Inventaire", "Ajout: %s x%d (Total: %d)", item_id, qty, self.inventory[item_id])
 
     def remove_item(self, item_id: str, qty: int = 1):
         if item_id in self.inventory:
+            self._own_inventory()
             self.inventory[item_id] = max(0, self.inventory[item_id] - qty)
             if self.inventory[item_id] == 0:
                 del self.inventory[item_id]
 
     # --- Gestion PNJ ---
     def update_npc(self, npc_id: str, data: Dict[str, Any]):
-        if npc_id not in self.npcs:
-            self.npcs[npc_id] = {"status": "fixed", "location": "unknown"}
-        self.npcs[npc_id].update(data)
-        print(f"[PNJ] Mise à jour {npc_id}: {data}")
\ No newline at end of file
+        if self._shared_npcs:
+            self.npcs = dict(self.npcs)
+            self._shared_npcs = False
+        # Nouveau dict par mise à jour : celui d'avant peut appartenir à un instantané
+        npc = self.npcs.get(npc_id)
+        npc = dict(npc) if npc is not None else {"status": "fixed", "location": "unknown"}
+        npc.update(data)
+        self.npcs[npc_id] = npc
+        log.debug("PNJ", "Mise à jour %s: %s", npc_id, data)
\ No newline at end of file
@@ -0,0 +1,187 @@
+"""
+Chargement asynchrone des images de fond.
+
+Les fichiers sont décodés en QImage sur un pool de threads, directement à la taille
+d'affichage (QImageReader.setScaledSize : le JPEG est réduit pendant le décodage).
+Le thread de l'UI ne fait que convertir le résultat en QPixmap et le ranger dans un
+cache LRU borné en mémoire : peindre le fond devient une simple copie.
+"""
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from PySide6.QtCore import QObject, QRunnable, QSize, QThreadPool, Signal
+from PySide6.QtGui import QImage, QImageReader, QPixmap
+
+from src.engine.log import log
+
+# Clé du cache : (chemin, largeur, hauteur) en pixels physiques
+ImageKey = Tuple[str, int, int]
+
+# Priorités du pool : une image demandée passe devant les préchargements
+REQUEST_PRIORITY = 1
+PREFETCH_PRIORITY = 0
+
+
+class _DecodeSignals(QObject):
+    # Émis depuis un thread du pool, reçu dans le thread de l'UI (connexion en file)
+    decoded = Signal(object, object)  # ImageKey, QImage (nulle si échec)
+
+
+class _DecodeTask(QRunnable):
+    def __init__(self, key: ImageKey, signals: _DecodeSignals):
+        super().__init__()
+        # Durée de vie gérée côté Python (ImagePipeline._pending) : tryTake() reste sûr
+        self.setAutoDelete(False)
+        self.key = key
+        self.signals = signals
+
+    def run(self):
+        path, width, height = self.key
+        reader = QImageReader(path)
+        reader.setAutoTransform(True)
+        if width > 0 and height > 0:
+            reader.setScaledSize(QSize(width, height))
+        image = reader.read()
+        if not image.isNull():
+            # Format natif de peinture : pas de conversion au premier affichage
+            image = image.convertToFormat(QImage.Format_ARGB32_Premultiplied)
+        self.signals.decoded.emit(self.key, image)
+
+
+class ImagePipeline(QObject):
+    """
+    request(path, size) renvoie le QPixmap s'il est en cache, sinon lance le décodage
+    et renvoie None ; imageReady est émis quand l'image est prête.
+    prefetch(paths, size) remplace la file des préchargements (les décodages pas encore
+    démarrés qui n'y figurent plus sont annulés) ; ils ne prennent que prefetch_budget octets.
+    memory_budget : taille maximale du cache (octets) ; les images les moins
+    récemment utilisées sont évincées au-delà.
+    """
+    imageReady = Signal(object, object)  # ImageKey, QPixmap
+
+    def __init__(self, memory_budget: int = 64 * 1024 * 1024, threads: int = 2, parent=None):
+        super().__init__(parent)
+        self.memory_budget = memory_budget
+        self.memory_used = 0
+        self.prefetch_budget = memory_budget // 2
+        self.hits = 0
+        self.misses = 0
+        self.cancelled = 0
+
+        self._cache: "OrderedDict[ImageKey, QPixmap]" = OrderedDict()
+        self._pending: Dict[ImageKey, _DecodeTask] = {}
+        self._prefetching: Set[ImageKey] = set()  # En attente pour un préchargement seulement
+        self._failed: Set[str] = set()
+        self._sizes: Dict[ImageKey, int] = {}
+
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(threads)
+        self._signals = _DecodeSignals(self)
+        self._signals.decoded.connect(self._on_decoded)
+
+    @staticmethod
+    def key(path: str, size: QSize) -> ImageKey:
+        return (path, size.width(), size.height())
+
+    # --- Accès ---
+    def get(self, key: ImageKey) -> Optional[QPixmap]:
+        pixmap = self._cache.get(key)
+        if pixmap is not None:
+            self._cache.move_to_end(key)
+        return pixmap
+
+    def request(self, path: str, size: QSize) -> Optional[QPixmap]:
+        key = self.key(path, size)
+        pixmap = self.get(key)
+        if pixmap is not None:
+            self.hits += 1
+            return pixmap
+        self.misses += 1
+        if key in self._prefetching:
+            # Déjà en file comme préchargement : passe devant si pas encore démarré
+            self._prefetching.discard(key)
+            task = self._pending[key]
+            if self._pool.tryTake(task):
+                self._pool.start(task, REQUEST_PRIORITY)
+        else:
+            self._schedule(key, REQUEST_PRIORITY)
+        return None
+
+    def prefetch(self, paths: Iterable[str], size: QSize):
+        """Précharge les images dans l'ordre donné (la plus probable d'abord)."""
+        cost = size.width() * size.height() * 4
+        budget = self.prefetch_budget
+        wanted = []
+        for path in paths:
+            if budget < cost:
+                break
+            budget -= cost
+            key = self.key(path, size)
+            if key in self._cache:
+                self._cache.move_to_end(key)  # Protégé de l'éviction
+                continue
+            if key[0] in self._failed:
+                continue
+            wanted.append(key)
+
+        # Annulation : le joueur a pris une autre branche
+        keep = set(wanted)
+        for key in list(self._prefetching):
+            if key not in keep and self._pool.tryTake(self._pending[key]):
+                del self._pending[key]
+                self._prefetching.discard(key)
+                self.cancelled += 1
+
+        for key in wanted:
+            if key not in self._pending:
+                self._prefetching.add(key)
+                self._schedule(key, PREFETCH_PRIORITY)
+
+    def is_pending(self, key: ImageKey) -> bool:
+        return key in self._pending
+
+    def _schedule(self, key: ImageKey, priority: int):
+        if key in self._pending or key[0] in self._failed:
+            return
+        task = _DecodeTask(key, self._signals)
+        self._pending[key] = task
+        self._pool.start(task, priority)
+
+    def _on_decoded(self, key: ImageKey, image: QImage):
+        self._pending.pop(key, None)
+        self._prefetching.discard(key)
+        if image.isNull():
+            self._failed.add(key[0])
+            log.warning("Images", "Image illisible ou introuvable: %s", key[0])
+            return
+        pixmap = QPixmap.fromImage(image)
+        self._store(key, pixmap)
+        self.imageReady.emit(key, pixmap)
+
+    # --- Cache LRU ---
+    def _store(self, key: ImageKey, pixmap: QPixmap):
+        if key in self._cache:
+            self.memory_used -= self._sizes[key]
+        cost = pixmap.width() * pixmap.height() * max(1, pixmap.depth() // 8)
+        self._cache[key] = pixmap
+        self._cache.move_to_end(key)
+        self._sizes[key] = cost
+        self.memory_used += cost
+
+        # Le dernier arrivé est toujours conservé, même s'il dépasse seul le budget
+        while self.memory_used > self.memory_budget and len(self._cache) > 1:
+            old_key, _ = self._cache.popitem(last=False)
+            self.memory_used -= self._sizes.pop(old_key)
+
+    def clear(self):
+        self._cache.clear()
+        self._sizes.clear()
+        self._failed.clear()
+        self.memory_used = 0
+
+    def shutdown(self):
+        """Abandonne les décodages en attente et attend ceux en cours (fermeture)."""
+        self._pool.clear()
+        self._pool.waitForDone()
+        self._pending.clear()
+        self._prefetching.clear()
@@ -1,81 +1,384 @@
-from PySide6.QtWidgets import QLabel, QPushButton, QWidget, QVBoxLayout, QGraphicsOpacityEffect
-from PySide6.QtCore import Qt, QTimer, Signal, QPropertyAnimation, QEasingCurve
+from typing import List, Optional
 
+from PySide6.QtWidgets import QLabel, QPushButton, QWidget, QVBoxLayout, QGraphicsOpacityEffect, QSizePolicy
+from PySide6.QtCore import Qt, QTimer, Signal, QPropertyAnimation, QEasingCurve, QElapsedTimer, QEvent, QRectF, QSize
+from PySide6.QtGui import QTextDocument, QTextLayout, QAbstractTextDocumentLayout, QPainter, QPalette, QPixmap, QRegion
+from PySide6 import QtGui
 
-class TypewriterLabel(QLabel):
+from src.engine.ui.images import ImagePipeline
+
+
+class TypewriterLabel(QWidget):
     """
-    Label qui affiche le texte caractère par caractère (effet machine à écrire).
+    Affiche le texte caractère par caractère (effet machine à écrire).
+
+    Le texte (brut ou riche) est mis en page une seule fois dans un QTextDocument ;
+    un tick ne fait qu'avancer le compteur de caractères dévoilés et repeindre les
+    lignes concernées, la partie encore cachée étant exclue par découpage (clip).
+    Le nombre de caractères par tick suit l'horloge : la vitesse reste constante
+    même quand des frames prennent du retard.
+    Ce n'est pas un QLabel : la feuille de style de l'application doit le nommer
+    (sélecteur TypewriterLabel) pour lui appliquer la police des textes.
     """
     finished = Signal()  # Émis quand le texte est totalement affiché
 
-    def __init__(self, parent=None):
+    FRAME_MS = 16  # Un tick par frame (~60 Hz)
+    MARGIN = 10
+
+    def __init__(self, parent=None, chars_per_second: float = 33.0):
         super().__init__(parent)
-        self.setWordWrap(True)
-        self.setAlignment(Qt.AlignTop | Qt.AlignLeft)
-        self.setStyleSheet("color: white; font-size: 18px; padding: 10px;")
+        self.setAttribute(Qt.WA_OpaquePaintEvent, False)
+        policy = QSizePolicy(QSizePolicy.Preferred, QSizePolicy.Preferred)
+        policy.setHeightForWidth(True)
+        self.setSizePolicy(policy)
+        self.setStyleSheet("color: white; font-size: 18px;")
 
+        self.chars_per_second = chars_per_second
         self.full_text = ""
-        self.current_char_index = 0
-        self.timer = QTimer()
-        self.timer.setInterval(30)  # Vitesse: 30ms par lettre
-        self.timer.timeout.connect(self._add_char)
+        self.revealed = 0  # Caractères dévoilés
+        self._total = 0
+        self._frontier = (0.0, 0.0, 0.0)  # Géométrie du curseur de dévoilement (haut, hauteur, x)
+        self._line = None  # Ligne du curseur : (début, fin, haut, hauteur, abscisses des caractères)
+        self._pixmap = None  # Rendu complet du texte (voir _rendered)
 
+        self.document = QTextDocument(self)
+        self.document.setDocumentMargin(0)
+        self._layout_width = -1.0
+        self._heights = {}  # Largeur du widget -> hauteur (heightForWidth), pour le texte courant
+
+        self._clock = QElapsedTimer()
+        self.timer = QTimer(self)
+        self.timer.setInterval(self.FRAME_MS)
+        self.timer.timeout.connect(self._tick)
+
+    # --- API ---
     def show_text(self, text: str):
-        self.full_text = text
-        self.current_char_index = 0
-        self.setText("")
-        self.timer.start()
-
-    def _add_char(self):
-        if self.current_char_index < len(self.full_text):
-            self.setText(self.full_text[:self.current_char_index + 1])
-            self.current_char_index += 1
+        self.full_text = text or ""
+        if QtGui.Qt.mightBeRichText(self.full_text):
+            self.document.setHtml(self.full_text)
+        else:
+            self.document.setPlainText(self.full_text)
+        self.document.setDefaultFont(self.font())
+        self._total = self.document.characterCount() - 1
+        self._line = None
+        self._pixmap = None
+        self._heights.clear()
+        self._layout_width = -1.0
+        self._relayout()
+        self.updateGeometry()
+
+        self.revealed = 0
+        self._frontier = self._cursor_geometry(0)
+        self.update()
+        if self._total > 0:
+            self._clock.start()
+            self.timer.start()
         else:
             self.complete()
 
     def complete(self):
         """Force l'affichage complet immédiat (si le joueur clique)."""
         self.timer.stop()
-        self.setText(self.full_text)
+        self.set_revealed(self._total)
         self.finished.emit()
 
     def is_animating(self) -> bool:
         return self.timer.isActive()
 
+    def set_revealed(self, count: int):
+        """Dévoile les `count` premiers caractères (repeint seulement les lignes qui changent)."""
+        count = max(0, min(count, self._total))
+        if count == self.revealed:
+            return
+        top_a, height_a, _ = self._frontier
+        self._frontier = self._cursor_geometry(count)
+        top_b, height_b, _ = self._frontier
+        self.revealed = count
+        top = min(top_a, top_b)
+        bottom = max(top_a + height_a, top_b + height_b)
+        self.update(0, int(top) + self.MARGIN, self.width(), int(bottom - top) + 2)
+
+    # --- Animation ---
+    def _tick(self):
+        target = int(self._clock.elapsed() * self.chars_per_second / 1000) + 1
+        self.set_revealed(target)
+        if self.revealed >= self._total:
+            self.complete()
+
+    # --- Mise en page ---
+    def _relayout(self):
+        width = float(max(1, self.width() - 2 * self.MARGIN))
+        if width != self._layout_width:
+            self.document.setTextWidth(width)
+            self._layout_width = width
+            self._line = None
+            self._pixmap = None
+            self.document.size()  # Force la mise en page complète (une fois par largeur)
+            self._frontier = self._cursor_geometry(self.revealed)
+
+    def _cursor_geometry(self, position: int):
+        """(haut de ligne, hauteur de ligne, x) du caractère `position` dans le document."""
+        cached = self._line
+        if cached is not None and cached[0] <= position < cached[1]:
+            return cached[2], cached[3], cached[4][position - cached[0]]
+
+        block = self.document.findBlock(position)
+        if not block.isValid():
+            return self.document.size().height(), 0.0, 0.0
+        layout = block.layout()
+        line = layout.lineForTextPosition(position - block.position())
+        if not line.isValid():
+            return layout.position().y(), layout.boundingRect().height(), 0.0
+
+        # Abscisses de tous les caractères de la ligne, calculées une fois (le curseur la parcourt)
+        origin = layout.position()
+        first = block.position() + line.textStart()
+        xs = [None] * (line.textLength() + 1)
+        flags = QTextLayout.GlyphRunRetrievalFlag.RetrieveStringIndexes | QTextLayout.GlyphRunRetrievalFlag.RetrieveGlyphPositions
+        for run in line.glyphRuns(line.textStart(), line.textLength(), flags):
+            for index, point in zip(run.stringIndexes(), run.positions()):
+                slot = index - line.textStart()
+                if 0 <= slot < len(xs) and (xs[slot] is None or point.x() < xs[slot]):
+                    xs[slot] = point.x()
+        xs[-1] = line.x() + line.naturalTextWidth()
+        previous = line.x()
+        for slot, x in enumerate(xs):
+            previous = x if x is not None else previous
+            xs[slot] = origin.x() + previous
+
+        self._line = (first, first + line.textLength(), origin.y() + line.y(), line.height(), xs)
+        return self._line[2], self._line[3], xs[position - first]
+
+    def hasHeightForWidth(self) -> bool:
+        return True
+
+    def heightForWidth(self, width: int) -> int:
+        # Les layouts l'appellent en boucle : une mise en page par largeur et par texte
+        height = self._heights.get(width)
+        if height is None:
+            text_width = float(max(1, width - 2 * self.MARGIN))
+            if text_width != self._layout_width:
+                self.document.setTextWidth(text_width)
+                self._layout_width = text_width
+                self._line = None
+                self._pixmap = None
+                self._frontier = self._cursor_geometry(self.revealed)
+            height = int(self.document.size().height()) + 2 * self.MARGIN
+            self._heights[width] = height
+        return height
+
+    def sizeHint(self) -> QSize:
+        return QSize(self.width(), self.heightForWidth(max(self.width(), 200)))
+
+    def resizeEvent(self, event):
+        self._relayout()
+        super().resizeEvent(event)
+
+    def changeEvent(self, event):
+        # Police issue d'une feuille de style : on remet le document en page
+        if event.type() in (QEvent.FontChange, QEvent.PaletteChange):
+            self.document.setDefaultFont(self.font())
+            self._layout_width = -1.0
+            self._heights.clear()
+            self._relayout()
+            self.updateGeometry()
+        super().changeEvent(event)
+
+    def _rendered(self) -> QPixmap:
+        """Texte complet rendu une fois (par texte, largeur, police et couleur) ; les ticks ne font que le découper."""
+        if self._pixmap is None:
+            ratio = self.devicePixelRatioF()
+            size = self.document.size()
+            pixmap = QPixmap(max(1, int((size.width() + 1) * ratio)), max(1, int((size.height() + 1) * ratio)))
+            pixmap.setDevicePixelRatio(ratio)
+            pixmap.fill(Qt.transparent)
+
+            painter = QPainter(pixmap)
+            context = QAbstractTextDocumentLayout.PaintContext()
+            context.palette = self.palette()
+            context.palette.setColor(QPalette.Text, self.palette().color(QPalette.WindowText))
+            self.document.documentLayout().draw(painter, context)
+            painter.end()
+            self._pixmap = pixmap
+        return self._pixmap
+
+    def paintEvent(self, event):
+        if self.revealed <= 0:
+            return
+        self._relayout()
+        painter = QPainter(self)
+        painter.setClipRect(event.rect())
+        painter.translate(self.MARGIN, self.MARGIN)
+
+        if self.revealed < self._total:
+            # Lignes entièrement dévoilées + début de la ligne en cours
+            top, height, x = self._frontier
+            width = int(self._layout_width) + 1
+            region = QRegion(0, 0, width, int(top)) + QRegion(0, int(top), int(x) + 1, int(height) + 1)
+            painter.setClipRegion(region, Qt.IntersectClip)
+
+        painter.drawPixmap(0, 0, self._rendered())
+
+
+# Style par défaut des choix, à poser une seule fois au niveau de l'application
+# (QApplication.setStyleSheet) : aucun widget ne porte sa propre feuille de style.
+CHOICE_STYLESHEET = """
+    QPushButton#choiceButton {
+        background-color: rgba(0, 0, 0, 0.7);
+        color: white;
+        border: 1px solid #555;
+        padding: 10px;
+        font-size: 16px;
+        border-radius: 5px;
+        text-align: left;
+    }
+    QPushButton#choiceButton:hover {
+        background-color: rgba(50, 50, 150, 0.8);
+        border-color: #88F;
+    }
+"""
+
 
 class ChoiceButton(QPushButton):
     """
-    Bouton stylisé pour les choix narratifs.
+    Bouton stylisé pour les choix narratifs (style : QPushButton#choiceButton).
     """
 
     def __init__(self, text: str, index: int, parent=None):
         super().__init__(text, parent)
+        self.setObjectName("choiceButton")
         self.index = index  # Stocke l'index du choix pour le moteur
         self.setCursor(Qt.PointingHandCursor)
-        self.setStyleSheet("""
-            QPushButton {
-                background-color: rgba(0, 0, 0, 0.7);
-                color: white;
-                border: 1px solid #555;
-                padding: 10px;
-                font-size: 16px;
-                border-radius: 5px;
-                text-align: left;
-            }
-            QPushButton:hover {
-                background-color: rgba(50, 50, 150, 0.8);
-                border-color: #88F;
-            }
-        """)
+
+    def bind(self, text: str, index: int):
+        """Réaffecte le bouton à un autre choix (recyclage)."""
+        if text != self.text():
+            self.setText(text)
+        self.index = index
+
+
+class ChoiceList(QWidget):
+    """
+    Liste des choix du nœud courant.
+    Les boutons sont recyclés d'un nœud à l'autre : set_choices() réaffecte les boutons
+    existants, n'en crée que s'il en manque et masque ceux en trop (jamais détruits).
+    """
+    chosen = Signal(int)  # Index local du choix cliqué
+
+    def __init__(self, parent=None, spacing: int = -1):
+        super().__init__(parent)
+        self._layout = QVBoxLayout(self)
+        self._layout.setContentsMargins(0, 0, 0, 0)
+        self._layout.setSpacing(spacing)
+        self._buttons: List[ChoiceButton] = []
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def set_choices(self, texts: List[str]):
+        # Les boutons en trop sont masqués avant l'affichage des nouveaux : une seule mise en page
+        for button in self._buttons[len(texts):self._count]:
+            button.hide()
+        for index, text in enumerate(texts):
+            if index < len(self._buttons):
+                button = self._buttons[index]
+                button.bind(text, index)
+            else:
+                button = ChoiceButton(text, index, self)
+                button.clicked.connect(lambda checked=False, b=button: self.chosen.emit(b.index))
+                self._layout.addWidget(button)
+                self._buttons.append(button)
+            button.show()
+        self._count = len(texts)
+
+    def clear(self):
+        self.set_choices([])
 
 
 class SceneView(QLabel):
     """
     Widget de fond qui gère l'image d'arrière-plan.
-    Utilise QLabel avec scaledContents pour s'adapter à la fenêtre.
+    L'image est décodée hors du thread de l'UI (ImagePipeline) à la taille du widget :
+    paintEvent ne fait qu'une copie, sans remise à l'échelle. Pendant un redimensionnement,
+    l'image courante est étirée jusqu'à ce que la version à la bonne taille arrive.
     """
+    RESIZE_DELAY_MS = 120  # Re-décodage à la nouvelle taille une fois le redimensionnement fini
 
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, pipeline: ImagePipeline = None):
         super().__init__(parent)
-        self.setScaledContents(True)
-        self.setStyleSheet("background-color: #222;")  # Couleur par défaut si pas d'image
\ No newline at end of file
+        self.setStyleSheet("background-color: #222;")  # Couleur par défaut si pas d'image
+        self.pipeline = pipeline or ImagePipeline(parent=self)
+        self.pipeline.imageReady.connect(self._on_image_ready)
+        self.resolution = QSize(1280, 720)  # Taille de repli avant le premier affichage (meta.resolution)
+
+        self.image_path: Optional[str] = None
+        self._pixmap: Optional[QPixmap] = None
+        self._pixmap_key = None  # Clé du pipeline de l'image affichée
+        self._wanted = None  # Clé attendue du pipeline
+
+        self._resize_timer = QTimer(self)
+        self._resize_timer.setSingleShot(True)
+        self._resize_timer.setInterval(self.RESIZE_DELAY_MS)
+        self._resize_timer.timeout.connect(self._request)
+
+    def target_size(self) -> QSize:
+        """Taille de décodage en pixels physiques."""
+        size = self.size() if self.isVisible() else self.resolution
+        ratio = self.devicePixelRatioF()
+        return QSize(max(1, round(size.width() * ratio)), max(1, round(size.height() * ratio)))
+
+    def show_image(self, path: Optional[str]):
+        """Affiche l'image (chemin absolu). Même image que l'actuelle : rien à faire."""
+        if path == self.image_path:
+            return
+        self.image_path = path
+        if path is None:
+            self._wanted = None
+            self._set_pixmap(None)
+            return
+        self._request()
+
+    def prefetch(self, paths: List[str]):
+        """Décode à l'avance les images des nœuds suivants (remplace la file précédente)."""
+        self.pipeline.prefetch(paths, self.target_size())
+
+    def _request(self):
+        if self.image_path is None:
+            return
+        size = self.target_size()
+        self._wanted = ImagePipeline.key(self.image_path, size)
+        if self._pixmap_key == self._wanted:
+            return
+        pixmap = self.pipeline.request(self.image_path, size)
+        if pixmap is not None:
+            self._set_pixmap(pixmap)
+        # Sinon l'image précédente reste affichée jusqu'à _on_image_ready
+
+    def _on_image_ready(self, key, pixmap: QPixmap):
+        if key == self._wanted:
+            self._set_pixmap(pixmap)
+
+    def _set_pixmap(self, pixmap: Optional[QPixmap]):
+        self._pixmap = pixmap
+        self._pixmap_key = self._wanted if pixmap is not None else None
+        self.update()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        if self.image_path is not None:
+            self._resize_timer.start()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        # La taille réelle peut différer de la résolution de repli
+        if self.image_path is not None and self._pixmap_key != ImagePipeline.key(self.image_path, self.target_size()):
+            self._request()
+
+    def paintEvent(self, event):
+        super().paintEvent(event)  # Fond de la feuille de style
+        if self._pixmap is None:
+            return
+        painter = QPainter(self)
+        painter.setClipRect(event.rect())
+        painter.drawPixmap(self.rect(), self._pixmap)
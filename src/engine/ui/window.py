@@ -1,12 +1,12 @@
-from PySide6.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QFrame, QHBoxLayout, QLabel
+from PySide6.QtWidgets import QApplication, QMainWindow, QWidget, QVBoxLayout, QFrame, QHBoxLayout, QLabel
 from PySide6.QtCore import Qt, Slot
-from PySide6.QtGui import QPixmap, QKeyEvent
+from PySide6.QtGui import QKeyEvent
 from src.engine.core import GameEngine
-from src.engine.ui.widgets import TypewriterLabel, ChoiceButton, SceneView
+from src.engine.prefetch import ASSET_BACKGROUND
+from src.engine.ui.widgets import TypewriterLabel, ChoiceList, SceneView, CHOICE_STYLESHEET
 from src.common.models import NodeModel
 from src.common.constants import NodeType
 from src.common.paths import get_assets_path
-import os
 
 
 class GameWindow(QMainWindow):
@@ -21,12 +21,22 @@ class GameWindow(QMainWindow):
         self.setWindowTitle("Visual Novel Player")
         self.resize(1280, 720)
 
+        # Style des choix posé une fois pour toute l'application (sauf feuille déjà fournie par l'hôte)
+        app = QApplication.instance()
+        if not app.styleSheet():
+            app.setStyleSheet(CHOICE_STYLESHEET)
+
         # Connexions Moteur -> UI
         self.engine.nodeChanged.connect(self.on_node_changed)
         self.engine.gameEnded.connect(self.close)
 
         self._setup_ui()
 
+        # Préchargement des fonds des nœuds suivants
+        assets = get_assets_path()
+        self.engine.session.prefetcher.warmers[ASSET_BACKGROUND] = \
+            lambda files: self.scene_view.prefetch([str(assets / f) for f in files])
+
     def _setup_ui(self):
         """Construction de l'interface en couches."""
         self.central_widget = QWidget()
@@ -52,9 +62,8 @@ class GameWindow(QMainWindow):
         self.scene_layout.addStretch()  # Pousse tout vers le bas
 
         # 2. Zone de Choix (Apparaît au milieu/bas)
-        self.choice_container = QWidget()
-        self.choice_layout = QVBoxLayout(self.choice_container)
-        self.choice_layout.setSpacing(10)
+        self.choice_container = ChoiceList(spacing=10)
+        self.choice_container.chosen.connect(self.engine.select_choice)
         self.scene_layout.addWidget(self.choice_container)
 
         # 3. Boite de Dialogue (En bas)
@@ -84,9 +93,8 @@ class GameWindow(QMainWindow):
         """Mise à jour de l'UI quand le noeud change."""
         # 1. Background
         if node.content.background_image:
-            bg_path = get_assets_path() / node.content.background_image
-            if os.path.exists(bg_path):
-                self.scene_view.setPixmap(QPixmap(str(bg_path)))
+            # Décodage en arrière-plan ; même image que l'actuelle : aucun travail
+            self.scene_view.show_image(str(get_assets_path() / node.content.background_image))
 
         # 2. Gestion Dialogue vs Choix
         if node.type == NodeType.DIALOGUE:
@@ -102,15 +110,10 @@ class GameWindow(QMainWindow):
             # On garde souvent le texte du dernier dialogue affiché,
             # ou on affiche le texte de la question si le noeud Choice en a.
             # Ici, on affiche les boutons.
-            self._clear_choices()
-
-            for i, choice_data in enumerate(node.content.choices):
-                # On vérifie la condition ici ou on laisse le moteur filtrer?
-                # Le moteur filtre souvent avant, mais ici on le fait à l'affichage si on veut griser.
-                # Pour l'instant, on affiche tout ce que le modèle contient.
-                btn = ChoiceButton(choice_data.get("text", "Choix..."), i)
-                btn.clicked.connect(lambda checked=False, idx=i: self.engine.select_choice(idx))
-                self.choice_layout.addWidget(btn)
+            # On vérifie la condition ici ou on laisse le moteur filtrer?
+            # Le moteur filtre souvent avant, mais ici on le fait à l'affichage si on veut griser.
+            # Pour l'instant, on affiche tout ce que le modèle contient (boutons recyclés).
+            self.choice_container.set_choices([choice.text or "Choix..." for choice in node.content.choices])
 
             self.choice_container.show()
             # On peut cacher la boite de dialogue ou l'utiliser pour poser la question
@@ -120,13 +123,6 @@ class GameWindow(QMainWindow):
             else:
                 self.dialogue_box.hide()
 
-    def _clear_choices(self):
-        while self.choice_layout.count():
-            item = self.choice_layout.takeAt(0)
-            widget = item.widget()
-            if widget:
-                widget.deleteLater()
-
     def on_scene_click(self, event):
         """Gestion du clic pour avancer le texte ou le dialogue."""
         current_node = self.engine.flow.get_node(self.engine.state.current_node_id)
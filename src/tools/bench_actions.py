@@ -0,0 +1,94 @@
+"""
+Micro-benchmark de l'entrée dans un nœud chargé d'actions :
+chaîne if/elif historique (params relus à chaque passage) vs registre d'actions compilées.
+
+Usage :
+    python -m src.tools.bench_actions --actions 50 --iterations 20000
+"""
+import argparse
+import time
+
+from src.common.models import ProjectModel, NodeModel, NodeContentModel, ActionModel
+from src.common.constants import ActionType, NodeType
+from src.engine.state import SessionState
+from src.engine.flow import FlowManager
+from src.engine.log import log
+
+TEMPLATES = [
+    (ActionType.ADD_ITEM, {"item_id": "potion", "qty": "2"}),
+    (ActionType.REMOVE_ITEM, {"item_id": "potion", "qty": 1}),
+    (ActionType.NPC_STATUS, {"npc_id": "Cyndra", "status": "follow"}),
+    (ActionType.NPC_SPAWN, {"npc_id": "Garde"}),
+]
+
+
+def legacy_execute(state: SessionState, action: ActionModel):
+    """Copie de l'ancien FlowManager._execute_action (sans le print par action)."""
+    p = action.params
+
+    if action.type == ActionType.ADD_ITEM:
+        item_id = p.get("item_id")
+        qty = int(p.get("qty", 1))
+        if item_id:
+            state.add_item(item_id, qty)
+
+    elif action.type == ActionType.REMOVE_ITEM:
+        item_id = p.get("item_id")
+        qty = int(p.get("qty", 1))
+        if item_id:
+            state.remove_item(item_id, qty)
+
+    elif action.type == ActionType.NPC_SPAWN:
+        npc_id = p.get("npc_id")
+        if npc_id:
+            state.update_npc(npc_id, {"spawned": True, "location": state.current_node_id})
+
+    elif action.type == ActionType.NPC_STATUS:
+        npc_id = p.get("npc_id")
+        status = p.get("status", "fixed")
+        if npc_id:
+            state.update_npc(npc_id, {"status": status})
+
+
+def build_project(action_count: int) -> ProjectModel:
+    actions = [ActionModel(type=kind, params=dict(params))
+               for kind, params in (TEMPLATES[i % len(TEMPLATES)] for i in range(action_count))]
+    node = NodeModel(id="scene", type=NodeType.SCENE, title="Scène", content=NodeContentModel(actions=actions))
+    return ProjectModel(nodes={"scene": node}, start_node_id="scene")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmark des actions de nœud.")
+    parser.add_argument("--actions", type=int, default=50)
+    parser.add_argument("--iterations", type=int, default=20_000)
+    args = parser.parse_args()
+
+    log.disable()
+    project = build_project(args.actions)
+    state = SessionState()
+    flow = FlowManager(project, state)
+    state.initialize_from_project(project, flow.graph)
+    index = flow.graph.start_index
+    models = flow.graph.nodes[index].actions
+    compiled = flow.node_actions[index]
+
+    t0 = time.perf_counter()
+    for _ in range(args.iterations):
+        for action in models:
+            legacy_execute(state, action)
+    t_legacy = time.perf_counter() - t0
+
+    state.initialize_from_project(project, flow.graph)
+    t0 = time.perf_counter()
+    for _ in range(args.iterations):
+        flow._run_actions(compiled)
+    t_registry = time.perf_counter() - t0
+
+    per_entry = 1e6 / args.iterations
+    print(f"[Bench] Entrée dans un nœud de {args.actions} actions, {args.iterations} fois")
+    print(f"  if/elif + params relus : {t_legacy * per_entry:9.2f} µs / entrée")
+    print(f"  registre compilé       : {t_registry * per_entry:9.2f} µs / entrée ({t_legacy / t_registry:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark des transitions de nœuds à nombreux choix (rendu offscreen) :
+ancien lecteur (boutons détruits puis recréés, une feuille de style par bouton)
+vs ChoiceList (boutons recyclés, style posé sur l'application).
+
+Chaque pas affiche les choix d'un nouveau nœud puis traite les événements
+(destruction différée, polissage du style, mise en page, peinture).
+
+Usage :
+    QT_QPA_PLATFORM=offscreen python -m src.tools.bench_choices --nodes 300 --choices 20
+"""
+import argparse
+import random
+import time
+
+from PySide6.QtWidgets import QApplication, QPushButton, QVBoxLayout, QWidget
+
+from src.engine.ui.widgets import ChoiceList, CHOICE_STYLESHEET
+
+LEGACY_STYLE = """
+    QPushButton { background-color: rgba(255, 255, 255, 0.05); border: 1px solid #555; color: #b1a270; padding: 12px; text-align: left; }
+    QPushButton:hover { background-color: rgba(255, 255, 255, 0.1); border-color: #b1a270; color: white; }
+"""
+
+
+class LegacyChoices(QWidget):
+    """Copie de l'ancien GameWindow._build_choices."""
+
+    def __init__(self):
+        super().__init__()
+        self.choices_layout = QVBoxLayout(self)
+
+    def set_choices(self, texts):
+        while self.choices_layout.count():
+            item = self.choices_layout.takeAt(0)
+            if item.widget(): item.widget().deleteLater()
+        for i, text in enumerate(texts):
+            btn = QPushButton(text)
+            btn.setStyleSheet(LEGACY_STYLE)
+            btn.clicked.connect(lambda checked=False, idx=i: None)
+            self.choices_layout.addWidget(btn)
+
+
+def make_nodes(count: int, choices: int, seed: int = 1):
+    rng = random.Random(seed)
+    return [[f"Choix {n}.{i} : aller vers la salle {rng.randint(0, 999)}" for i in range(rng.randint(choices // 2, choices))]
+            for n in range(count)]
+
+
+def run(widget, nodes):
+    widget.resize(900, 1400)
+    widget.show()
+    QApplication.processEvents()
+    worst = 0.0
+    t0 = time.perf_counter()
+    for texts in nodes:
+        t = time.perf_counter()
+        widget.set_choices(texts)
+        QApplication.processEvents()
+        worst = max(worst, time.perf_counter() - t)
+    return time.perf_counter() - t0, worst
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark des transitions à nombreux choix.")
+    parser.add_argument("--nodes", type=int, default=300)
+    parser.add_argument("--choices", type=int, default=20)
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication([])
+    nodes = make_nodes(args.nodes, args.choices)
+
+    legacy_total, legacy_worst = run(LegacyChoices(), nodes)
+    app.setStyleSheet(CHOICE_STYLESHEET)
+    pooled_total, pooled_worst = run(ChoiceList(), nodes)
+
+    print(f"[Bench] {args.nodes} nœuds, jusqu'à {args.choices} choix par nœud")
+    print(f"{'':20}{'total':>10}{'par nœud':>12}{'pire nœud':>12}")
+    for label, total, worst in (("Recréation", legacy_total, legacy_worst),
+                                ("ChoiceList", pooled_total, pooled_worst)):
+        print(f"  {label:18}{total:8.2f} s{total / args.nodes * 1000:9.3f} ms{worst * 1000:9.3f} ms")
+    print(f"  gain : {legacy_total / pooled_total:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark des liens (choix) du graphe de l'éditeur (offscreen) :
+construction en bloc des liens d'un projet, puis déplacement d'un nœud.
+
+  - construction : nœuds ajoutés à la scène un par un, liens créés au fil de l'eau
+                   (un choix dont la cible n'est pas encore là est relié à son arrivée)
+  - déplacement  : un nœud déplacé, liens mis à jour (index d'adjacence vs recalcul de
+                   tous les chemins, ce que ferait une scène sans index)
+
+Usage :
+    QT_QPA_PLATFORM=offscreen python -m src.tools.bench_edges --nodes 10000 --choices 3
+"""
+import argparse
+import time
+
+from PySide6.QtWidgets import QApplication
+from PySide6.QtCore import QPointF
+
+from src.common.models import ProjectModel
+from src.editor.graph.nodes import NodeItem
+from src.editor.graph.scene import NodeScene
+from src.tools.story_generator import generate_project_data
+
+
+def build(project: ProjectModel):
+    scene = NodeScene()
+    t = time.perf_counter()
+    for model in project.nodes.values():
+        scene.addItem(NodeItem(model))
+    return scene, time.perf_counter() - t
+
+
+def recompute_all(scene: NodeScene):
+    """Sans index : chaque lien est recalculé à partir de ses deux nœuds."""
+    for edges in scene.outgoing.values():
+        for edge in edges:
+            source, target = scene.node_items[edge.source_id], scene.node_items[edge.target_id]
+            edge.update_positions(source.output_anchor(edge.slot), target.input_anchor())
+
+
+def drag_ms(scene: NodeScene, item: NodeItem, repeat: int, full: bool) -> float:
+    origin = item.pos()
+    t = time.perf_counter()
+    for i in range(repeat):
+        item.setPos(origin + QPointF(i % 7, i % 5))
+        if full:
+            recompute_all(scene)
+    return (time.perf_counter() - t) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark des liens du graphe de l'éditeur.")
+    parser.add_argument("--nodes", type=int, default=10000)
+    parser.add_argument("--choices", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication([])
+    project = ProjectModel.model_validate(generate_project_data(args.nodes, choices_per_node=args.choices))
+
+    scene, elapsed = build(project)
+    edges = sum(len(e) for e in scene.outgoing.values())
+    print(f"[Bench] {args.nodes} nœuds, {edges} liens")
+    print(f"  construction           {elapsed:8.2f} s ({elapsed / (args.nodes + edges) * 1e6:.0f} µs par item)")
+
+    item = max(scene.node_items.values(), key=lambda it: len(scene.incoming.get(it.model.id, ())))
+    degree = len(scene.outgoing.get(item.model.id, ())) + len(scene.incoming.get(item.model.id, ()))
+    full = drag_ms(scene, item, max(args.repeat // 10, 2), full=True)
+    incremental = drag_ms(scene, item, args.repeat, full=False)
+    print(f"  déplacement ({degree} liens attachés)")
+    print(f"    tous les chemins     {full:8.2f} ms")
+    print(f"    index d'adjacence    {incremental:8.3f} ms")
+    print(f"    gain : {full / incremental:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
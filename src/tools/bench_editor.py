@@ -0,0 +1,109 @@
+"""
+Benchmark du rendu du graphe de l'éditeur (rendu offscreen) :
+ancien mode (QTimer 200 ms -> scene.update() + FullViewportUpdate) vs rendu piloté
+par les événements (node_changed() + MinimalViewportUpdate).
+
+Mesures, pour chaque taille de projet :
+  - image complète : repeint de toute la vue (zoom arrière, plusieurs centaines de nœuds visibles)
+  - édition        : un titre modifié puis affiché
+  - déplacement    : un nœud déplacé puis affiché
+  - CPU au repos   : temps CPU consommé par la boucle d'événements sans interaction
+
+Usage :
+    QT_QPA_PLATFORM=offscreen python -m src.tools.bench_editor --nodes 1000 10000
+"""
+import argparse
+import time
+
+from PySide6.QtWidgets import QApplication, QGraphicsView
+from PySide6.QtCore import QEventLoop, QPointF, QTimer
+
+from src.common.models import ProjectModel
+from src.editor.graph.nodes import NodeItem
+from src.editor.graph.scene import NodeScene
+from src.editor.graph.view import NodeGraphView
+from src.tools.story_generator import generate_project_data
+
+LEGACY_REFRESH_MS = 200
+
+
+def build(project: ProjectModel, legacy: bool):
+    scene = NodeScene()
+    for model in project.nodes.values():
+        scene.addItem(NodeItem(model))
+    view = NodeGraphView(scene)
+    view.resize(1600, 900)
+    view.scale(0.3, 0.3)
+    view.centerOn(QPointF(0, 0))
+    timer = None
+    if legacy:
+        view.setViewportUpdateMode(QGraphicsView.FullViewportUpdate)
+        timer = QTimer(view)
+        timer.timeout.connect(scene.update)
+        timer.start(LEGACY_REFRESH_MS)
+    view.show()
+    QApplication.processEvents()
+    return scene, view, timer
+
+
+def _mean_ms(fn, repeat: int) -> float:
+    t = time.perf_counter()
+    for i in range(repeat):
+        fn(i)
+        QApplication.processEvents()
+    return (time.perf_counter() - t) / repeat * 1000
+
+
+def idle_cpu(seconds: float) -> float:
+    """Pourcentage d'un cœur consommé par la boucle d'événements au repos."""
+    loop = QEventLoop()
+    QTimer.singleShot(int(seconds * 1000), loop.quit)
+    cpu, wall = time.process_time(), time.perf_counter()
+    loop.exec()
+    return (time.process_time() - cpu) / (time.perf_counter() - wall) * 100
+
+
+def measure(project: ProjectModel, legacy: bool, repeat: int, idle_seconds: float):
+    scene, view, timer = build(project, legacy)
+    item = view.itemAt(view.viewport().rect().center())
+    item = item if isinstance(item, NodeItem) else next(iter(scene.node_items.values()))
+
+    full = _mean_ms(lambda i: view.viewport().repaint(), repeat)
+
+    def edit(i):
+        item.model.title = f"Titre {i}"
+        if legacy:
+            scene.update()  # Ce que fait le tick du timer
+        else:
+            scene.node_changed(item.model.id)
+    edit_ms = _mean_ms(edit, repeat)
+
+    origin = item.pos()
+    move_ms = _mean_ms(lambda i: item.setPos(origin + QPointF(i % 7, i % 5)), repeat)
+
+    cpu = idle_cpu(idle_seconds)
+    if timer is not None:
+        timer.stop()
+    view.close()
+    return full, edit_ms, move_ms, cpu
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du rendu du graphe de l'éditeur.")
+    parser.add_argument("--nodes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--repeat", type=int, default=30)
+    parser.add_argument("--idle", type=float, default=3.0, help="Durée de la mesure au repos (s)")
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication([])
+
+    print(f"{'':28}{'image':>10}{'édition':>10}{'déplac.':>10}{'CPU repos':>11}")
+    for count in args.nodes:
+        project = ProjectModel.model_validate(generate_project_data(count))
+        for label, legacy in (("timer + FullViewport", True), ("événements", False)):
+            full, edit_ms, move_ms, cpu = measure(project, legacy, args.repeat, args.idle)
+            print(f"  {count:>6} {label:20}{full:8.2f}ms{edit_ms:8.2f}ms{move_ms:8.2f}ms{cpu:9.1f} %")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""
+Benchmark de FlowManager.advance() : graphe compilé vs parcours Pydantic historique.
+Les deux boucles font le même travail (conditions, SET_VAR, actions, NodeModel renvoyé) ;
+la mémoire est la mémoire résidente (RSS) gagnée par chaque étape de chargement.
+
+Usage :
+    python -m src.tools.bench_flow --nodes 100000 --steps 200000
+"""
+import argparse
+import gc
+import os
+import random
+import time
+from typing import Optional
+
+from src.common.models import ActionModel, NodeModel, ProjectModel
+from src.common.constants import ActionType, NodeType, VarOperation
+from src.engine.flow import FlowManager
+from src.engine.runtime import compile_project
+from src.engine.scripting import ScriptEngine
+from src.engine.state import SessionState
+from src.tools.story_generator import generate_project_data
+
+
+class LegacyFlow:
+    """Reproduction du chemin historique (lookups UUID sur les NodeModel Pydantic)."""
+
+    def __init__(self, project: ProjectModel):
+        self.project = project
+        self.script_engine = ScriptEngine()
+        self.variables = {name: v.default_value for name, v in project.variables.items()}
+        self.current_node_id = project.start_node_id
+        self.history = []
+        self.inventory = {}
+        self.npcs = {}
+
+    def advance(self, choice_index: int = -1) -> Optional[NodeModel]:
+        current_node = self.project.nodes.get(self.current_node_id)
+        if not current_node:
+            return None
+
+        next_node_id = None
+        if current_node.type == NodeType.SCENE:
+            if 0 <= choice_index < len(current_node.content.choices):
+                choice = current_node.content.choices[choice_index]
+                if choice.condition:
+                    if not self.script_engine.evaluate_condition(choice.condition, self.variables):
+                        return current_node
+                next_node_id = choice.target_node_id
+        elif current_node.type == NodeType.SET_VAR:
+            content = current_node.content
+            value = int(self.script_engine.evaluate_expression(content.value, self.variables))
+            current = self.variables.get(content.variable_name, 0)
+            if content.operation == VarOperation.SET:
+                current = value
+            elif content.operation == VarOperation.ADD:
+                current += value
+            elif content.operation == VarOperation.SUB:
+                current -= value
+            self.variables[content.variable_name] = current
+            if current_node.outputs:
+                next_node_id = current_node.outputs[0].get("target_node_id")
+
+        if next_node_id:
+            self.current_node_id = next_node_id
+            self.history.append(next_node_id)
+            next_node = self.project.nodes.get(next_node_id)
+            if next_node and next_node.type == NodeType.SCENE:
+                for action in next_node.content.actions:
+                    self._execute_action(action)
+            if next_node and next_node.type == NodeType.SET_VAR:
+                return self.advance()
+            return next_node
+        return None
+
+    def _execute_action(self, action: ActionModel):
+        """Aiguillage historique des actions (sans le print)."""
+        p = action.params
+        if action.type == ActionType.ADD_ITEM:
+            item_id = p.get("item_id")
+            if item_id:
+                self.inventory[item_id] = self.inventory.get(item_id, 0) + int(p.get("qty", 1))
+        elif action.type == ActionType.REMOVE_ITEM:
+            item_id = p.get("item_id")
+            if item_id:
+                self.inventory[item_id] = max(0, self.inventory.get(item_id, 0) - int(p.get("qty", 1)))
+        elif action.type == ActionType.NPC_SPAWN:
+            npc_id = p.get("npc_id")
+            if npc_id:
+                self.npcs.setdefault(npc_id, {}).update({"spawned": True, "location": self.current_node_id})
+        elif action.type == ActionType.NPC_STATUS:
+            npc_id = p.get("npc_id")
+            if npc_id:
+                self.npcs.setdefault(npc_id, {}).update({"status": p.get("status", "fixed")})
+
+
+def _rss() -> Optional[int]:
+    """Mémoire résidente du processus en octets (Linux : /proc ; ailleurs, pic via resource ; None sinon)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    except ImportError:
+        return None
+
+
+def _measure(label: str, fn):
+    gc.collect()
+    before = _rss()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    after = _rss()
+    memory = f"{(after - before) / (1024 * 1024):8.1f} Mo RSS" if before is not None else "     RSS n/d"
+    print(f"  {label:<28} {elapsed * 1000:9.1f} ms   {memory}")
+    return result
+
+
+def _run_compiled(flow: FlowManager, state: SessionState, steps: int, seed: int) -> float:
+    rng = random.Random(seed)
+    start_index = flow.graph.start_index
+    t0 = time.perf_counter()
+    for _ in range(steps):
+        if flow.advance(rng.randrange(3)) is None:
+            state.current_index = start_index
+    return time.perf_counter() - t0
+
+
+def _run_legacy(flow: LegacyFlow, steps: int, seed: int) -> float:
+    rng = random.Random(seed)
+    start_id = flow.project.start_node_id
+    t0 = time.perf_counter()
+    for _ in range(steps):
+        if flow.advance(rng.randrange(3)) is None:
+            flow.current_node_id = start_id
+    return time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark FlowManager.advance().")
+    parser.add_argument("--nodes", type=int, default=100_000)
+    parser.add_argument("--steps", type=int, default=200_000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    print(f"[Bench] Génération de {args.nodes} nœuds...")
+    data = generate_project_data(args.nodes, seed=args.seed)
+
+    print("[Bench] Chargement (mémoire résidente gagnée)")
+    project = _measure("ProjectModel (Pydantic)", lambda: ProjectModel(**data))
+    graph = _measure("compile_project", lambda: compile_project(project))
+
+    state = SessionState()
+    state.initialize_from_project(project, graph)
+    flow = FlowManager(project, state, graph)
+    legacy = LegacyFlow(project)
+
+    print(f"[Bench] advance() x {args.steps}")
+    t_legacy = _run_legacy(legacy, args.steps, args.seed)
+    t_compiled = _run_compiled(flow, state, args.steps, args.seed)
+    print(f"  {'Pydantic (historique)':<28} {args.steps / t_legacy:12,.0f} advance/s")
+    print(f"  {'Graphe compilé':<28} {args.steps / t_compiled:12,.0f} advance/s")
+    print(f"  Gain x{t_legacy / t_compiled:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark de la grille de fond de l'éditeur (rendu offscreen, scène vide) :
+ancienne grille (un QLineF par ligne de 20 unités à chaque repeint) vs tuile en cache
+adaptée au zoom.
+
+Usage :
+    QT_QPA_PLATFORM=offscreen python -m src.tools.bench_grid --zoom 2 1 0.3 0.1 0.02
+"""
+import argparse
+import math
+import time
+
+from PySide6.QtWidgets import QApplication
+from PySide6.QtGui import QPen
+from PySide6.QtCore import QLineF
+
+from src.editor.graph.scene import NodeScene
+from src.editor.graph.view import NodeGraphView
+
+
+class LegacyGridScene(NodeScene):
+    """Copie de l'ancien drawBackground."""
+
+    def drawBackground(self, painter, rect):
+        painter.fillRect(rect, self.backgroundBrush())
+        left = int(math.floor(rect.left()))
+        right = int(math.ceil(rect.right()))
+        top = int(math.floor(rect.top()))
+        bottom = int(math.ceil(rect.bottom()))
+        first_left = left - (left % self.grid_size)
+        first_top = top - (top % self.grid_size)
+        lines_light = []
+        lines_dark = []
+        for x in range(first_left, right, self.grid_size):
+            line = QLineF(x, top, x, bottom)
+            if x % (self.grid_size * 5) == 0:
+                lines_dark.append(line)
+            else:
+                lines_light.append(line)
+        for y in range(first_top, bottom, self.grid_size):
+            line = QLineF(left, y, right, y)
+            if y % (self.grid_size * 5) == 0:
+                lines_dark.append(line)
+            else:
+                lines_light.append(line)
+        painter.setPen(QPen(self.grid_color_light, 1))
+        painter.drawLines(lines_light)
+        painter.setPen(QPen(self.grid_color_dark, 2))
+        painter.drawLines(lines_dark)
+
+
+def frame_ms(scene_class, zoom: float, frames: int) -> float:
+    scene = scene_class()
+    view = NodeGraphView(scene)
+    view.resize(1600, 900)
+    view.scale(zoom, zoom)
+    view.centerOn(0, 0)
+    view.show()
+    QApplication.processEvents()
+    t = time.perf_counter()
+    for _ in range(frames):
+        view.viewport().repaint()
+    elapsed = (time.perf_counter() - t) / frames * 1000
+    view.close()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de la grille de fond.")
+    parser.add_argument("--zoom", type=float, nargs="+", default=[2.0, 1.0, 0.3, 0.1, 0.02])
+    parser.add_argument("--frames", type=int, default=20)
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication([])
+    print(f"[Bench] Repeint complet d'une vue 1600x900 ({args.frames} images)")
+    print(f"{'':14}{'ancienne':>12}{'tuile':>12}")
+    for zoom in args.zoom:
+        legacy = frame_ms(LegacyGridScene, zoom, args.frames)
+        cached = frame_ms(NodeScene, zoom, args.frames)
+        print(f"  zoom {zoom:<7}{legacy:9.2f} ms{cached:9.2f} ms   {legacy / cached:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
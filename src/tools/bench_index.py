@@ -0,0 +1,82 @@
+"""
+Benchmark de l'index du projet de l'éditeur (ProjectIndex) :
+construction, mise à jour après une édition, requêtes.
+
+Les requêtes sont comparées à un parcours de tous les nœuds (ce qu'il fallait faire
+sans index) : liens entrants d'un nœud, nœud par titre, usages d'une variable.
+
+Usage :
+    python -m src.tools.bench_index --nodes 50000
+"""
+import argparse
+import random
+import time
+
+from src.common.models import ProjectModel
+from src.editor.project_index import ProjectIndex, expression_names
+from src.tools.story_generator import generate_project_data
+
+
+def _us(fn, repeat: int) -> float:
+    t = time.perf_counter()
+    for i in range(repeat):
+        fn(i)
+    return (time.perf_counter() - t) / repeat * 1e6
+
+
+def scan_backlinks(project: ProjectModel, node_id: str):
+    return [(n.id, slot) for n in project.nodes.values()
+            for slot, c in enumerate(n.content.choices) if c.target_node_id == node_id]
+
+
+def scan_title(project: ProjectModel, title: str):
+    return [n.id for n in project.nodes.values() if n.title.lower() == title.lower()]
+
+
+def scan_variable(project: ProjectModel, name: str):
+    return [n.id for n in project.nodes.values()
+            if n.content.variable_name == name or any(name in expression_names(c.condition) for c in n.content.choices)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de l'index du projet.")
+    parser.add_argument("--nodes", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=1000)
+    args = parser.parse_args()
+
+    project = ProjectModel.model_validate(generate_project_data(args.nodes))
+    ids = list(project.nodes)
+    rng = random.Random(1)
+    sample = [rng.choice(ids) for _ in range(args.repeat)]
+
+    t = time.perf_counter()
+    index = ProjectIndex(project)
+    build = time.perf_counter() - t
+
+    def edit(i):
+        node = project.nodes[sample[i]]
+        node.title = f"Renommé {i}"
+        if node.content.choices:
+            node.content.choices[0].target_node_id = sample[-1 - i]
+            node.content.choices[0].condition = f"gold > {i}"
+        index.node_changed(node.id)
+    update = _us(edit, args.repeat)
+
+    queries = [
+        ("liens entrants", lambda i: index.backlinks(sample[i]), lambda i: scan_backlinks(project, sample[i])),
+        ("nœud par titre", lambda i: index.find_by_title(f"Passage {i}"), lambda i: scan_title(project, f"Passage {i}")),
+        ("usages de 'hp'", lambda i: index.variable_usage("hp"), lambda i: scan_variable(project, "hp")),
+    ]
+
+    print(f"[Bench] {args.nodes} nœuds")
+    print(f"  construction            {build * 1000:10.1f} ms")
+    print(f"  mise à jour d'un nœud   {update:10.1f} µs")
+    print(f"  {'requête':22}{'parcours':>12}{'index':>12}")
+    for label, indexed, scan in queries:
+        scan_us = _us(scan, max(args.repeat // 100, 3))
+        indexed_us = _us(indexed, args.repeat)
+        print(f"  {label:22}{scan_us / 1000:9.1f} ms{indexed_us:9.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
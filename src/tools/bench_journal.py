@@ -0,0 +1,88 @@
+"""
+Benchmark du journal des éditions (EditJournal) : coût d'une entrée sur le thread
+de l'UI (frappe dans le panneau de propriétés, déplacement d'un nœud), compactage,
+et reprise (relecture du fichier de base + rejeu des entrées).
+
+Usage :
+    python -m src.tools.bench_journal --nodes 50000 --entries 20000
+"""
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from src.common.models import ProjectModel
+from src.editor.journal import EditJournal
+from src.editor.project_io import ProjectSaver
+from src.tools.story_generator import generate_project_data
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du journal des éditions.")
+    parser.add_argument("--nodes", type=int, default=50000)
+    parser.add_argument("--entries", type=int, default=20000)
+    args = parser.parse_args()
+
+    project = ProjectModel.model_validate(generate_project_data(args.nodes))
+    ids = list(project.nodes)
+    rng = random.Random(1)
+    sample = [rng.choice(ids) for _ in range(args.entries)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        saver = ProjectSaver(project)
+        base = tmp / "story.json"
+        saver.save(base, split=True)
+        saver.flush()
+
+        journal = EditJournal(tmp / "recovery")
+        journal.start(project, base, split=True)
+
+        # Frappe : le titre change d'un caractère, le nœud entier est journalisé
+        t = time.perf_counter()
+        for i, node_id in enumerate(sample):
+            project.nodes[node_id].title += "x"
+            journal.record_node(node_id)
+        edit_us = (time.perf_counter() - t) / args.entries * 1e6
+
+        t = time.perf_counter()
+        for i, node_id in enumerate(sample):
+            project.nodes[node_id].position = [float(i), 1.5]
+            journal.record_move(node_id)
+        move_us = (time.perf_counter() - t) / args.entries * 1e6
+
+        size = sum(p.stat().st_size for p in journal.segments())
+        journal.close()
+
+        # Reprise : base + 2 x entries entrées
+        t = time.perf_counter()
+        replayed = EditJournal(tmp / "recovery").replay()
+        replay = time.perf_counter() - t
+        same = replayed == project
+
+        # Compactage : capture des nœuds modifiés (UI), écriture (fond)
+        for node_id in sample:
+            saver.mark_dirty(node_id)
+        journal = EditJournal(tmp / "recovery")
+        journal.start(project, base, split=True)
+        t = time.perf_counter()
+        journal.checkpoint(saver, base, split=True)
+        compact_ui = time.perf_counter() - t
+        saver.flush()
+        compact_total = time.perf_counter() - t
+        remaining = len(journal.segments())
+        journal.close(discard=True)
+        saver.close()
+
+    print(f"[Bench] {args.nodes} nœuds, {args.entries} entrées par type")
+    print(f"  entrée nœud modifié        {edit_us:8.1f} µs")
+    print(f"  entrée déplacement         {move_us:8.1f} µs")
+    print(f"  taille du journal          {size / 1024:8.0f} Ko")
+    print(f"  reprise (base + rejeu)     {replay * 1000:8.0f} ms, identique : {'oui' if same else 'NON'}")
+    print(f"  compactage : UI {compact_ui * 1000:.1f} ms, total {compact_total * 1000:.0f} ms, "
+          f"{remaining} segment(s) restant(s)")
+
+
+if __name__ == "__main__":
+    main()
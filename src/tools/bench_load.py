@@ -0,0 +1,63 @@
+"""
+Benchmark du chargement de projet : à froid (validation Pydantic + compilation
++ écriture du cache) vs à chaud (cache binaire mappé, nœuds paresseux).
+
+Usage :
+    python -m src.tools.bench_load --sizes 10000 100000
+"""
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from src.engine.cache import load_project_cached, cache_path_for, close_project
+from src.tools.story_generator import generate_project_data
+
+
+def _timed(fn):
+    t0 = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - t0) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark chargement projet (cache compilé).")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            story = Path(tmp) / f"story_{size}.json"
+            story.write_text(json.dumps(generate_project_data(size)), encoding='utf-8')
+            print(f"[Bench] {size} nœuds ({story.stat().st_size / (1024 * 1024):.1f} Mo de JSON)")
+
+            _, t_nocache = _timed(lambda: load_project_cached(str(story), use_cache=False))
+
+            cold = []
+            for _ in range(args.runs):
+                cache_path_for(str(story)).unlink(missing_ok=True)
+                _, elapsed = _timed(lambda: load_project_cached(str(story)))
+                cold.append(elapsed)
+
+            warm = []
+            for _ in range(args.runs):
+                (project, graph, hit), elapsed = _timed(lambda: load_project_cached(str(story)))
+                assert hit
+                warm.append(elapsed)
+                if len(warm) < args.runs:
+                    close_project(project)
+
+            _, t_first = _timed(lambda: graph.node_model(graph.start_index))
+            close_project(project)
+
+            print(f"  sans cache (json + Pydantic + compile) {t_nocache:9.1f} ms")
+            print(f"  à froid (+ écriture du cache)          {min(cold):9.1f} ms")
+            print(f"  à chaud (cache mmap)                   {min(warm):9.1f} ms   gain x{t_nocache / min(warm):.1f}")
+            print(f"  premier nœud matérialisé               {t_first:9.3f} ms")
+            print(f"  taille du cache                        {cache_path_for(str(story)).stat().st_size / (1024 * 1024):9.1f} Mo")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Benchmark du déplacement de la vue (pan) sur un grand graphe (rendu offscreen) :
+ancien NodeItem (polices, dégradé et textes recréés à chaque peinture) vs NodeItem
+actuel (ressources partagées, textes préparés, cache de rendu, niveau de détail réduit).
+
+Usage :
+    QT_QPA_PLATFORM=offscreen python -m src.tools.bench_node_paint --nodes 10000
+"""
+import argparse
+import time
+
+from PySide6.QtWidgets import QApplication, QGraphicsItem
+from PySide6.QtGui import QBrush, QColor, QPen, QFont, QFontMetrics, QLinearGradient
+from PySide6.QtCore import Qt, QRectF
+
+from src.common.constants import NodeType
+from src.common.models import ProjectModel
+from src.editor.graph.nodes import NodeItem
+from src.editor.graph.scene import NodeScene
+from src.editor.graph.view import NodeGraphView
+from src.tools.story_generator import generate_project_data
+
+
+class LegacyNodeItem(NodeItem):
+    """Ancien dessin : tout est recréé à chaque paint(), sans cache ni niveau de détail."""
+
+    def __init__(self, model):
+        super().__init__(model)
+        self.setCacheMode(QGraphicsItem.NoCache)
+
+    def set_detailed(self, detailed: bool):
+        pass
+
+    def paint(self, painter, option, widget=None):
+        rect = QRectF(0, 0, self.width, self.height)
+        painter.setBrush(QColor(0, 0, 0, 100))
+        painter.setPen(Qt.NoPen)
+        painter.drawRoundedRect(rect.translated(4, 4), 8, 8)
+        painter.setBrush(QBrush(self.body_color))
+        if self.isSelected():
+            painter.setPen(QPen(QColor("#f1c40f"), 2))
+        else:
+            painter.setPen(QPen(self.border_color, 1))
+        painter.drawRoundedRect(rect, 8, 8)
+        header_rect = QRectF(0, 0, self.width, 32)
+        grad = QLinearGradient(0, 0, 0, 32)
+        grad.setColorAt(0, self.header_color.lighter(120))
+        grad.setColorAt(1, self.header_color)
+        painter.setBrush(QBrush(grad))
+        painter.setPen(Qt.NoPen)
+        painter.drawRoundedRect(header_rect, 8, 8)
+        painter.drawRect(0, 24, self.width, 8)
+        painter.setPen(QColor("#ecf0f1"))
+        font_title = QFont("Segoe UI", 10, QFont.Bold)
+        painter.setFont(font_title)
+        display_title = getattr(self.model, 'title', self.model.id[:8])
+        if self.model.type == NodeType.START:
+            display_title = f"★ {display_title}"
+        painter.drawText(header_rect, Qt.AlignCenter, display_title)
+        content_rect = QRectF(12, 40, self.width - 24, self.height - 50)
+        font_content = QFont("Consolas", 9)
+        painter.setFont(font_content)
+        if self.model.type == NodeType.SCENE:
+            painter.setPen(QColor("#bdc3c7"))
+            preview_text = self.model.content.text[:40].replace('\n', ' ')
+            if len(self.model.content.text) > 40: preview_text += "..."
+            painter.drawText(content_rect.x(), content_rect.y() + 12, preview_text)
+            painter.setPen(QPen(QColor("#333"), 1))
+            painter.drawLine(10, 65, self.width - 10, 65)
+            painter.setPen(QColor("#3498db"))
+            y_offset = 60
+            choices = self.model.content.choices
+            for i, choice in enumerate(choices[:3]):
+                choice_txt = f"[[ {choice.text} ]]"
+                metrics = QFontMetrics(font_content)
+                choice_txt = metrics.elidedText(choice_txt, Qt.ElideRight, self.width - 30)
+                painter.drawText(content_rect.x(), content_rect.y() + y_offset, choice_txt)
+                y_offset += 18
+            if len(choices) > 3:
+                painter.setPen(QColor("#555"))
+                painter.drawText(content_rect.x(), content_rect.y() + y_offset, f"... (+{len(choices) - 3})")
+        elif self.model.type == NodeType.SET_VAR:
+            painter.setPen(QColor("#2ecc71"))
+            txt = f"{self.model.content.variable_name} {self.model.content.operation} {self.model.content.value}"
+            painter.drawText(content_rect, Qt.AlignCenter, txt)
+
+
+def pan(project: ProjectModel, item_class, zoom: float, frames: int):
+    scene = NodeScene()
+    for model in project.nodes.values():
+        scene.addItem(item_class(model))
+    view = NodeGraphView(scene)
+    view.resize(1600, 900)
+    view.scale(zoom, zoom)
+    scene.set_zoom(zoom)
+    view.centerOn(6000, 4000)
+    view.show()
+    QApplication.processEvents()
+
+    bar = view.horizontalScrollBar()
+    worst = 0.0
+    t0 = time.perf_counter()
+    for i in range(frames):
+        t = time.perf_counter()
+        bar.setValue(bar.value() + (15 if (i // 40) % 2 == 0 else -15))
+        QApplication.processEvents()
+        worst = max(worst, time.perf_counter() - t)
+    total = time.perf_counter() - t0
+    view.close()
+    return total / frames * 1000, worst * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du pan sur un grand graphe.")
+    parser.add_argument("--nodes", type=int, default=10000)
+    parser.add_argument("--frames", type=int, default=120)
+    parser.add_argument("--zoom", type=float, nargs="+", default=[1.0, 0.5, 0.3, 0.15])
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication([])
+    project = ProjectModel.model_validate(generate_project_data(args.nodes))
+
+    print(f"[Bench] Pan sur {args.nodes} nœuds, {args.frames} images par zoom")
+    print(f"{'':22}{'moy. image':>12}{'pire image':>12}")
+    for zoom in args.zoom:
+        legacy = pan(project, LegacyNodeItem, zoom, args.frames)
+        current = pan(project, NodeItem, zoom, args.frames)
+        for label, (mean, worst) in (("ancien", legacy), ("NodeItem", current)):
+            print(f"  zoom {zoom:<5} {label:9}{mean:9.2f} ms{worst:9.2f} ms")
+        print(f"  gain : {legacy[0] / current[0]:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Benchmark du panneau de propriétés de l'éditeur (rendu offscreen) :
+sélection d'un nœud à nombreux choix dans un gros projet.
+
+Ancien panneau : une QComboBox remplie avec tous les nœuds du projet, pour chaque choix.
+Nouveau panneau : formulaire construit une fois et relié au nœud sélectionné,
+un NodeTargetModel partagé, tenu à jour nœud par nœud.
+Mesures : sélection (load_node + affichage), ajout d'un choix, suppression d'un choix.
+
+Usage :
+    QT_QPA_PLATFORM=offscreen python -m src.tools.bench_properties --nodes 1000 20000 --choices 10
+"""
+import argparse
+import time
+
+from PySide6.QtWidgets import (QApplication, QComboBox, QFormLayout, QFrame, QLineEdit, QTextEdit,
+                               QVBoxLayout, QWidget)
+from PySide6.QtCore import QCoreApplication, QEvent
+
+from src.common.models import ChoiceModel, ProjectModel
+from src.editor.panels.properties import PropertiesPanel
+from src.tools.story_generator import generate_project_data
+
+
+class LegacyPanel(PropertiesPanel):
+    """
+    Ancien comportement : formulaire détruit et refait à chaque sélection, ajout ou
+    suppression, avec une combo recopiée (tous les nœuds du projet) pour chaque choix.
+    """
+
+    def load_node(self, node):
+        self.current_node = node
+        self._show_groups(None)
+        previous = getattr(self, "_legacy_form", None)
+        if previous is not None:
+            previous.deleteLater()
+        form = QWidget()
+        layout = QVBoxLayout(form)
+        layout.addWidget(QLineEdit(node.title))
+        layout.addWidget(QTextEdit(node.content.text))
+        for choice in node.content.choices:
+            frame = QFrame()
+            frame_layout = QFormLayout(frame)
+            frame_layout.addRow("Texte:", QLineEdit(choice.text))
+            target_combo = QComboBox()
+            target_combo.addItem("--- (Fin / Rien) ---", None)
+            for nid, other in self.project_ref.nodes.items():
+                if nid != node.id:
+                    target_combo.addItem(f"{other.title} ({nid[:4]})", nid)
+            idx = target_combo.findData(choice.target_node_id)
+            if idx >= 0: target_combo.setCurrentIndex(idx)
+            frame_layout.addRow("Vers:", target_combo)
+            layout.addWidget(frame)
+        self.form_layout.addWidget(form)
+        self._legacy_form = form
+
+    def _add_choice(self):
+        self.current_node.content.choices.append(ChoiceModel(text="Nouveau choix"))
+        self.load_node(self.current_node)
+
+    def _delete_choice(self, index):
+        self.current_node.content.choices.pop(index)
+        self.load_node(self.current_node)
+
+
+def _ms(fn, repeat: int) -> float:
+    t = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+        QApplication.processEvents()
+        # Comme la boucle d'événements : l'ancien formulaire (deleteLater) est détruit
+        QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+    return (time.perf_counter() - t) / repeat * 1000
+
+
+def measure(panel_cls, project: ProjectModel, choices: int, repeat: int):
+    panel = panel_cls()
+    panel.set_project(project)
+    panel.resize(420, 900)
+    panel.show()
+    nodes = list(project.nodes.values())[:repeat]
+    ids = list(project.nodes)
+    for n, node in enumerate(nodes):
+        node.content.choices = [ChoiceModel(text=f"Choix {i}", target_node_id=ids[(n * 37 + i * 101) % len(ids)])
+                                for i in range(choices)]
+
+    state = iter(nodes)
+    select = _ms(lambda: panel.load_node(next(state)), len(nodes))
+    add = _ms(panel._add_choice, repeat)
+    delete = _ms(lambda: panel._delete_choice(0), repeat)
+    panel.close()
+    return select, add, delete
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du panneau de propriétés.")
+    parser.add_argument("--nodes", type=int, nargs="+", default=[1000, 20000])
+    parser.add_argument("--choices", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication([])
+
+    print(f"[Bench] nœuds à {args.choices} choix")
+    print(f"{'':30}{'sélection':>11}{'ajout':>10}{'suppr.':>10}")
+    for count in args.nodes:
+        project = ProjectModel.model_validate(generate_project_data(count))
+        for label, panel_cls in (("combo par choix", LegacyPanel), ("modèle partagé", PropertiesPanel)):
+            select, add, delete = measure(panel_cls, project, args.choices, args.repeat)
+            print(f"  {count:>6} {label:22}{select:8.2f} ms{add:7.2f} ms{delete:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Benchmark de la sauvegarde de l'éditeur (ProjectSaver).
+
+Mesure le temps passé sur le thread de l'UI (ce qui gèle l'éditeur) :
+  - ancienne sauvegarde : model_dump_json(indent=2) + écriture, tout sur l'UI
+    (la disposition monolithique doit produire les mêmes octets) ;
+  - ProjectSaver : capture des seuls nœuds modifiés, écriture en arrière-plan,
+    en disposition monolithique puis découpée (octets réécrits par sauvegarde).
+Vérifie ensuite que les deux dispositions se relisent à l'identique
+(load_project_data et load_project_cached).
+
+Usage :
+    python -m src.tools.bench_save --nodes 50000 --edits 10
+"""
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from src.common.loaders import chunk_dir, load_project_data
+from src.common.models import ProjectModel
+from src.editor.project_io import ProjectSaver
+from src.engine.cache import load_project_cached
+from src.tools.story_generator import generate_project_data
+
+
+def _folder_bytes(folder: Path) -> int:
+    return sum(p.stat().st_size for p in folder.glob("*.json"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de la sauvegarde de l'éditeur.")
+    parser.add_argument("--nodes", type=int, default=50000)
+    parser.add_argument("--edits", type=int, default=10, help="Nœuds modifiés entre deux sauvegardes")
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    project = ProjectModel.model_validate(generate_project_data(args.nodes))
+    ids = list(project.nodes)
+    rng = random.Random(1)
+
+    def edit(saver: ProjectSaver, i: int):
+        for node_id in rng.sample(ids, args.edits):
+            node = project.nodes[node_id]
+            node.position = [node.position[0] + 1.0, node.position[1]]
+            node.title = f"Édité {i}"
+            saver.mark_dirty(node_id)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        print(f"[Bench] {args.nodes} nœuds, {args.edits} nœud(s) modifié(s) par sauvegarde")
+
+        t = time.perf_counter()
+        with open(tmp / "old.json", 'w', encoding='utf-8') as f:
+            f.write(project.model_dump_json(indent=2))
+        print(f"  ancienne sauvegarde (UI)        {(time.perf_counter() - t) * 1000:9.1f} ms")
+
+        for label, split in (("monolithique", False), ("découpée", True)):
+            saver = ProjectSaver(project)
+            path = tmp / f"{'split' if split else 'mono'}.json"
+
+            t = time.perf_counter()
+            saver.save(path, split=split)
+            first_ui = time.perf_counter() - t
+            saver.flush()
+            first_total = time.perf_counter() - t
+
+            ui, total, written = [], [], []
+            for i in range(args.rounds):
+                edit(saver, i)
+                before = _folder_bytes(chunk_dir(path)) if split else 0
+                t = time.perf_counter()
+                saver.save(path, split=split)
+                ui.append(time.perf_counter() - t)
+                saver.flush()
+                total.append(time.perf_counter() - t)
+                if split:
+                    # Fichiers de la génération courante uniquement (les anciens sont supprimés)
+                    generation = f"-{saver._generation}.json"
+                    written.append(sum(p.stat().st_size for p in chunk_dir(path).glob(f"*{generation}"))
+                                   + path.stat().st_size)
+                else:
+                    written.append(path.stat().st_size)
+            saver.close()
+
+            print(f"  [{label}]")
+            print(f"    première sauvegarde : UI {first_ui * 1000:8.1f} ms, totale {first_total * 1000:8.1f} ms")
+            print(f"    sauvegarde suivante : UI {sum(ui) / len(ui) * 1000:8.2f} ms, "
+                  f"totale {sum(total) / len(total) * 1000:8.1f} ms, "
+                  f"{sum(written) / len(written) / 1024:9.1f} Ko écrits")
+
+            reloaded = ProjectModel(**load_project_data(path))
+            cached, _graph, _hit = load_project_cached(str(path), use_cache=False)
+            same = reloaded == project and cached.model_dump() == project.model_dump()
+            print(f"    relecture identique : {'oui' if same else 'NON'}")
+            if not split:
+                same = path.read_bytes() == project.model_dump_json(indent=2).encode("utf-8")
+                print(f"    octets identiques à model_dump_json(indent=2) : {'oui' if same else 'NON'}")
+
+
+if __name__ == "__main__":
+    main()
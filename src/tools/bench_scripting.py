@@ -0,0 +1,52 @@
+"""
+Micro-benchmark du ScriptEngine : évaluation compilée (AST en cache) vs parsing à chaque appel.
+
+Usage :
+    python -m src.tools.bench_scripting --iterations 100000
+"""
+import argparse
+import time
+
+from src.engine.scripting import ScriptEngine
+
+SAMPLES = [
+    ("condition", "gold >= 10"),
+    ("condition", "hp > 0 and gold < 100 or has_key"),
+    ("condition", "min(gold, hp) * 2 > len(name)"),
+    ("expression", "gold + 5"),
+    ("expression", "max(hp - 3, 0) + randint(1, 6)"),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmark ScriptEngine.")
+    parser.add_argument("--iterations", type=int, default=100_000)
+    args = parser.parse_args()
+
+    context = {"gold": 42, "hp": 7, "has_key": False, "name": "Cyndra"}
+    engine = ScriptEngine()
+    engine.precompile((0, source) for _, source in SAMPLES)
+    raw = ScriptEngine().evaluator
+    raw.names = context
+
+    print(f"[Bench] {args.iterations} évaluations par expression")
+    print(f"  {'source':<42} {'non compilé':>14} {'compilé':>14} {'gain':>7}")
+    for kind, source in SAMPLES:
+        evaluate = engine.evaluate_condition if kind == "condition" else engine.evaluate_expression
+
+        t0 = time.perf_counter()
+        for _ in range(args.iterations):
+            raw.eval(source)
+        t_raw = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        for _ in range(args.iterations):
+            evaluate(source, context)
+        t_compiled = time.perf_counter() - t0
+
+        print(f"  {source:<42} {t_raw / args.iterations * 1e6:11.2f} µs "
+              f"{t_compiled / args.iterations * 1e6:11.2f} µs {t_raw / t_compiled:6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
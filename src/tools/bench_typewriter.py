@@ -0,0 +1,91 @@
+"""
+Benchmark de l'effet machine à écrire sur un long passage (rendu offscreen) :
+ancien QLabel (setText du préfixe à chaque caractère) vs TypewriterLabel (mise en page unique).
+
+Chaque pas dévoile un caractère puis traite les événements (peinture de la zone invalidée),
+comme le ferait un tick du QTimer.
+
+Usage :
+    QT_QPA_PLATFORM=offscreen python -m src.tools.bench_typewriter --chars 5000
+"""
+import argparse
+import time
+
+from PySide6.QtWidgets import QApplication, QLabel
+from PySide6.QtCore import Qt
+
+from src.engine.ui.widgets import TypewriterLabel
+
+WORDS = "le vent souffle sur les remparts de Velkarum tandis que la garde change".split()
+
+
+class LegacyTypewriterLabel(QLabel):
+    """Copie de l'ancien TypewriterLabel : le préfixe est recopié et remis en page à chaque caractère."""
+
+    def __init__(self):
+        super().__init__()
+        self.setWordWrap(True)
+        self.setAlignment(Qt.AlignTop | Qt.AlignLeft)
+        self.setStyleSheet("color: white; font-size: 18px; padding: 10px;")
+        self.full_text = ""
+        self.current_char_index = 0
+
+    def show_text(self, text: str):
+        self.full_text = text
+        self.current_char_index = 0
+        self.setText("")
+
+    def _add_char(self):
+        self.setText(self.full_text[:self.current_char_index + 1])
+        self.current_char_index += 1
+
+
+def make_text(length: int) -> str:
+    words, size, i = [], 0, 0
+    while size < length:
+        word = WORDS[i % len(WORDS)]
+        words.append(word)
+        size += len(word) + 1
+        i += 1
+    return " ".join(words)[:length]
+
+
+def run(widget, step, text: str, steps: int):
+    widget.resize(900, 2000)
+    widget.show()
+    QApplication.processEvents()  # Fenêtre exposée : repaint() peint vraiment
+    widget.show_text(text)
+    if hasattr(widget, "timer"):
+        widget.timer.stop()  # Pas pilotés à la main
+    worst = 0.0
+    t0 = time.perf_counter()
+    for i in range(steps):
+        t = time.perf_counter()
+        step(widget, i)
+        QApplication.processEvents()
+        worst = max(worst, time.perf_counter() - t)
+    return time.perf_counter() - t0, worst
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de l'effet machine à écrire.")
+    parser.add_argument("--chars", type=int, default=5000)
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication([])
+    text = make_text(args.chars)
+
+    legacy_total, legacy_worst = run(LegacyTypewriterLabel(), lambda w, i: w._add_char(), text, args.chars)
+    new_total, new_worst = run(TypewriterLabel(), lambda w, i: w.set_revealed(i + 1), text, args.chars)
+
+    print(f"[Bench] Dévoilement de {args.chars} caractères, une peinture par caractère")
+    print(f"  {'':<16} {'total':>10} {'par pas':>12} {'pire pas':>12}")
+    for name, total, worst in (("QLabel préfixe", legacy_total, legacy_worst),
+                               ("TypewriterLabel", new_total, new_worst)):
+        print(f"  {name:<16} {total:8.2f} s {total / args.chars * 1e3:9.3f} ms {worst * 1e3:9.3f} ms")
+    print(f"  gain : {legacy_total / new_total:.1f}x")
+    app.quit()
+
+
+if __name__ == "__main__":
+    main()
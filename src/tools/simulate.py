@@ -0,0 +1,314 @@
+"""
+Simulateur de parties en lot (headless, sans Qt), réparti sur un pool de processus.
+
+Stratégies :
+    random    choix uniforme parmi les choix dont la condition est remplie
+    weighted  privilégie les cibles les moins visitées (exploration / couverture)
+    scripted  rejoue des séquences d'index de choix (--script fichier.json) : un index par
+              choix effectué ; un index indisponible est compté à part (script_mismatches)
+
+Usage :
+    python -m src.tools.simulate games/demo/story.json --runs 5000 --jobs 4
+    python -m src.tools.simulate story.json --strategy scripted --script runs.json --report report.json
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from array import array
+from multiprocessing import Pool
+from typing import Dict, List, Optional
+
+from src.engine.session import StorySession
+from src.engine.flow import FlowError
+from src.engine.runtime import KIND_SCENE, NO_NODE
+from src.engine.log import log
+
+STRATEGIES = ("random", "weighted", "scripted")
+
+# Stratégie scriptée : séquence épuisée / index absent des choix disponibles
+SCRIPT_ENDED = -2
+SCRIPT_MISMATCH = -3
+
+# Session du processus de travail (chargée une fois par l'initialiseur du pool)
+_session: Optional[StorySession] = None
+_scripts: List[List[int]] = []
+
+
+def _load_session(project_path: str, scripts: List[List[int]]):
+    global _session, _scripts
+    _session = StorySession()
+    _session.load_project(project_path)
+    _scripts = scripts
+
+
+def _init_worker(project_path: str, scripts: List[List[int]]):
+    _load_session(project_path, scripts)
+    # Événements du moteur coupés pendant les parties (issues comptées dans le rapport)
+    log.disable()
+
+
+def _pick(strategy: str, available: List[int], node, graph, visits: array, rng: random.Random,
+          script: Optional[List[int]], decision: int) -> int:
+    """Index local du choix ; stratégie scriptée : SCRIPT_ENDED ou SCRIPT_MISMATCH si le script ne s'applique pas."""
+    if strategy == "random":
+        return rng.choice(available)
+
+    if strategy == "weighted":
+        weights = []
+        for local in available:
+            target = graph.choice_target[node.choice_begin + local]
+            weights.append(1.0 / (1 + visits[target]) if target != NO_NODE else 0.5)
+        return rng.choices(available, weights)[0]
+
+    # scripted : un index du script par choix effectué (les nœuds sans choix n'en consomment pas)
+    if decision >= len(script):
+        return SCRIPT_ENDED
+    choice = script[decision]
+    return choice if choice in available else SCRIPT_MISMATCH
+
+
+def _run_batch(task) -> Dict:
+    """Exécute `count` parties et retourne les compteurs agrégés."""
+    first_run, count, seed, strategy, max_steps = task
+    session = _session
+    flow = session.flow
+
+    rng = random.Random(seed)
+    # random() / randint() des scripts tirent aussi dans rng : même graine, mêmes parties
+    functions = flow.script_engine.functions
+    script_random = functions["random"], functions["randint"]
+    functions["random"], functions["randint"] = rng.random, rng.randint
+    try:
+        return _run_games(session, first_run, count, rng, strategy, max_steps)
+    finally:
+        functions["random"], functions["randint"] = script_random
+
+
+def _run_games(session: StorySession, first_run: int, count: int, rng: random.Random, strategy: str,
+               max_steps: int) -> Dict:
+    """Boucle des parties d'un lot (fonctions aléatoires des scripts déjà liées à rng)."""
+    graph = session.graph
+    flow = session.flow
+    state = session.state
+
+    visits = array('I', bytes(4 * len(graph)))
+    dead_ends: Dict[int, int] = {}
+    endings: Dict[int, int] = {}
+    broken_links: Dict[int, int] = {}
+    errors: Dict[str, int] = {}
+    mismatches: Dict[int, int] = {}
+    truncated = 0
+    script_ended = 0
+    steps_total = 0
+
+    for run in range(first_run, first_run + count):
+        session.reset()
+        index = graph.start_index
+        script = _scripts[run % len(_scripts)] if strategy == "scripted" else None
+
+        decision = 0
+        for step in range(max_steps):
+            node = graph.nodes[index]
+            choice = -1
+            if node.kind == KIND_SCENE and node.choice_end > node.choice_begin:
+                available = flow.available_choices(index)
+                if not available:
+                    dead_ends[index] = dead_ends.get(index, 0) + 1
+                    break
+                choice = _pick(strategy, available, node, graph, visits, rng, script, decision)
+                if choice == SCRIPT_ENDED:
+                    script_ended += 1
+                    break
+                if choice == SCRIPT_MISMATCH:
+                    mismatches[index] = mismatches.get(index, 0) + 1
+                    break
+                decision += 1
+
+            try:
+                next_index = flow.advance_index(choice)
+            except FlowError as e:
+                errors[str(e)] = errors.get(str(e), 0) + 1
+                break
+
+            steps_total += 1
+            if next_index == NO_NODE:
+                if choice >= 0 and graph.choice_target[node.choice_begin + choice] == NO_NODE:
+                    # Choix sans cible (vide ou UUID inconnu) : lien cassé, pas une fin
+                    broken_links[index] = broken_links.get(index, 0) + 1
+                else:
+                    endings[index] = endings.get(index, 0) + 1
+                break
+            index = next_index
+        else:
+            truncated += 1
+
+        # L'historique contient aussi les nœuds SET_VAR traversés
+        visits[graph.start_index] += 1
+        for visited in state.history:
+            visits[visited] += 1
+
+    return {
+        "visits": visits.tobytes(),
+        "dead_ends": dead_ends,
+        "endings": endings,
+        "broken_links": broken_links,
+        "errors": errors,
+        "script_mismatches": mismatches,
+        "truncated": truncated,
+        "script_ended": script_ended,
+        "steps": steps_total,
+    }
+
+
+def simulate(project_path: str, runs: int, jobs: int, strategy: str = "random", max_steps: int = 1000,
+             seed: int = 0, scripts: Optional[List[List[int]]] = None, batch_size: int = 250) -> Dict:
+    """Lance `runs` parties sur `jobs` processus et retourne le rapport agrégé."""
+    scripts = scripts or [[]]
+
+    # Chargement dans le processus parent : compile + écrit le cache une seule fois
+    _load_session(project_path, scripts)
+    graph = _session.graph
+    if graph.start_index == NO_NODE:
+        raise ValueError("Le projet n'a pas de start_node_id valide.")
+
+    tasks = []
+    for first in range(0, runs, batch_size):
+        tasks.append((first, min(batch_size, runs - first), seed + first, strategy, max_steps))
+
+    t0 = time.perf_counter()
+    if jobs > 1:
+        with Pool(jobs, initializer=_init_worker, initargs=(project_path, scripts)) as pool:
+            results = pool.map(_run_batch, tasks)
+    else:
+        # Même réglage que les processus de travail, rétabli ensuite pour l'appelant
+        level = log.level
+        log.disable()
+        try:
+            results = [_run_batch(task) for task in tasks]
+        finally:
+            log.set_level(level)
+    elapsed = time.perf_counter() - t0
+
+    visits = array('Q', bytes(8 * len(graph)))
+    dead_ends: Dict[int, int] = {}
+    endings: Dict[int, int] = {}
+    broken_links: Dict[int, int] = {}
+    errors: Dict[str, int] = {}
+    mismatches: Dict[int, int] = {}
+    truncated = 0
+    script_ended = 0
+    steps = 0
+    for result in results:
+        batch_visits = array('I')
+        batch_visits.frombytes(result["visits"])
+        for i, count in enumerate(batch_visits):
+            if count:
+                visits[i] += count
+        for key, target in (("dead_ends", dead_ends), ("endings", endings), ("broken_links", broken_links),
+                            ("errors", errors), ("script_mismatches", mismatches)):
+            for k, v in result[key].items():
+                target[k] = target.get(k, 0) + v
+        truncated += result["truncated"]
+        script_ended += result["script_ended"]
+        steps += result["steps"]
+
+    def title(index: int) -> str:
+        return graph.node_model(index).title
+
+    visited = sum(1 for count in visits if count)
+    return {
+        "project": project_path,
+        "strategy": strategy,
+        "runs": runs,
+        "jobs": jobs,
+        "seconds": elapsed,
+        "playthroughs_per_sec": runs / elapsed if elapsed else 0.0,
+        "steps": steps,
+        "nodes": len(graph),
+        "visited_nodes": visited,
+        "coverage": visited / len(graph) if len(graph) else 0.0,
+        "unvisited": [graph.node_id(i) for i, count in enumerate(visits) if not count],
+        "dead_ends": {graph.node_id(i): {"title": title(i), "count": c} for i, c in dead_ends.items()},
+        "endings": {graph.node_id(i): {"title": title(i), "count": c} for i, c in endings.items()},
+        "broken_links": {graph.node_id(i): {"title": title(i), "count": c} for i, c in broken_links.items()},
+        "errors": errors,
+        "script_mismatches": {graph.node_id(i): {"title": title(i), "count": c} for i, c in mismatches.items()},
+        "truncated": truncated,
+        "script_ended": script_ended,
+        "visits": {graph.node_id(i): count for i, count in enumerate(visits) if count},
+    }
+
+
+def _print_report(report: Dict, top: int):
+    print(f"[Simulation] {report['runs']} parties ({report['strategy']}, {report['jobs']} processus) "
+          f"en {report['seconds']:.2f} s -> {report['playthroughs_per_sec']:,.0f} parties/s")
+    print(f"  Couverture : {report['visited_nodes']}/{report['nodes']} nœuds ({report['coverage']:.1%})")
+    print(f"  Fins atteintes : {sum(e['count'] for e in report['endings'].values())} "
+          f"| Parties tronquées : {report['truncated']}")
+
+    if report["dead_ends"]:
+        print(f"  Impasses (aucun choix disponible) : {len(report['dead_ends'])} nœud(s)")
+        for node_id, info in sorted(report["dead_ends"].items(), key=lambda kv: -kv[1]["count"])[:top]:
+            print(f"    {info['title']} ({node_id[:8]}) x{info['count']}")
+
+    if report["broken_links"]:
+        print(f"  Liens cassés (choix sans cible valide) : {len(report['broken_links'])} nœud(s)")
+        for node_id, info in sorted(report["broken_links"].items(), key=lambda kv: -kv[1]["count"])[:top]:
+            print(f"    {info['title']} ({node_id[:8]}) x{info['count']}")
+
+    for message, count in report["errors"].items():
+        print(f"  Erreur de flux x{count} : {message}")
+
+    if report["strategy"] == "scripted":
+        print(f"  Scripts épuisés avant la fin : {report['script_ended']}")
+        if report["script_mismatches"]:
+            print(f"  Choix du script indisponible : {len(report['script_mismatches'])} nœud(s)")
+            for node_id, info in sorted(report["script_mismatches"].items(), key=lambda kv: -kv[1]["count"])[:top]:
+                print(f"    {info['title']} ({node_id[:8]}) x{info['count']}")
+
+    print("  Nœuds les plus visités :")
+    for node_id, count in sorted(report["visits"].items(), key=lambda kv: -kv[1])[:top]:
+        print(f"    {node_id[:8]} x{count}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulation de parties en lot (headless).")
+    parser.add_argument("project", help="Chemin du story.json")
+    parser.add_argument("--runs", type=int, default=1000)
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--strategy", choices=STRATEGIES, default="random")
+    parser.add_argument("--script", help="JSON : liste d'index de choix, ou liste de listes (une par partie)")
+    parser.add_argument("--max-steps", type=int, default=1000, help="Pas maximum par partie")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--report", help="Écrit le rapport complet en JSON")
+    parser.add_argument("--fail-on-dead-end", action="store_true",
+                        help="Code de sortie 1 si une impasse ou un lien cassé est trouvé")
+    args = parser.parse_args()
+
+    scripts = None
+    if args.strategy == "scripted":
+        if not args.script:
+            parser.error("--strategy scripted requiert --script")
+        with open(args.script, 'r', encoding='utf-8') as f:
+            scripts = json.load(f)
+        if scripts and isinstance(scripts[0], int):
+            scripts = [scripts]
+
+    report = simulate(args.project, args.runs, args.jobs, args.strategy, args.max_steps, args.seed, scripts)
+    _print_report(report, args.top)
+
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+    if args.fail_on_dead_end and (report["dead_ends"] or report["broken_links"] or report["errors"]
+                                  or report["script_mismatches"]):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
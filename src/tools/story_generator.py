@@ -0,0 +1,88 @@
+"""
+Générateur de projets synthétiques (benchmarks, tests de charge).
+
+Usage :
+    python -m src.tools.story_generator 100000 games/bench/story.json
+"""
+import argparse
+import json
+import random
+import uuid
+from typing import Any, Dict
+
+
+def generate_project_data(node_count: int, choices_per_node: int = 3, set_var_ratio: float = 0.1,
+                          condition_ratio: float = 0.2, seed: int = 0) -> Dict[str, Any]:
+    """
+    Construit un dict compatible ProjectModel.
+    Les scènes pointent vers des nœuds aléatoires (graphe fortement connexe en
+    pratique), les nœuds SET_VAR modifient 'gold' et 'hp', et une partie des
+    choix porte une condition toujours vraie pour exercer le ScriptEngine.
+    """
+    rng = random.Random(seed)
+    ids = [str(uuid.UUID(int=rng.getrandbits(128), version=4)) for _ in range(node_count)]
+
+    nodes = {}
+    for i, node_id in enumerate(ids):
+        if i > 0 and rng.random() < set_var_ratio:
+            nodes[node_id] = {
+                "id": node_id,
+                "type": "SET_VAR",
+                "title": f"Var {i}",
+                "position": [float(i % 100) * 260.0, float(i // 100) * 180.0],
+                "content": {
+                    "variable_name": rng.choice(["gold", "hp"]),
+                    "operation": rng.choice(["+", "-", "="]),
+                    "value": str(rng.randint(0, 5)),
+                },
+                "outputs": [{"target_node_id": ids[(i + 1) % node_count]}],
+            }
+            continue
+
+        choices = []
+        for _ in range(choices_per_node):
+            condition = "gold >= -1000000" if rng.random() < condition_ratio else ""
+            choices.append({
+                "text": f"Aller vers {len(choices) + 1}",
+                "condition": condition,
+                "target_node_id": ids[rng.randrange(node_count)],
+            })
+
+        nodes[node_id] = {
+            "id": node_id,
+            "type": "SCENE",
+            "title": f"Passage {i}",
+            "position": [float(i % 100) * 260.0, float(i // 100) * 180.0],
+            "content": {
+                "text": f"Passage numéro {i}. " * 8,
+                "choices": choices,
+            },
+        }
+
+    return {
+        "meta": {"name": f"Bench {node_count}"},
+        "variables": {
+            "gold": {"type": "int", "default_value": 0},
+            "hp": {"type": "int", "default_value": 10},
+        },
+        "nodes": nodes,
+        "start_node_id": ids[0] if ids else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Génère un story.json synthétique.")
+    parser.add_argument("nodes", type=int, help="Nombre de nœuds")
+    parser.add_argument("output", help="Chemin du story.json à écrire")
+    parser.add_argument("--choices", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    data = generate_project_data(args.nodes, choices_per_node=args.choices, seed=args.seed)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+    print(f"[Generator] {args.nodes} nœuds écrits dans {args.output}")
+
+
+if __name__ == "__main__":
+    main()
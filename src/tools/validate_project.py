@@ -1 +1,425 @@
- 
+"""
+Analyseur d'accessibilité d'un projet (exploration exhaustive de l'espace d'états).
+
+Un état est le tuple (nœud, valeurs des variables, inventaire). L'exploration en
+largeur rejoue la vraie logique du moteur (FlowManager) sur chaque choix passant,
+déduplique les états (encodage compact en entiers) et mémorise les résultats
+des conditions par (condition, valeurs des variables, inventaire).
+
+L'historique des nœuds visités ne fait pas partie de l'état : les conditions qui
+appellent visited() sont réévaluées à chaque fois (jamais mémorisées) avec un
+historique vide, et les résultats qui en dépendent sont signalés comme approximatifs.
+
+Rapporte :
+    - les nœuds inaccessibles et les liens cassés (cible inexistante) ;
+    - les impasses (soft-locks) : scène avec des choix dont aucun ne passe ;
+    - les boucles infinies : boucles SET_VAR, et états dont aucune fin n'est atteignable ;
+    - les choix dont la condition n'est jamais remplie.
+
+Les variables entières peuvent être abstraites sur un intervalle borné (--clamp)
+pour garantir un espace d'états fini. Les expressions utilisant random/randint
+sont évaluées une seule fois par état (résultat non exhaustif).
+
+Usage :
+    python -m src.tools.validate_project games/demo/story.json
+    python -m src.tools.validate_project story.json --clamp -10 100 --jobs 8 --report report.json
+"""
+import argparse
+import ast
+import json
+import os
+import sys
+import time
+from array import array
+from collections import deque
+from multiprocessing import Pool
+from typing import Dict, List, Optional, Set, Tuple
+
+from src.engine.session import StorySession
+from src.engine.flow import FlowError
+from src.engine.runtime import KIND_SCENE, KIND_SET_VAR, NO_NODE
+from src.engine.log import log, WARNING
+
+_UNSET = Ellipsis  # Variable jamais affectée (singleton conservé par pickle)
+
+# Résultats d'une transition
+OUT_STATE = 0
+OUT_END = 1
+OUT_ERROR = 2
+
+
+def history_conditions(conditions: List[str]) -> Set[int]:
+    """Conditions qui appellent visited() : leur résultat dépend de l'historique, absent de l'état."""
+    found = set()
+    for cond_id, source in enumerate(conditions):
+        try:
+            tree = ast.parse(source, mode="eval") if source else None
+        except SyntaxError:
+            continue
+        if tree is not None and any(isinstance(node, ast.Call) and isinstance(node.func, ast.Name)
+                                    and node.func.id == "visited" for node in ast.walk(tree)):
+            found.add(cond_id)
+    return found
+
+
+class StateExpander:
+    """Calcule les successeurs d'un état en rejouant le FlowManager sur une session de travail."""
+
+    def __init__(self, session: StorySession, names: Tuple[str, ...], clamp: Optional[Tuple[int, int]],
+                 track_inventory: bool):
+        self.session = session
+        self.graph = session.graph
+        self.flow = session.flow
+        self.state = session.state
+        self.names = names
+        self.clamp = clamp
+        self.track_inventory = track_inventory
+        self.condition_memo: Dict[Tuple[int, tuple], bool] = {}
+        self.history_conditions = history_conditions(self.graph.conditions)
+
+    def encode_variables(self, variables: Dict) -> tuple:
+        values = []
+        for name in self.names:
+            value = variables.get(name, _UNSET)
+            if self.clamp and type(value) is int:
+                value = min(max(value, self.clamp[0]), self.clamp[1])
+            values.append(value)
+        return tuple(values)
+
+    def encode_inventory(self, inventory: Dict[str, int]) -> tuple:
+        if not self.track_inventory:
+            return ()
+        return tuple(sorted(inventory.items()))
+
+    def _load(self, node: int, values: tuple, inventory: tuple):
+        state = self.state
+        state.variables = {name: v for name, v in zip(self.names, values) if v is not _UNSET}
+        state.inventory = dict(inventory)
+        state.npcs = {}
+        state.history.clear()  # Ni chemin ni nœuds lus hérités des états explorés avant
+        state.current_index = node
+
+    def _passes(self, cond_id: int, values: tuple) -> bool:
+        # Les conditions ne voient que les variables : l'inventaire ne fait pas partie de la clé
+        key = (cond_id, values)
+        result = self.condition_memo.get(key)
+        if result is None:
+            self._load(NO_NODE, values, ())
+            result = self.flow.script_engine.evaluate_condition(self.graph.conditions[cond_id], self.state.variables)
+            if cond_id not in self.history_conditions:
+                self.condition_memo[key] = result
+        return result
+
+    def expand(self, node: int, values: tuple, inventory: tuple) -> Tuple[bool, List[tuple]]:
+        """
+        Retourne (bloqué, transitions) ; une transition est (choix local, résultat, données, nœuds traversés)
+        avec résultat/données : OUT_STATE/(nœud, valeurs, inventaire), OUT_END/None ou OUT_ERROR/message.
+        """
+        graph = self.graph
+        runtime_node = graph.nodes[node]
+
+        if runtime_node.kind == KIND_SCENE and runtime_node.choice_end > runtime_node.choice_begin:
+            locals_ = []
+            for local, slot in enumerate(range(runtime_node.choice_begin, runtime_node.choice_end)):
+                cond_id = graph.choice_condition[slot]
+                if not cond_id or self._passes(cond_id, values):
+                    locals_.append(local)
+            if not locals_:
+                return True, []
+        else:
+            locals_ = [-1]
+
+        transitions = []
+        for local in locals_:
+            self._load(node, values, inventory)
+            try:
+                next_index = self.flow.advance_index(local)
+            except FlowError as e:
+                transitions.append((local, OUT_ERROR, str(e), ()))
+                continue
+            # L'historique contient les SET_VAR traversés, qui ne forment pas d'état propre
+            traversed = tuple(self.state.history)
+            if next_index == NO_NODE:
+                transitions.append((local, OUT_END, None, traversed))
+            else:
+                successor = (next_index, self.encode_variables(self.state.variables),
+                             self.encode_inventory(self.state.inventory))
+                transitions.append((local, OUT_STATE, successor, traversed))
+        return False, transitions
+
+
+# --- Pool de processus (expansion parallèle de la frontière) ---
+_worker: Optional[StateExpander] = None
+
+
+def _init_worker(project_path: str, names, clamp, track_inventory):
+    global _worker
+    log.disable()
+    session = StorySession()
+    session.load_project(project_path)
+    _worker = StateExpander(session, names, clamp, track_inventory)
+
+
+def _expand_chunk(chunk: List[tuple]) -> List[tuple]:
+    return [_worker.expand(*item) for item in chunk]
+
+
+def variable_names(session: StorySession) -> Tuple[str, ...]:
+    """Variables déclarées + variables écrites par des nœuds SET_VAR (ordre stable)."""
+    names = set(session.project.variables)
+    for node in session.graph.nodes:
+        if node.kind == KIND_SET_VAR and node.logic is not None:
+            names.add(node.logic.variable)
+    return tuple(sorted(names))
+
+
+def explore(project_path: str, jobs: int = 1, max_states: int = 1_000_000, clamp: Optional[Tuple[int, int]] = None,
+            track_inventory: bool = True, chunk_size: int = 512) -> Dict:
+    session = StorySession()
+    session.load_project(project_path)
+    log.set_level(WARNING, ring_level=WARNING)  # Ni console ni tampon de crash pour les événements courants
+    graph = session.graph
+    n = len(graph)
+    if graph.start_index == NO_NODE:
+        raise ValueError("Le projet n'a pas de start_node_id valide.")
+
+    names = variable_names(session)
+    expander = StateExpander(session, names, clamp, track_inventory)
+
+    # Tables d'internement : tuple de valeurs / inventaire -> petit entier
+    value_ids: Dict[tuple, int] = {}
+    value_table: List[tuple] = []
+    inventory_ids: Dict[tuple, int] = {}
+    inventory_table: List[tuple] = []
+
+    def intern(table_ids, table, item) -> int:
+        item_id = table_ids.get(item)
+        if item_id is None:
+            item_id = len(table)
+            table_ids[item] = item_id
+            table.append(item)
+        return item_id
+
+    # État = id séquentiel ; clé compacte = ((valeurs << 32) | inventaire) * n + nœud
+    key_to_state: Dict[int, int] = {}
+    state_keys: List[int] = []
+    parent = array('i')
+    expanded = bytearray()
+    edges_from = array('i')
+    edges_to = array('i')
+    terminal = set()
+    blocked = set()
+    errors: Dict[int, str] = {}
+    passed_slots = set()
+    traversed_nodes = set()
+
+    def add_state(node: int, values: tuple, inventory: tuple, from_state: int) -> Tuple[int, bool]:
+        key = ((intern(value_ids, value_table, values) << 32) | intern(inventory_ids, inventory_table, inventory)) * n + node
+        state_id = key_to_state.get(key)
+        if state_id is not None:
+            return state_id, False
+        state_id = len(state_keys)
+        key_to_state[key] = state_id
+        state_keys.append(key)
+        parent.append(from_state)
+        expanded.append(0)
+        return state_id, True
+
+    def decode(state_id: int) -> Tuple[int, tuple, tuple]:
+        key = state_keys[state_id]
+        node = key % n
+        packed = key // n
+        return node, value_table[packed >> 32], inventory_table[packed & 0xFFFFFFFF]
+
+    session.reset()
+    start, _ = add_state(graph.start_index, expander.encode_variables(session.state.variables),
+                         expander.encode_inventory(session.state.inventory), -1)
+    frontier = [start]
+    truncated = False
+
+    pool = Pool(jobs, initializer=_init_worker, initargs=(project_path, names, clamp, track_inventory)) if jobs > 1 else None
+    t0 = time.perf_counter()
+    try:
+        while frontier:
+            items = [decode(s) for s in frontier]
+            if pool is not None and len(items) > chunk_size:
+                chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+                results = [r for chunk in pool.map(_expand_chunk, chunks) for r in chunk]
+            else:
+                results = [expander.expand(*item) for item in items]
+
+            next_frontier = []
+            for state_id, (node, _, _), (is_blocked, transitions) in zip(frontier, items, results):
+                expanded[state_id] = 1
+                if is_blocked:
+                    blocked.add(state_id)
+                    continue
+                begin = graph.nodes[node].choice_begin
+                for local, outcome, payload, traversed in transitions:
+                    if local >= 0:
+                        passed_slots.add(begin + local)
+                    traversed_nodes.update(traversed)
+                    if outcome == OUT_END:
+                        terminal.add(state_id)
+                    elif outcome == OUT_ERROR:
+                        errors[state_id] = payload
+                    else:
+                        successor, is_new = add_state(*payload, state_id)
+                        edges_from.append(state_id)
+                        edges_to.append(successor)
+                        if is_new:
+                            if len(state_keys) > max_states:
+                                truncated = True
+                            else:
+                                next_frontier.append(successor)
+            if truncated:
+                break
+            frontier = next_frontier
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+    elapsed = time.perf_counter() - t0
+
+    # --- Analyse ---
+    unexpanded = {s for s, done in enumerate(expanded) if not done}
+    reached_nodes = set(key % n for key in state_keys) | traversed_nodes
+
+    # Co-accessibilité : états depuis lesquels une fin (ou l'inconnu si tronqué) est atteignable
+    reverse: Dict[int, List[int]] = {}
+    for src, dst in zip(edges_from, edges_to):
+        reverse.setdefault(dst, []).append(src)
+    can_finish = set(terminal) | unexpanded
+    queue = deque(can_finish)
+    while queue:
+        for pred in reverse.get(queue.popleft(), ()):
+            if pred not in can_finish:
+                can_finish.add(pred)
+                queue.append(pred)
+    trapped = [s for s in range(len(state_keys)) if s not in can_finish and s not in blocked and s not in errors]
+
+    def path_to(state_id: int) -> List[str]:
+        path = []
+        while state_id >= 0:
+            node, _, _ = decode(state_id)
+            path.append(graph.node_model(node).title)
+            state_id = parent[state_id]
+        return path[::-1]
+
+    def by_node(state_ids) -> Dict[int, int]:
+        nodes: Dict[int, int] = {}
+        for s in state_ids:
+            nodes.setdefault(decode(s)[0], s)
+        return nodes
+
+    def describe(index: int, example_state: Optional[int] = None) -> Dict:
+        info = {"id": graph.node_id(index), "title": graph.node_model(index).title}
+        if example_state is not None:
+            info["path"] = path_to(example_state)
+        return info
+
+    never_passing = []
+    approximate = []
+    for index in sorted(reached_nodes):
+        node = graph.nodes[index]
+        for local, slot in enumerate(range(node.choice_begin, node.choice_end)):
+            cond_id = graph.choice_condition[slot]
+            history = cond_id in expander.history_conditions
+            if history:
+                approximate.append({**describe(index), "choice": local, "condition": graph.conditions[cond_id]})
+            if cond_id and slot not in passed_slots:
+                never_passing.append({**describe(index), "choice": local, "condition": graph.conditions[cond_id],
+                                      "approximate": history})
+
+    broken_links = []
+    for node_id, model in session.project.nodes.items():
+        for local, choice in enumerate(model.content.choices):
+            if choice.target_node_id and choice.target_node_id not in session.project.nodes:
+                broken_links.append({"id": node_id, "title": model.title, "choice": local,
+                                     "target": choice.target_node_id})
+
+    return {
+        "project": project_path,
+        "seconds": elapsed,
+        "states": len(state_keys),
+        "truncated": truncated,
+        # Conditions visited() atteintes : accessibilité, impasses et choix jamais passants approximatifs
+        "approximate": bool(approximate),
+        "approximate_conditions": approximate,
+        "variables": list(names),
+        "nodes": n,
+        "reachable_nodes": len(reached_nodes),
+        "unreachable": [describe(i) for i in range(n) if i not in reached_nodes],
+        "broken_links": broken_links,
+        "soft_locks": [describe(i, s) for i, s in by_node(blocked).items()],
+        "logic_loops": [{**describe(decode(s)[0], s), "error": msg} for s, msg in errors.items()],
+        "infinite_loops": [describe(i, s) for i, s in by_node(trapped).items()],
+        "never_passing_choices": never_passing,
+    }
+
+
+def _print_report(report: Dict):
+    print(f"[Validation] {report['states']} états explorés en {report['seconds']:.2f} s"
+          f"{' (TRONQUÉ)' if report['truncated'] else ''}")
+    print(f"  Nœuds accessibles : {report['reachable_nodes']}/{report['nodes']}")
+    if report["approximate"]:
+        print(f"  APPROXIMATIF : {len(report['approximate_conditions'])} condition(s) visited() évaluée(s) "
+              f"sans historique (l'historique ne fait pas partie de l'état)")
+
+    sections = [
+        ("unreachable", "Nœuds inaccessibles"),
+        ("broken_links", "Liens cassés"),
+        ("soft_locks", "Impasses (aucun choix passant)"),
+        ("logic_loops", "Boucles SET_VAR"),
+        ("infinite_loops", "Boucles sans issue"),
+        ("never_passing_choices", "Choix jamais disponibles"),
+    ]
+    for key, label in sections:
+        entries = report[key]
+        if not entries:
+            continue
+        print(f"  {label} : {len(entries)}")
+        for entry in entries[:20]:
+            details = ""
+            if "condition" in entry:
+                details = f" choix #{entry['choice'] + 1} [{entry['condition']}]"
+                if entry.get("approximate"):
+                    details += " (approximatif)"
+            elif "target" in entry:
+                details = f" choix #{entry['choice'] + 1} -> {entry['target']}"
+            elif "path" in entry:
+                details = f" via {' > '.join(entry['path'][-6:])}"
+            print(f"    - {entry['title']} ({entry['id'][:8]}){details}")
+        if len(entries) > 20:
+            print(f"    ... (+{len(entries) - 20})")
+
+
+def has_issues(report: Dict) -> bool:
+    return any(report[k] for k in ("unreachable", "broken_links", "soft_locks", "logic_loops",
+                                   "infinite_loops", "never_passing_choices"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Analyse d'accessibilité d'un projet (espace d'états).")
+    parser.add_argument("project", help="Chemin du story.json")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="Processus pour l'expansion de la frontière")
+    parser.add_argument("--max-states", type=int, default=1_000_000)
+    parser.add_argument("--clamp", type=int, nargs=2, metavar=("MIN", "MAX"),
+                        help="Abstraction des variables entières sur [MIN, MAX]")
+    parser.add_argument("--no-inventory", action="store_true", help="Ignore l'inventaire dans l'état")
+    parser.add_argument("--report", help="Écrit le rapport complet en JSON")
+    args = parser.parse_args()
+
+    report = explore(args.project, args.jobs, args.max_states, tuple(args.clamp) if args.clamp else None,
+                     not args.no_inventory)
+    _print_report(report)
+
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+    sys.exit(1 if has_issues(report) else 0)
+
+
+if __name__ == "__main__":
+    main()